@@ -5,230 +5,25 @@
 @description: This extension offers various nodes that allow you to work with LLMs using the Griptape Python Framework (https://griptape.ai)
 """
 
-import os
-import sys
+import time
 
-from dotenv import load_dotenv
+# Timed from the very top, so the report covers every import below.
+start_time = time.perf_counter()
 
-# AGENT
-from .nodes.agent.CreateAgent import CreateAgent
-from .nodes.agent.ExpandAgent import ExpandAgent
-from .nodes.agent.gtUICreateAgentFromConfig import gtUICreateAgentFromConfig
-from .nodes.agent.gtUIReplaceRulesetsOnAgent import gtUIReplaceRulesetsOnAgent
-from .nodes.agent.gtUIReplaceToolsOnAgent import gtUIReplaceToolsOnAgent
-from .nodes.agent.gtUIRunAgent import gtUIRunAgent
-from .nodes.agent.gtUISetDefaultAgent import gtUISetDefaultAgent
-from .nodes.agent.RunAgent import RunAgent
+import os  # noqa: E402
 
-# COMBINE
-from .nodes.combine.gtUIMergeInputs import gtUIMergeInputs
-from .nodes.combine.MergeTexts import MergeTexts
-from .nodes.combine.RulesList import RulesList
-from .nodes.combine.ToolList import ToolList
-
-# CONFIG
-from .nodes.config.gtUIAmazonBedrockStructureConfig import (
-    gtUIAmazonBedrockStructureConfig,
-)
-from .nodes.config.gtUIAnthropicStructureConfig import gtUIAnthropicStructureConfig
-from .nodes.config.gtUIAzureOpenAiStructureConfig import gtUIAzureOpenAiStructureConfig
-from .nodes.config.gtUIEnvConfig import gtUIEnvConfig
-from .nodes.config.gtUIGoogleStructureConfig import gtUIGoogleStructureConfig
-from .nodes.config.gtUIHuggingFaceStructureConfig import gtUIHuggingFaceStructureConfig
-from .nodes.config.gtUILMStudioStructureConfig import gtUILMStudioStructureConfig
-from .nodes.config.gtUIOllamaStructureConfig import gtUIOllamaStructureConfig
-from .nodes.config.gtUIOpenAiCompatibleConfig import gtUIOpenAiCompatibleConfig
-from .nodes.config.gtUIOpenAiStructureConfig import gtUIOpenAiStructureConfig
-from .nodes.config.gtUIStructureConfig import gtUIStructureConfig
-
-# CONVERT
-from .nodes.convert.gtUITextToClipEncode import gtUITextToClipEncode
-from .nodes.convert.gtUITextToCombo import gtUITextToCombo
+from dotenv import load_dotenv  # noqa: E402
 
 # Load the routes
-from .nodes.custom_routes import init_routes
-
-# DISPLAY
-from .nodes.display.gtUIOutputDataNode import gtUIOutputDataNode
-from .nodes.display.gtUIOutputImageNode import gtUIOutputImageNode
-from .nodes.display.gtUIOutputStringNode import gtUIOutputStringNode
-
-# DRIVERS
-# - Amazon Bedrock
-from .nodes.drivers.gtUIAmazonBedrockPromptDriver import gtUIAmazonBedrockPromptDriver
-from .nodes.drivers.gtUIAmazonBedrockStableDiffusionImageGenerationDriver import (
-    gtUIAmazonBedrockStableDiffusionImageGenerationDriver,
-)
-from .nodes.drivers.gtUIAmazonBedrockTitanEmbeddingDriver import (
-    gtUIAmazonBedrockTitanEmbeddingDriver,
-)
-from .nodes.drivers.gtUIAmazonBedrockTitanImageGenerationDriver import (
-    gtUIAmazonBedrockTitanImageGenerationDriver,
-)
-
-# - Amazon OpenSearch
-from .nodes.drivers.gtUIAmazonOpenSearchVectorStoreDriver import (
-    gtUIAmazonOpenSearchVectorStoreDriver,
-)
-
-# - Amazon SageMaker Jumpstart
-from .nodes.drivers.gtUIAmazonSageMakerJumpstartEmbeddingDriver import (
-    gtUIAmazonSageMakerJumpstartEmbeddingDriver,
-)
-from .nodes.drivers.gtUIAmazonSageMakerJumpstartPromptDriver import (
-    gtUIAmazonSageMakerJumpstartPromptDriver,
-)
-
-# - Anthropic
-# from .nodes.drivers.gtUIAnthropicImageQueryDriver import gtUIAnthropicImageQueryDriver
-from .nodes.drivers.gtUIAnthropicPromptDriver import gtUIAnthropicPromptDriver
-from .nodes.drivers.gtUIAzureMongoDbVectorStoreDriver import (
-    gtUIAzureMongoDbVectorStoreDriver,
-)
-
-# - Azure
-from .nodes.drivers.gtUIAzureOpenAiChatPromptDriver import (
-    gtUIAzureOpenAiChatPromptDriver,
-)
-from .nodes.drivers.gtUIAzureOpenAiEmbeddingDriver import gtUIAzureOpenAiEmbeddingDriver
-from .nodes.drivers.gtUIAzureOpenAiImageGenerationDriver import (
-    gtUIAzureOpenAiImageGenerationDriver,
-)
-
-# - Cohere
-from .nodes.drivers.gtUICohereEmbeddingDriver import gtUICohereEmbeddingDriver
-from .nodes.drivers.gtUICoherePromptDriver import gtUICoherePromptDriver
-
-# - DuckDuckGo
-from .nodes.drivers.gtUIDuckDuckGoWebSearchDriver import gtUIDuckDuckGoWebSearchDriver
-
-# - ElevenLabs
-from .nodes.drivers.gtUIElevenLabsTextToSpeechDriver import (
-    gtUIElevenLabsTextToSpeechDriver,
-)
-
-# - Google
-from .nodes.drivers.gtUIGoogleEmbeddingDriver import gtUIGoogleEmbeddingDriver
-from .nodes.drivers.gtUIGooglePromptDriver import gtUIGooglePromptDriver
-from .nodes.drivers.gtUIGoogleWebSearchDriver import gtUIGoogleWebSearchDriver
-
-# - Griptape
-from .nodes.drivers.gtUIGriptapeCloudKnowledgeBaseVectorStoreDriver import (
-    gtUIGriptapeCloudKnowledgeBaseVectorStoreDriver,
-)
-
-# - HuggingFace
-from .nodes.drivers.gtUIHuggingFaceHubEmbeddingDriver import (
-    gtUIHuggingFaceHubEmbeddingDriver,
-)
-from .nodes.drivers.gtUIHuggingFaceHubPromptDriver import gtUIHuggingFaceHubPromptDriver
-
-# - Leonardo.AI
-from .nodes.drivers.gtUILeonardoImageGenerationDriver import (
-    gtUILeonardoImageGenerationDriver,
+from .nodes.custom_routes import init_routes  # noqa: E402
+from .nodes.lazy_nodes import (  # noqa: E402
+    build_node_mappings,
+    get_import_report,
+    record_package_import,
 )
 
-# - LM Studio
-from .nodes.drivers.gtUILMStudioChatPromptDriver import gtUILMStudioChatPromptDriver
-
-# - Local
-from .nodes.drivers.gtUILocalVectorStoreDriver import gtUILocalVectorStoreDriver
-
-# - Marqo
-from .nodes.drivers.gtUIMarqoVectorStoreDriver import gtUIMarqoVectorStoreDriver
-
-# - Mongodb
-from .nodes.drivers.gtUIMongoDbAtlasVectorStoreDriver import (
-    gtUIMongoDbAtlasVectorStoreDriver,
-)
-
-# - Ollama
-from .nodes.drivers.gtUIOllamaEmbeddingDriver import gtUIOllamaEmbeddingDriver
-from .nodes.drivers.gtUIOllamaPromptDriver import gtUIOllamaPromptDriver
-
-# - OpenAI
-from .nodes.drivers.gtUIOpenAiAudioTranscriptionDriver import (
-    gtUIOpenAiAudioTranscriptionDriver,
-)
-from .nodes.drivers.gtUIOpenAiChatPromptDriver import gtUIOpenAiChatPromptDriver
-from .nodes.drivers.gtUIOpenAiCompatibleChatPromptDriver import (
-    gtUIOpenAiCompatibleChatPromptDriver,
-)
-from .nodes.drivers.gtUIOpenAiCompatibleEmbeddingDriver import (
-    gtUIOpenAiCompatibleEmbeddingDriver,
-)
-from .nodes.drivers.gtUIOpenAiEmbeddingDriver import gtUIOpenAiEmbeddingDriver
-from .nodes.drivers.gtUIOpenAiImageGenerationDriver import (
-    gtUIOpenAiImageGenerationDriver,
-)
-from .nodes.drivers.gtUIOpenAiTextToSpeechDriver import gtUIOpenAiTextToSpeechDriver
-
-# - PGVector
-from .nodes.drivers.gtUIPgVectorVectorStoreDriver import gtUIPgVectorVectorStoreDriver
-
-# - Pinecone
-from .nodes.drivers.gtUIPineconeVectorStoreDriver import gtUIPineconeVectorStoreDriver
-
-# - Qdrant
-from .nodes.drivers.gtUIQdrantVectorStoreDriver import gtUIQdrantVectorStoreDriver
-
-# - Redis
-from .nodes.drivers.gtUIRedisVectorStoreDriver import gtUIRedisVectorStoreDriver
-
-# - Voyage AI
-from .nodes.drivers.gtUIVoyageAiEmbeddingDriver import gtUIVoyageAiEmbeddingDriver
-
-# LOADERS
-from .nodes.loaders.gtUIFetchImage import gtUIFetchImage
-from .nodes.loaders.gtUILoadAudio import gtUILoadAudio
-from .nodes.loaders.gtUILoadText import gtUILoadText
-
-# RULES
-from .nodes.rules.gtUIRule import gtUIRule
-from .nodes.Separator import Separator
-
-# TASKS
-# - Audio
-from .nodes.tasks.gtUIAudioTranscriptionTask import gtUIAudioTranscriptionTask
-
-# - Image
-from .nodes.tasks.gtUIImageQueryTask import gtUIImageQueryTask
-from .nodes.tasks.gtUIParallelImageQueryTask import gtUIParallelImageQueryTask
-from .nodes.tasks.gtUIPromptImageGenerationTask import gtUIPromptImageGenerationTask
-from .nodes.tasks.gtUIPromptImageVariationTask import gtUIPromptImageVariationTask
-from .nodes.tasks.gtUIPromptTask import gtUIPromptTask
-
-# - Text
-from .nodes.tasks.gtUITextSummaryTask import gtUITextSummaryTask
-from .nodes.tasks.gtUITextToSpeechTask import gtUITextToSpeechTask
-
-# - Tool
-from .nodes.tasks.gtUIToolkitTask import gtUIToolkitTask
-from .nodes.tasks.gtUIToolTask import gtUIToolTask
-
-# - Vector Store
-from .nodes.tasks.gtUIVectorStoreQueryTask import gtUIVectorStoreQueryTask
-from .nodes.tasks.gtUIVectorStoreUpsertTextTask import gtUIVectorStoreUpsertTextTask
-
-# TEXT
-from .nodes.text.gtUICLIPTextEncode import gtUICLIPTextEncode
-from .nodes.text.gtUIInputStringNode import gtUIInputStringNode
-from .nodes.text.gtUISaveText import gtUISaveText
-
-# TOOLS
-from .nodes.tools.gtUIAudioTranscriptionClient import gtUIAudioTranscriptionClient
-from .nodes.tools.gtUICalculator import gtUICalculator
-from .nodes.tools.gtUIConvertAgentToTool import gtUIConvertAgentToTool
-from .nodes.tools.gtUIDateTime import gtUIDateTime
-from .nodes.tools.gtUIFileManager import gtUIFileManager
-from .nodes.tools.gtUIKnowledgeBaseTool import gtUIKnowledgeBaseTool
-from .nodes.tools.gtUITextToSpeechClient import gtUITextToSpeechClient
-from .nodes.tools.gtUIVectorStoreClient import gtUIVectorStoreClient
-from .nodes.tools.gtUIWebScraper import gtUIWebScraper
-from .nodes.tools.gtUIWebSearch import gtUIWebSearch
-
 # CONFIG
-from .py.griptape_config import (
+from .py.griptape_config import (  # noqa: E402
     load_and_prepare_config,
 )
 
@@ -249,135 +44,156 @@ init_routes()
 # Now load and prepare the configuration
 config = load_and_prepare_config(DEFAULT_CONFIG_FILE, USER_CONFIG_FILE)
 
-NODE_CLASS_MAPPINGS = {}
-NODE_DISPLAY_NAME_MAPPINGS = {}
-WEB_DIRECTORY = "./js"
-
-NODE_CLASS_MAPPINGS = {
+# Node display name -> "module:ClassName", relative to the nodes package.
+# Modules are only imported the first time a node is instantiated, or its
+# INPUT_TYPES are requested and not already in the node cache.
+NODE_MANIFEST = {
     # AGENT
-    "Griptape Create: Agent": CreateAgent,
-    "Griptape Create: Agent from Config": gtUICreateAgentFromConfig,
-    "Griptape Run: Agent": RunAgent,
-    "Griptape Run: Prompt Task": gtUIPromptTask,
-    "Griptape Run: Text Summary": gtUITextSummaryTask,
-    "Griptape Run: Tool Task": gtUIToolTask,
-    "Griptape Run: Toolkit Task": gtUIToolkitTask,
-    # "Gt Run Agent": gtUIRunAgent,
-    "Griptape Expand: Agent Nodes": ExpandAgent,
-    "Griptape Set: Default Agent": gtUISetDefaultAgent,
+    "Griptape Create: Agent": "agent.CreateAgent:CreateAgent",
+    "Griptape Create: Agent from Config": "agent.gtUICreateAgentFromConfig:gtUICreateAgentFromConfig",
+    "Griptape Run: Agent": "agent.RunAgent:RunAgent",
+    "Griptape Run: Prompt Task": "tasks.gtUIPromptTask:gtUIPromptTask",
+    "Griptape Run: Batch Prompt Task": "tasks.gtUIBatchPromptTask:gtUIBatchPromptTask",
+    "Griptape Run: Text Summary": "tasks.gtUITextSummaryTask:gtUITextSummaryTask",
+    "Griptape Run: Tool Task": "tasks.gtUIToolTask:gtUIToolTask",
+    "Griptape Run: Toolkit Task": "tasks.gtUIToolkitTask:gtUIToolkitTask",
+    # "Gt Run Agent": "agent.gtUIRunAgent:gtUIRunAgent",
+    "Griptape Expand: Agent Nodes": "agent.ExpandAgent:ExpandAgent",
+    "Griptape Set: Default Agent": "agent.gtUISetDefaultAgent:gtUISetDefaultAgent",
     # AGENT CONFIG
-    "Griptape Agent Config: Custom Structure": gtUIStructureConfig,
-    "Griptape Agent Config: Environment Variables": gtUIEnvConfig,
-    "Griptape Agent Config: Amazon Bedrock": gtUIAmazonBedrockStructureConfig,
-    "Griptape Agent Config: Anthropic": gtUIAnthropicStructureConfig,
+    "Griptape Agent Config: Custom Structure": "config.gtUIStructureConfig:gtUIStructureConfig",
+    "Griptape Agent Config: Environment Variables": "config.gtUIEnvConfig:gtUIEnvConfig",
+    "Griptape Agent Config: Amazon Bedrock": "config.gtUIAmazonBedrockStructureConfig:gtUIAmazonBedrockStructureConfig",
+    "Griptape Agent Config: Anthropic": "config.gtUIAnthropicStructureConfig:gtUIAnthropicStructureConfig",
     # Unable to test AzureOpenAI config at the moment - so disabling for now
-    "Griptape Agent Config: Azure OpenAI": gtUIAzureOpenAiStructureConfig,
-    "Griptape Agent Config: Google": gtUIGoogleStructureConfig,
-    "Griptape Agent Config: HuggingFace": gtUIHuggingFaceStructureConfig,
-    "Griptape Agent Config: LM Studio": gtUILMStudioStructureConfig,
-    "Griptape Agent Config: Ollama": gtUIOllamaStructureConfig,
-    "Griptape Agent Config: OpenAI": gtUIOpenAiStructureConfig,
-    "Griptape Agent Config: OpenAI Compatible": gtUIOpenAiCompatibleConfig,
+    "Griptape Agent Config: Azure OpenAI": "config.gtUIAzureOpenAiStructureConfig:gtUIAzureOpenAiStructureConfig",
+    "Griptape Agent Config: Google": "config.gtUIGoogleStructureConfig:gtUIGoogleStructureConfig",
+    "Griptape Agent Config: HuggingFace": "config.gtUIHuggingFaceStructureConfig:gtUIHuggingFaceStructureConfig",
+    "Griptape Agent Config: LM Studio": "config.gtUILMStudioStructureConfig:gtUILMStudioStructureConfig",
+    "Griptape Agent Config: Ollama": "config.gtUIOllamaStructureConfig:gtUIOllamaStructureConfig",
+    "Griptape Agent Config: OpenAI": "config.gtUIOpenAiStructureConfig:gtUIOpenAiStructureConfig",
+    "Griptape Agent Config: OpenAI Compatible": "config.gtUIOpenAiCompatibleConfig:gtUIOpenAiCompatibleConfig",
     # PROMPT DRIVER
-    "Griptape Prompt Driver: Amazon Bedrock": gtUIAmazonBedrockPromptDriver,
-    "Griptape Prompt Driver: Amazon SageMaker Jumpstart": gtUIAmazonSageMakerJumpstartPromptDriver,
-    "Griptape Prompt Driver: Anthropic": gtUIAnthropicPromptDriver,
-    "Griptape Prompt Driver: Azure OpenAI": gtUIAzureOpenAiChatPromptDriver,
-    "Griptape Prompt Driver: Cohere": gtUICoherePromptDriver,
-    "Griptape Prompt Driver: Google": gtUIGooglePromptDriver,
-    "Griptape Prompt Driver: HuggingFace": gtUIHuggingFaceHubPromptDriver,
-    "Griptape Prompt Driver: LM Studio": gtUILMStudioChatPromptDriver,
-    "Griptape Prompt Driver: Ollama": gtUIOllamaPromptDriver,
-    "Griptape Prompt Driver: OpenAI": gtUIOpenAiChatPromptDriver,
-    "Griptape Prompt Driver: OpenAI Compatible": gtUIOpenAiCompatibleChatPromptDriver,
+    "Griptape Prompt Driver: Amazon Bedrock": "drivers.gtUIAmazonBedrockPromptDriver:gtUIAmazonBedrockPromptDriver",
+    "Griptape Prompt Driver: Amazon SageMaker Jumpstart": "drivers.gtUIAmazonSageMakerJumpstartPromptDriver:gtUIAmazonSageMakerJumpstartPromptDriver",
+    "Griptape Prompt Driver: Anthropic": "drivers.gtUIAnthropicPromptDriver:gtUIAnthropicPromptDriver",
+    "Griptape Prompt Driver: Azure OpenAI": "drivers.gtUIAzureOpenAiChatPromptDriver:gtUIAzureOpenAiChatPromptDriver",
+    "Griptape Prompt Driver: Cohere": "drivers.gtUICoherePromptDriver:gtUICoherePromptDriver",
+    "Griptape Prompt Driver: Google": "drivers.gtUIGooglePromptDriver:gtUIGooglePromptDriver",
+    "Griptape Prompt Driver: HuggingFace": "drivers.gtUIHuggingFaceHubPromptDriver:gtUIHuggingFaceHubPromptDriver",
+    "Griptape Prompt Driver: LM Studio": "drivers.gtUILMStudioChatPromptDriver:gtUILMStudioChatPromptDriver",
+    "Griptape Prompt Driver: Ollama": "drivers.gtUIOllamaPromptDriver:gtUIOllamaPromptDriver",
+    "Griptape Prompt Driver: OpenAI": "drivers.gtUIOpenAiChatPromptDriver:gtUIOpenAiChatPromptDriver",
+    "Griptape Prompt Driver: OpenAI Compatible": "drivers.gtUIOpenAiCompatibleChatPromptDriver:gtUIOpenAiCompatibleChatPromptDriver",
     # IMAGE GENERATION DRIVERS
-    "Griptape Driver: Amazon Bedrock Stable Diffusion": gtUIAmazonBedrockStableDiffusionImageGenerationDriver,
-    "Griptape Driver: Amazon Bedrock Titan": gtUIAmazonBedrockTitanImageGenerationDriver,
-    "Griptape Driver: Azure OpenAI Image Generation": gtUIAzureOpenAiImageGenerationDriver,
-    "Griptape Driver: Leonardo.AI": gtUILeonardoImageGenerationDriver,
-    "Griptape Driver: OpenAI Image Generation": gtUIOpenAiImageGenerationDriver,
+    "Griptape Driver: Amazon Bedrock Stable Diffusion": "drivers.gtUIAmazonBedrockStableDiffusionImageGenerationDriver:gtUIAmazonBedrockStableDiffusionImageGenerationDriver",
+    "Griptape Driver: Amazon Bedrock Titan": "drivers.gtUIAmazonBedrockTitanImageGenerationDriver:gtUIAmazonBedrockTitanImageGenerationDriver",
+    "Griptape Driver: Azure OpenAI Image Generation": "drivers.gtUIAzureOpenAiImageGenerationDriver:gtUIAzureOpenAiImageGenerationDriver",
+    "Griptape Driver: Leonardo.AI": "drivers.gtUILeonardoImageGenerationDriver:gtUILeonardoImageGenerationDriver",
+    "Griptape Driver: OpenAI Image Generation": "drivers.gtUIOpenAiImageGenerationDriver:gtUIOpenAiImageGenerationDriver",
     # EMBEDDING DRIVER
-    "Griptape Embedding Driver: Amazon Bedrock Titan": gtUIAmazonBedrockTitanEmbeddingDriver,
-    "Griptape Embedding Driver: Amazon SageMaker Jumpstart": gtUIAmazonSageMakerJumpstartEmbeddingDriver,
-    "Griptape Embedding Driver: Azure OpenAI": gtUIAzureOpenAiEmbeddingDriver,
-    "Griptape Embedding Driver: Cohere": gtUICohereEmbeddingDriver,
-    "Griptape Embedding Driver: Google": gtUIGoogleEmbeddingDriver,
-    "Griptape Embedding Driver: HuggingFace": gtUIHuggingFaceHubEmbeddingDriver,
-    "Griptape Embedding Driver: Ollama": gtUIOllamaEmbeddingDriver,
-    "Griptape Embedding Driver: OpenAI": gtUIOpenAiEmbeddingDriver,
-    "Griptape Embedding Driver: OpenAI Compatible": gtUIOpenAiCompatibleEmbeddingDriver,
-    "Griptape Embedding Driver: Voyage AI": gtUIVoyageAiEmbeddingDriver,
+    "Griptape Embedding Driver: Amazon Bedrock Titan": "drivers.gtUIAmazonBedrockTitanEmbeddingDriver:gtUIAmazonBedrockTitanEmbeddingDriver",
+    "Griptape Embedding Driver: Amazon SageMaker Jumpstart": "drivers.gtUIAmazonSageMakerJumpstartEmbeddingDriver:gtUIAmazonSageMakerJumpstartEmbeddingDriver",
+    "Griptape Embedding Driver: Azure OpenAI": "drivers.gtUIAzureOpenAiEmbeddingDriver:gtUIAzureOpenAiEmbeddingDriver",
+    "Griptape Embedding Driver: Cohere": "drivers.gtUICohereEmbeddingDriver:gtUICohereEmbeddingDriver",
+    "Griptape Embedding Driver: Google": "drivers.gtUIGoogleEmbeddingDriver:gtUIGoogleEmbeddingDriver",
+    "Griptape Embedding Driver: HuggingFace": "drivers.gtUIHuggingFaceHubEmbeddingDriver:gtUIHuggingFaceHubEmbeddingDriver",
+    "Griptape Embedding Driver: Ollama": "drivers.gtUIOllamaEmbeddingDriver:gtUIOllamaEmbeddingDriver",
+    "Griptape Embedding Driver: OpenAI": "drivers.gtUIOpenAiEmbeddingDriver:gtUIOpenAiEmbeddingDriver",
+    "Griptape Embedding Driver: OpenAI Compatible": "drivers.gtUIOpenAiCompatibleEmbeddingDriver:gtUIOpenAiCompatibleEmbeddingDriver",
+    "Griptape Embedding Driver: Voyage AI": "drivers.gtUIVoyageAiEmbeddingDriver:gtUIVoyageAiEmbeddingDriver",
     # VECTOR STORE DRIVERS
-    "Griptape Vector Store Driver: Amazon OpenSearch": gtUIAmazonOpenSearchVectorStoreDriver,
-    "Griptape Vector Store Driver: Azure MongoDB": gtUIAzureMongoDbVectorStoreDriver,
-    "Griptape Vector Store Driver: Griptape Cloud KnowledgeBase": gtUIGriptapeCloudKnowledgeBaseVectorStoreDriver,
-    "Griptape Vector Store Driver: Marqo": gtUIMarqoVectorStoreDriver,
-    "Griptape Vector Store Driver: MongoDB Atlas": gtUIMongoDbAtlasVectorStoreDriver,
-    "Griptape Vector Store Driver: Local": gtUILocalVectorStoreDriver,
-    "Griptape Vector Store Driver: PGVector": gtUIPgVectorVectorStoreDriver,
-    "Griptape Vector Store Driver: Pinecone": gtUIPineconeVectorStoreDriver,
-    "Griptape Vector Store Driver: Redis": gtUIRedisVectorStoreDriver,
-    "Griptape Vector Store Driver: Qdrant": gtUIQdrantVectorStoreDriver,
+    "Griptape Vector Store Driver: Amazon OpenSearch": "drivers.gtUIAmazonOpenSearchVectorStoreDriver:gtUIAmazonOpenSearchVectorStoreDriver",
+    "Griptape Vector Store Driver: Azure MongoDB": "drivers.gtUIAzureMongoDbVectorStoreDriver:gtUIAzureMongoDbVectorStoreDriver",
+    "Griptape Vector Store Driver: Griptape Cloud KnowledgeBase": "drivers.gtUIGriptapeCloudKnowledgeBaseVectorStoreDriver:gtUIGriptapeCloudKnowledgeBaseVectorStoreDriver",
+    "Griptape Vector Store Driver: Marqo": "drivers.gtUIMarqoVectorStoreDriver:gtUIMarqoVectorStoreDriver",
+    "Griptape Vector Store Driver: MongoDB Atlas": "drivers.gtUIMongoDbAtlasVectorStoreDriver:gtUIMongoDbAtlasVectorStoreDriver",
+    "Griptape Vector Store Driver: Local": "drivers.gtUILocalVectorStoreDriver:gtUILocalVectorStoreDriver",
+    "Griptape Vector Store Driver: PGVector": "drivers.gtUIPgVectorVectorStoreDriver:gtUIPgVectorVectorStoreDriver",
+    "Griptape Vector Store Driver: Pinecone": "drivers.gtUIPineconeVectorStoreDriver:gtUIPineconeVectorStoreDriver",
+    "Griptape Vector Store Driver: Redis": "drivers.gtUIRedisVectorStoreDriver:gtUIRedisVectorStoreDriver",
+    "Griptape Vector Store Driver: Qdrant": "drivers.gtUIQdrantVectorStoreDriver:gtUIQdrantVectorStoreDriver",
     # TEXT TO SPEECH DRIVERS
-    "Griptape Text To Speech Driver: ElevenLabs": gtUIElevenLabsTextToSpeechDriver,
-    "Griptape Text To Speech Driver: OpenAI": gtUIOpenAiTextToSpeechDriver,
+    "Griptape Text To Speech Driver: ElevenLabs": "drivers.gtUIElevenLabsTextToSpeechDriver:gtUIElevenLabsTextToSpeechDriver",
+    "Griptape Text To Speech Driver: OpenAI": "drivers.gtUIOpenAiTextToSpeechDriver:gtUIOpenAiTextToSpeechDriver",
     # AUDIO DRIVERS
-    "Griptape Audio Transcription Driver: OpenAI": gtUIOpenAiAudioTranscriptionDriver,
+    "Griptape Audio Transcription Driver: OpenAI": "drivers.gtUIOpenAiAudioTranscriptionDriver:gtUIOpenAiAudioTranscriptionDriver",
     # WEBSEARCH DRIVERS
-    "Griptape WebSearch Driver: DuckDuckGo": gtUIDuckDuckGoWebSearchDriver,
-    "Griptape WebSearch Driver: Google": gtUIGoogleWebSearchDriver,
+    "Griptape WebSearch Driver: DuckDuckGo": "drivers.gtUIDuckDuckGoWebSearchDriver:gtUIDuckDuckGoWebSearchDriver",
+    "Griptape WebSearch Driver: Google": "drivers.gtUIGoogleWebSearchDriver:gtUIGoogleWebSearchDriver",
     # AGENT RULES
-    "Griptape Create: Rules": gtUIRule,
-    "Griptape Combine: Rules List": RulesList,
-    "Griptape Replace: Rulesets on Agent": gtUIReplaceRulesetsOnAgent,
+    "Griptape Create: Rules": "rules.gtUIRule:gtUIRule",
+    "Griptape Combine: Rules List": "combine.RulesList:RulesList",
+    "Griptape Replace: Rulesets on Agent": "agent.gtUIReplaceRulesetsOnAgent:gtUIReplaceRulesetsOnAgent",
     # TASKS
     # # STRUCTURES
-    # "Griptape Create: Pipeline": gtUICreatePipeline,
-    # "Griptape Run: Structure": gtUIRunStructure,
-    # "Griptape Pipeline: Add Task": gtUIPipelineAddTask,
-    # "Griptape Pipeline: Insert Task": gtUIPipelineInsertTask,
+    # "Griptape Create: Pipeline": "structures.CreatePipeline:gtUICreatePipeline",
+    # "Griptape Run: Structure": "structures.RunStructure:gtUIRunStructure",
+    # "Griptape Pipeline: Add Task": "structures.PipelineAddTask:gtUIPipelineAddTask",
+    # "Griptape Pipeline: Insert Task": "structures.PipelineInsertTask:gtUIPipelineInsertTask",
     # AGENT TOOLS
-    "Griptape Convert: Agent to Tool": gtUIConvertAgentToTool,
-    "Griptape Combine: Tool List": ToolList,
-    "Griptape Replace: Tools on Agent": gtUIReplaceToolsOnAgent,
-    "Griptape Tool: Audio Transcription": gtUIAudioTranscriptionClient,
-    "Griptape Tool: Calculator": gtUICalculator,
-    "Griptape Tool: DateTime": gtUIDateTime,
-    "Griptape Tool: FileManager": gtUIFileManager,
-    "Griptape Tool: Griptape Cloud KnowledgeBase": gtUIKnowledgeBaseTool,
-    "Griptape Tool: Text to Speech": gtUITextToSpeechClient,
-    "Griptape Tool: VectorStore": gtUIVectorStoreClient,
-    "Griptape Tool: WebScraper": gtUIWebScraper,
-    "Griptape Tool: WebSearch": gtUIWebSearch,
+    "Griptape Convert: Agent to Tool": "tools.gtUIConvertAgentToTool:gtUIConvertAgentToTool",
+    "Griptape Combine: Tool List": "combine.ToolList:ToolList",
+    "Griptape Replace: Tools on Agent": "agent.gtUIReplaceToolsOnAgent:gtUIReplaceToolsOnAgent",
+    "Griptape Tool: Audio Transcription": "tools.gtUIAudioTranscriptionClient:gtUIAudioTranscriptionClient",
+    "Griptape Tool: Calculator": "tools.gtUICalculator:gtUICalculator",
+    "Griptape Tool: DateTime": "tools.gtUIDateTime:gtUIDateTime",
+    "Griptape Tool: FileManager": "tools.gtUIFileManager:gtUIFileManager",
+    "Griptape Tool: Griptape Cloud KnowledgeBase": "tools.gtUIKnowledgeBaseTool:gtUIKnowledgeBaseTool",
+    "Griptape Tool: Text to Speech": "tools.gtUITextToSpeechClient:gtUITextToSpeechClient",
+    "Griptape Tool: VectorStore": "tools.gtUIVectorStoreClient:gtUIVectorStoreClient",
+    "Griptape Tool: WebScraper": "tools.gtUIWebScraper:gtUIWebScraper",
+    "Griptape Tool: WebSearch": "tools.gtUIWebSearch:gtUIWebSearch",
     # DISPLAY
-    "Griptape Display: Image": gtUIOutputImageNode,
-    "Griptape Display: Text": gtUIOutputStringNode,
-    "Griptape Display: Data as Text": gtUIOutputDataNode,
+    "Griptape Display: Image": "display.gtUIOutputImageNode:gtUIOutputImageNode",
+    "Griptape Display: Text": "display.gtUIOutputStringNode:gtUIOutputStringNode",
+    "Griptape Display: Data as Text": "display.gtUIOutputDataNode:gtUIOutputDataNode",
     # AUDIO
-    "Griptape Run: Audio Transcription": gtUIAudioTranscriptionTask,
-    "Griptape Run: Text to Speech": gtUITextToSpeechTask,
-    "Griptape Load: Audio": gtUILoadAudio,
+    "Griptape Run: Audio Transcription": "tasks.gtUIAudioTranscriptionTask:gtUIAudioTranscriptionTask",
+    "Griptape Run: Text to Speech": "tasks.gtUITextToSpeechTask:gtUITextToSpeechTask",
+    "Griptape Load: Audio": "loaders.gtUILoadAudio:gtUILoadAudio",
     # Image
-    "Griptape Create: Image from Text": gtUIPromptImageGenerationTask,
-    "Griptape Create: Image Variation": gtUIPromptImageVariationTask,
-    "Griptape Run: Image Description": gtUIImageQueryTask,
-    "Griptape Run: Parallel Image Description": gtUIParallelImageQueryTask,
-    "Griptape Load: Image From URL": gtUIFetchImage,
+    "Griptape Create: Image from Text": "tasks.gtUIPromptImageGenerationTask:gtUIPromptImageGenerationTask",
+    "Griptape Create: Image Variation": "tasks.gtUIPromptImageVariationTask:gtUIPromptImageVariationTask",
+    "Griptape Run: Image Description": "tasks.gtUIImageQueryTask:gtUIImageQueryTask",
+    "Griptape Run: Parallel Image Description": "tasks.gtUIParallelImageQueryTask:gtUIParallelImageQueryTask",
+    "Griptape Load: Image From URL": "loaders.gtUIFetchImage:gtUIFetchImage",
+    "Griptape Load: Images From URLs": "loaders.gtUIFetchImages:gtUIFetchImages",
     # TEXT
-    "Griptape Create: Text": gtUIInputStringNode,
-    "Griptape Create: CLIP Text Encode": gtUICLIPTextEncode,
-    "Griptape Convert: Text to CLIP Encode": gtUITextToClipEncode,
-    "Griptape Convert: Text to Combo": gtUITextToCombo,
-    "Griptape Combine: Merge Texts": MergeTexts,
-    "Griptape Combine: Merge Inputs": gtUIMergeInputs,
-    "Griptape Load: Text": gtUILoadText,
-    "Griptape Save: Text": gtUISaveText,
-    "Griptape Vector Store: Add Text": gtUIVectorStoreUpsertTextTask,
-    "Griptape Vector Store: Query": gtUIVectorStoreQueryTask,
-    # "Griptape Display: Artifact": gtUIOutputArtifactNode,
+    "Griptape Create: Text": "text.gtUIInputStringNode:gtUIInputStringNode",
+    "Griptape Create: CLIP Text Encode": "text.gtUICLIPTextEncode:gtUICLIPTextEncode",
+    "Griptape Convert: Text to CLIP Encode": "convert.gtUITextToClipEncode:gtUITextToClipEncode",
+    "Griptape Convert: Text to Combo": "convert.gtUITextToCombo:gtUITextToCombo",
+    "Griptape Combine: Merge Texts": "combine.MergeTexts:MergeTexts",
+    "Griptape Combine: Merge Inputs": "combine.gtUIMergeInputs:gtUIMergeInputs",
+    "Griptape Load: Text": "loaders.gtUILoadText:gtUILoadText",
+    "Griptape Save: Text": "text.gtUISaveText:gtUISaveText",
+    "Griptape Vector Store: Add Text": "tasks.gtUIVectorStoreUpsertTextTask:gtUIVectorStoreUpsertTextTask",
+    "Griptape Vector Store: Query": "tasks.gtUIVectorStoreQueryTask:gtUIVectorStoreQueryTask",
+    # "Griptape Display: Artifact": "display.gtUIOutputArtifactNode:gtUIOutputArtifactNode",
     # "Griptape Config: Environment Variables": gtUIEnv,
 }
 
+# Nodes whose INPUT_TYPES depend on the filesystem or the environment and must
+# never be cached.
+DYNAMIC_NODES = (
+    "Griptape Agent Config: Azure OpenAI",
+    "Griptape Load: Audio",
+    "Griptape Load: Text",
+)
+
+NODE_CLASS_MAPPINGS = build_node_mappings(NODE_MANIFEST, DYNAMIC_NODES)
+NODE_DISPLAY_NAME_MAPPINGS = {}
+WEB_DIRECTORY = "./js"
+
 
 __all__ = ["NODE_CLASS_MAPPINGS", "WEB_DIRECTORY"]
+record_package_import(time.perf_counter() - start_time)
+report = get_import_report()
+print(
+    f"   \033[34m- Registered {report['registered']} nodes "
+    f"({report['cached']} cached, lazy={report['lazy']}) "
+    f"in {report['registration_seconds']:.3f}s, "
+    f"package loaded in {report['package_import_seconds']:.3f}s\033[0m"
+)
 print("   \033[34m- \033[92mDone!\033[0m\n")
@@ -0,0 +1,65 @@
+// Shows the text of streaming prompt drivers while an agent is still running.
+// The server sends "comfy.gtUI.stream" messages: { node, stream, state, delta }
+// where state is "start", "chunk" or "end". Batch and parallel nodes run
+// several prompts at once, each with its own stream id; their text is shown
+// one after the other, in the order the streams started.
+export function setupStreaming(api, app) {
+  // Streams are kept until the node runs again.
+  api.addEventListener("executing", (event) => {
+    const nodeId = event.detail?.node ?? event.detail;
+    const node = nodeId != null && getNode(app, nodeId);
+    if (node) {
+      delete node.gtUIStreams;
+    }
+  });
+
+  api.addEventListener("comfy.gtUI.stream", (event) => {
+    const { node: nodeId, stream, state, delta } = event.detail;
+    const node = getNode(app, nodeId);
+    if (!node) {
+      return;
+    }
+    node.gtUIStreams ??= new Map();
+    if (state === "start") {
+      node.gtUIStreams.set(stream, "");
+    } else if (state === "chunk") {
+      node.gtUIStreams.set(stream, (node.gtUIStreams.get(stream) ?? "") + delta);
+      const text = [...node.gtUIStreams.values()].join("\n\n---\n\n");
+      for (const widget of getStreamWidgets(node, app)) {
+        widget.value = text;
+        if (widget.inputEl) {
+          widget.inputEl.scrollTop = widget.inputEl.scrollHeight;
+        }
+      }
+      app.graph.setDirtyCanvas(true, false);
+    }
+    // Nothing to do on "end": the display nodes get the final output once
+    // the node has finished.
+  });
+}
+
+// Node ids arrive as strings. Plain ids are numbers in the graph, but nodes
+// inside group nodes have ids like "12:3", which must be looked up as they are.
+function getNode(app, nodeId) {
+  const id = /^\d+$/.test(String(nodeId)) ? Number(nodeId) : nodeId;
+  return app.graph.getNodeById(id);
+}
+
+// The text widgets of the display nodes connected to the first output (OUTPUT).
+function getStreamWidgets(node, app) {
+  const widgets = [];
+  const links = node.outputs?.[0]?.links ?? [];
+  for (const linkId of links) {
+    const link = app.graph.links[linkId];
+    const target = link && app.graph.getNodeById(link.target_id);
+    if (!target || !target.type?.startsWith("Griptape Display")) {
+      continue;
+    }
+    const widget =
+      target.message ?? target.widgets?.find((w) => w.name === "STRING");
+    if (widget) {
+      widgets.push(widget);
+    }
+  }
+  return widgets;
+}
@@ -7,6 +7,7 @@ import { setupDisplayNodes } from "./DisplayNodes.js";
 import { setupCombineNodes } from "./CombineNodes.js";
 import { gtUIAddUploadWidget } from "./gtUIUtils.js";
 import {  setupMenuSeparator } from "./gtUIMenuSeparator.js";
+import { setupStreaming } from "./StreamingNodes.js";
 // app.extensionManager.registerSidebarTab({
 //   id: "search",
 //   icon: "pi pi-search",
@@ -34,6 +35,7 @@ app.registerExtension({
       // console.log(event.detail.message)
     }
     api.addEventListener("comfy.gtUI.runagent", messageHandler);
+    setupStreaming(api, app);
     
     // app.ui.settings.addSetting({
     //   id: "griptape.env",
@@ -3,9 +3,9 @@ from griptape.tasks import PromptTask, ToolkitTask
 from griptape.tools import TaskMemoryClient, VectorStoreClient
 from openai import OpenAIError
 
-# from server import PromptServer
 from ...py.griptape_config import get_config
-from .gtComfyAgent import gtComfyAgent
+from ..fingerprint import input_fingerprint
+from .gtComfyAgent import copy_conversation_memory, gtComfyAgent
 
 default_prompt = "{{ input_string }}"
 max_attempts_default = 10
@@ -77,6 +77,11 @@ class BaseAgent:
             },
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # A new agent is built from the default config when none is connected.
+        return input_fingerprint(kwargs, default_config=True)
+
     RETURN_TYPES = (
         "STRING",
         "AGENT",
@@ -97,6 +102,8 @@ class BaseAgent:
 
     def tool_check(self, config, tools):
         tool_list = []
+        # Don't add to the list handed in by the upstream node
+        tools = list(tools)
         if len(tools) > 0:
             # Check and see if any of the tools are VectorStoreClients
             for tool in tools:
@@ -154,7 +161,9 @@ class BaseAgent:
 
         # Memory
         if agent:
-            create_dict["conversation_memory"] = agent.conversation_memory
+            create_dict["conversation_memory"] = copy_conversation_memory(
+                agent.conversation_memory
+            )
             create_dict["meta_memory"] = agent.meta_memory
             create_dict["task_memory"] = agent.task_memory
 
@@ -178,12 +187,6 @@ class BaseAgent:
                 else:
                     prompt_text = STRING + "\n\n" + input_string
 
-                # # Start to think about sending update messages
-                # PromptServer.instance.send_sync(
-                #     "comfy.gtUI.textmessage",
-                #     {"message": f"Created agent with prompt: {prompt_text}"},
-                # )
-
                 if len(tools) > 0:
                     self.agent.add_task(ToolkitTask(prompt_text, tools=tools))
                 else:
@@ -24,7 +24,7 @@ class RunAgent(BaseAgent):
         if not agent:
             self.agent = gtComfyAgent()
         else:
-            self.agent = agent
+            self.agent = agent.fork()
 
         # Warn for models
         model, simple_model = self.agent.model_check()
@@ -1,25 +1,81 @@
+import attrs
 from dotenv import load_dotenv
 from griptape.config import BaseStructureConfig
+from griptape.mixins import EventPublisherMixin
 from griptape.structures import Agent
 
-from ...py.griptape_config import get_config
+from ...py.griptape_config import config_store
+from ..cancellation import run_interruptible
+from .token_window_memory import (
+    TokenWindowConversationMemory,
+    create_conversation_memory,
+)
+from ..driver_hooks import install_driver_hooks
+from ..pool import copy_attrs
+from ..tracing import tracer
 
 default_prompt = "{{ input_string }}"
 
 load_dotenv()
+install_driver_hooks()
 
 # agent = Agent()
 
 
+def get_default_structure_config():
+    # Only rebuilt when the "agent_config" section of griptape_config.json changes
+    return config_store.materialize("agent_config", BaseStructureConfig.from_dict)
+
+
+def copy_conversation_memory(conversation_memory):
+    if conversation_memory is None:
+        return None
+    if isinstance(conversation_memory, TokenWindowConversationMemory):
+        return conversation_memory.copy()
+    # Runs are only ever appended, so a new list is enough to keep the original intact.
+    conversation_memory = copy_attrs(conversation_memory)
+    conversation_memory.runs = list(conversation_memory.runs)
+    return conversation_memory
+
+
+def copy_structure_config(config):
+    """
+    A copy of a structure config, and of its drivers, for one structure.
+
+    Building a structure sets config.structure, which moves the drivers' event
+    listener to that structure. Configs and drivers are shared (see
+    config_store.materialize and pool.pooled_create), so without a copy every
+    structure running at the same time would send its events to whichever was
+    built last. The copies still share the drivers' clients and stores.
+    """
+    if config is None:
+        return None
+    config = copy_attrs(config)
+    for attribute in attrs.fields(type(config)):
+        driver = getattr(config, attribute.name)
+        if isinstance(driver, EventPublisherMixin):
+            driver = copy_attrs(driver)
+            driver.event_listeners = []
+            setattr(config, attribute.name, driver)
+    config._structure = None
+    config._event_listener = None
+    return config
+
+
 class gtComfyAgent(Agent):
     def __init__(self, *args, **kwargs):
         # Check if 'config' is in kwargs
         if "config" not in kwargs:
             # Get the default config
-            agent_config = get_config("agent_config")
-            if agent_config:
-                config = BaseStructureConfig.from_dict(agent_config)
+            config = get_default_structure_config()
+            if config:
                 kwargs["config"] = config
+        if kwargs.get("config") is not None:
+            kwargs["config"] = copy_structure_config(kwargs["config"])
+        if "conversation_memory" not in kwargs:
+            conversation_memory = create_conversation_memory()
+            if conversation_memory is not None:
+                kwargs["conversation_memory"] = conversation_memory
 
         # Initialize the parent class
         super().__init__(*args, **kwargs)
@@ -28,10 +84,33 @@ class gtComfyAgent(Agent):
         # if "config" not in kwargs:
         #     self.set_default_config()
 
+    def run(self, *args):
+        # Runs on the worker pool so ComfyUI's cancel button stops the node.
+        with tracer.span("agent.run", agent_id=self.id):
+            return run_interruptible(super().run, *args)
+
+    def fork(self):
+        """
+        A new agent with the same config, tools, rules and a copy of the
+        conversation so far.
+
+        Agents are passed between nodes and ComfyUI caches node outputs, so a
+        node must run a fork rather than the agent it was given - otherwise
+        re-using a cached upstream agent would see this node's runs.
+        """
+        return gtComfyAgent(
+            config=self.config,
+            tools=list(self.tools),
+            rulesets=list(self.rulesets),
+            rules=list(self.rules),
+            conversation_memory=copy_conversation_memory(self.conversation_memory),
+            meta_memory=self.meta_memory,
+            task_memory=self.task_memory,
+        )
+
     def set_default_config(self):
-        agent_config = get_config("agent_config")
-        if agent_config:
-            config = BaseStructureConfig.from_dict(agent_config)
+        config = get_default_structure_config()
+        if config:
             new_agent = self.update_config(config)
             self = new_agent
 
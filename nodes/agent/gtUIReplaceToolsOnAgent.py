@@ -1,7 +1,7 @@
 # from server import PromptServer
 from ...py.griptape_config import get_config
 from .BaseAgent import BaseAgent
-from .gtComfyAgent import gtComfyAgent
+from .gtComfyAgent import copy_conversation_memory, gtComfyAgent
 
 default_prompt = "{{ input_string }}"
 max_attempts_default = 10
@@ -59,7 +59,9 @@ class gtUIReplaceToolsOnAgent(BaseAgent):
 
         # Get all agent attributes
         create_dict["config"] = agent.config
-        create_dict["conversation_memory"] = agent.conversation_memory
+        create_dict["conversation_memory"] = copy_conversation_memory(
+            agent.conversation_memory
+        )
         create_dict["meta_memory"] = agent.meta_memory
         create_dict["task_memory"] = agent.task_memory
         create_dict["rulesets"] = agent.rulesets
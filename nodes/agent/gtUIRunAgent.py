@@ -3,7 +3,8 @@ from openai import OpenAIError
 
 # from server import PromptServer
 from ...py.griptape_config import get_config
-from .gtComfyAgent import gtComfyAgent
+from ..fingerprint import input_fingerprint
+from .gtComfyAgent import copy_conversation_memory, gtComfyAgent
 
 default_prompt = "{{ input_string }}"
 max_attempts_default = 10
@@ -55,6 +56,11 @@ class gtUIRunAgent:
             },
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # A new agent is built from the default config when none is connected.
+        return input_fingerprint(kwargs, default_config=True)
+
     RETURN_TYPES = (
         any,
         "AGENT",
@@ -91,7 +97,9 @@ class gtUIRunAgent:
 
         # Memory
         if agent:
-            create_dict["conversation_memory"] = agent.conversation_memory
+            create_dict["conversation_memory"] = copy_conversation_memory(
+                agent.conversation_memory
+            )
             create_dict["meta_memory"] = agent.meta_memory
             create_dict["task_memory"] = agent.task_memory
 
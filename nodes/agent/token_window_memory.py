@@ -0,0 +1,107 @@
+import os
+from typing import Optional
+
+from attrs import define, field
+from griptape.memory.structure import SummaryConversationMemory
+
+from ..metrics import metrics
+from ..pool import copy_attrs
+
+# Token budget for the conversation history sent with each prompt.
+# 0 (the default) keeps griptape's unbounded ConversationMemory.
+MEMORY_TOKEN_BUDGET = int(os.getenv("GRIPTAPE_MEMORY_TOKEN_BUDGET", "0"))
+# Fold runs that fall out of the window into a summary (1) or just drop them (0).
+MEMORY_SUMMARIZE = os.getenv("GRIPTAPE_MEMORY_SUMMARIZE", "1").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+@define
+class TokenWindowConversationMemory(SummaryConversationMemory):
+    """
+    Conversation memory that keeps the most recent runs within a token budget.
+
+    Runs that no longer fit are folded into the running summary. Only the newly
+    evicted runs are sent to the prompt driver, together with the previous
+    summary, so each run costs at most one small summarization call.
+
+    tokens_sent and tokens_saved are the history tokens sent with the last
+    prompt and left out of it. Their totals are in the
+    griptape_memory_tokens_total metric.
+    """
+
+    max_tokens: int = field(default=MEMORY_TOKEN_BUDGET, kw_only=True)
+    summarize: bool = field(default=MEMORY_SUMMARIZE, kw_only=True)
+    tokens_sent: int = field(default=0, kw_only=True)
+    tokens_saved: int = field(default=0, kw_only=True)
+    _run_tokens: dict = field(factory=dict, kw_only=True, alias="run_tokens")
+
+    def count_tokens(self, text: str) -> int:
+        try:
+            return self.prompt_driver.tokenizer.count_tokens(text)
+        except Exception:
+            # Dummy drivers have no tokenizer - fall back to a rough estimate.
+            return len(text) // 4
+
+    def run_tokens(self, run) -> int:
+        if run.id not in self._run_tokens:
+            self._run_tokens[run.id] = self.count_tokens(
+                run.input.to_text()
+            ) + self.count_tokens(run.output.to_text())
+        return self._run_tokens[run.id]
+
+    def try_add_run(self, run) -> None:
+        self.runs.append(run)
+
+        # Evict the oldest runs until the window fits, always keeping `offset` runs.
+        window = self.unsummarized_runs()
+        window_tokens = sum(self.run_tokens(r) for r in window)
+        evicted = []
+        for oldest in window[: max(0, len(window) - self.offset)]:
+            if window_tokens <= self.max_tokens:
+                break
+            window_tokens -= self.run_tokens(oldest)
+            evicted.append(oldest)
+
+        if evicted:
+            if self.summarize:
+                self.summary = self.summarize_runs(self.summary, evicted)
+            self.summary_index = 1 + self.runs.index(evicted[-1])
+
+    def add_to_prompt_stack(self, prompt_stack, index: Optional[int] = None):
+        count = len(prompt_stack.messages)
+        prompt_stack = super().add_to_prompt_stack(prompt_stack, index)
+        added = len(prompt_stack.messages) - count
+        start = count if index is None else index
+        messages = prompt_stack.messages[start : start + added]
+
+        history = sum(self.run_tokens(r) for r in self.runs)
+        self.tokens_sent = sum(self.count_tokens(m.to_text()) for m in messages)
+        self.tokens_saved = max(0, history - self.tokens_sent)
+        if metrics.enabled:
+            for kind, tokens in (
+                ("sent", self.tokens_sent),
+                ("saved", self.tokens_saved),
+            ):
+                metrics.inc("griptape_memory_tokens_total", (("type", kind),), tokens)
+        return prompt_stack
+
+    def copy(self):
+        """
+        A copy for a forked agent: its own runs and token counts, and no
+        prompt driver cached from the original agent's structure.
+        """
+        memory = copy_attrs(self)
+        memory.runs = list(self.runs)
+        memory._run_tokens = dict(self._run_tokens)
+        memory._prompt_driver = None
+        return memory
+
+
+def create_conversation_memory():
+    """The conversation memory for new agents, according to the environment."""
+    if MEMORY_TOKEN_BUDGET > 0:
+        return TokenWindowConversationMemory()
+    return None
@@ -0,0 +1,145 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from griptape.events import CompletionChunkEvent, EventListener, StartPromptEvent
+
+from .driver_hooks import add_ignored_exception_types
+
+# Number of agent / structure runs that can be in flight at once, including
+# ones that were cancelled but are still waiting on a provider to answer.
+AGENT_WORKERS = int(os.getenv("GRIPTAPE_AGENT_WORKERS", "4"))
+# How often the node waiting on a run checks ComfyUI's interrupt flag (seconds).
+POLL_INTERVAL = 0.1
+
+_local = threading.local()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class RunCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise RunCancelled("Run cancelled")
+
+
+def check_cancelled():
+    """Raises RunCancelled if the run on this thread has been cancelled."""
+    token = getattr(_local, "token", None)
+    if token is not None:
+        token.check()
+
+
+def get_model_management():
+    try:
+        import comfy.model_management
+    except ImportError:
+        return None
+    return comfy.model_management
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=AGENT_WORKERS, thread_name_prefix="griptape-run"
+            )
+        return _executor
+
+
+def _run_with_token(token, fn, args, kwargs):
+    _local.token = token
+    try:
+        token.check()
+        return fn(*args, **kwargs)
+    finally:
+        _local.token = None
+
+
+def bind_cancel_token(fn):
+    """
+    Wraps fn so that, on whatever thread it runs, it checks the cancel token
+    of the run that created it and sees its context variables. Used to fan
+    work out from a run.
+    """
+    token = getattr(_local, "token", None)
+    context = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, "token", None)
+        _local.token = token
+        try:
+            # A context can only be entered by one thread at a time.
+            return context.copy().run(fn, *args, **kwargs)
+        finally:
+            _local.token = previous
+
+    return wrapper
+
+
+def run_interruptible(fn, *args, **kwargs):
+    """
+    Runs fn on the worker pool and waits for it, giving up as soon as the
+    ComfyUI prompt is interrupted.
+
+    The run itself can't be killed - it is told to stop via a CancelToken that
+    is checked before every prompt driver call (each ToolkitTask step, each
+    pipeline task, each retry attempt) and between streamed chunks. Meanwhile
+    ComfyUI's InterruptProcessingException is raised straight away so the
+    queue moves on.
+    """
+    model_management = get_model_management()
+    if model_management is None or getattr(_local, "token", None) is not None:
+        # Outside ComfyUI, or already on a worker (an agent used as a tool).
+        return fn(*args, **kwargs)
+
+    token = CancelToken()
+    # Run in a copy of this context so the trace span in progress carries over.
+    context = contextvars.copy_context()
+    future = _get_executor().submit(
+        context.run, _run_with_token, token, fn, args, kwargs
+    )
+    while True:
+        try:
+            return future.result(timeout=POLL_INTERVAL)
+        except TimeoutError:
+            if model_management.processing_interrupted():
+                token.cancel()
+                # The flag is left set, so ComfyUI still stops before the next
+                # node even if a node catches this exception.
+                raise model_management.InterruptProcessingException()
+
+
+def _check_on_event(event):
+    check_cancelled()
+
+
+# StartPromptEvent is published on every attempt, so retries are covered too.
+cancel_listener = EventListener(
+    _check_on_event, event_types=[StartPromptEvent, CompletionChunkEvent]
+)
+
+
+def cancel_middleware(driver, prompt_stack, call_next):
+    """Prompt driver middleware - see driver_hooks."""
+    check_cancelled()
+    driver.add_event_listener(cancel_listener)
+    # Don't back off and retry a cancelled call.
+    add_ignored_exception_types(driver, RunCancelled)
+    return call_next(prompt_stack)
@@ -0,0 +1,129 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .cancellation import bind_cancel_token, check_cancelled
+
+# Maximum number of calls in flight per provider, across all nodes. Override a
+# single provider with e.g. GRIPTAPE_PROVIDER_CONCURRENCY_ANTHROPIC=2.
+PROVIDER_CONCURRENCY = int(os.getenv("GRIPTAPE_PROVIDER_CONCURRENCY", "8"))
+# Maximum number of image generations in flight per provider, across all
+# nodes. Override a single provider with e.g.
+# GRIPTAPE_IMAGE_GENERATION_CONCURRENCY_LEONARDO=2.
+IMAGE_GENERATION_CONCURRENCY = int(
+    os.getenv("GRIPTAPE_IMAGE_GENERATION_CONCURRENCY", "4")
+)
+# Providers that allow fewer concurrent generation jobs than that by default.
+IMAGE_GENERATION_PROVIDER_LIMITS = {"azureopenai": 2, "amazonbedrock": 2}
+IMAGE_GENERATION_METHODS = (
+    "run_text_to_image",
+    "run_image_variation",
+    "run_image_inpainting",
+    "run_image_outpainting",
+)
+
+_DRIVER_SUFFIX = re.compile(
+    r"(Chat)?(Prompt|Embedding|ImageGeneration|ImageQuery|TextToSpeech|"
+    r"AudioTranscription|VectorStore)Driver$"
+)
+
+
+def provider_name(driver) -> str:
+    """OpenAiChatPromptDriver -> "openai", AnthropicPromptDriver -> "anthropic"."""
+    return _DRIVER_SUFFIX.sub("", type(driver).__name__).lower()
+
+
+class ProviderLimits:
+    """One semaphore per provider (or tool), sized from the environment."""
+
+    def __init__(
+        self, default=PROVIDER_CONCURRENCY, env_prefix="GRIPTAPE_PROVIDER_CONCURRENCY"
+    ):
+        self.default = default
+        self.env_prefix = env_prefix
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def limit(self, provider) -> int:
+        value = os.getenv(f"{self.env_prefix}_{provider.upper()}")
+        return int(value) if value else self.default
+
+    def semaphore(self, provider):
+        with self._lock:
+            if provider not in self._semaphores:
+                self._semaphores[provider] = threading.BoundedSemaphore(
+                    max(1, self.limit(provider))
+                )
+            return self._semaphores[provider]
+
+    def acquire(self, provider):
+        semaphore = self.semaphore(provider)
+        # Wait in short steps so a cancelled run doesn't sit in the queue.
+        while not semaphore.acquire(timeout=0.1):
+            check_cancelled()
+        return semaphore
+
+
+provider_limits = ProviderLimits()
+
+
+class ImageGenerationLimits(ProviderLimits):
+    def limit(self, provider) -> int:
+        if os.getenv(f"{self.env_prefix}_{provider.upper()}"):
+            return super().limit(provider)
+        return min(
+            self.default, IMAGE_GENERATION_PROVIDER_LIMITS.get(provider, self.default)
+        )
+
+
+image_generation_limits = ImageGenerationLimits(
+    IMAGE_GENERATION_CONCURRENCY, "GRIPTAPE_IMAGE_GENERATION_CONCURRENCY"
+)
+
+
+def concurrency_middleware(driver, prompt_stack, call_next):
+    """Prompt driver middleware - see driver_hooks."""
+    semaphore = provider_limits.acquire(provider_name(driver))
+    try:
+        return call_next(prompt_stack)
+    finally:
+        semaphore.release()
+
+
+def image_generation_middleware(driver, method, args, call_next):
+    """Driver call middleware - see driver_hooks."""
+    if method not in IMAGE_GENERATION_METHODS:
+        return call_next()
+    semaphore = image_generation_limits.acquire(provider_name(driver))
+    try:
+        return call_next()
+    finally:
+        semaphore.release()
+
+
+def map_ordered(fn, items, max_workers):
+    """
+    Calls fn on every item using up to max_workers threads.
+
+    Returns a list, in the order of items, of (result, error, seconds) tuples.
+    A failing item doesn't stop the others.
+    """
+
+    def timed(item):
+        start = time.perf_counter()
+        try:
+            return (fn(item), None, time.perf_counter() - start)
+        except Exception as e:
+            return (None, e, time.perf_counter() - start)
+
+    items = list(items)
+    if not items:
+        return []
+    timed = bind_cancel_token(timed)
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(items))),
+        thread_name_prefix="griptape-batch",
+    ) as executor:
+        return list(executor.map(timed, items))
@@ -4,6 +4,9 @@ from griptape.config import (
     OpenAiStructureConfig,
 )
 
+from ..fingerprint import input_fingerprint
+from ..pool import pooled_create
+
 
 class gtUIBaseConfig:
     """
@@ -13,6 +16,12 @@ class gtUIBaseConfig:
     def __init__(self):
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Reuse configs (and their drivers' HTTP clients) when a node is run with the same inputs
+        if "create" in cls.__dict__ and not hasattr(cls.create, "__pooled__"):
+            cls.create = pooled_create(cls.create)
+
     @classmethod
     def INPUT_TYPES(s):
         return {
@@ -32,6 +41,10 @@ class gtUIBaseConfig:
             },
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return input_fingerprint(kwargs)
+
     RETURN_TYPES = ("CONFIG",)
     RETURN_NAMES = ("CONFIG",)
     FUNCTION = "create"
@@ -43,5 +56,6 @@ class gtUIBaseConfig:
     def getenv(self, env):
         return os.getenv(env, None)
 
+    @pooled_create
     def create(self, **kwargs):
         return (OpenAiStructureConfig(),)
@@ -16,6 +16,8 @@ from griptape.drivers import (
     OpenAiTextToSpeechDriver,
 )
 
+from ..pool import pooled_create
+
 default_env = "OPENAI_API_KEY"
 has_openai_key = os.getenv(default_env) is not None
 if not has_openai_key:
@@ -68,6 +70,7 @@ class gtUIStructureConfig:
 
     CATEGORY = "Griptape/Agent Configs"
 
+    @pooled_create
     def create(self, **kwargs):
         prompt_driver = kwargs.get("prompt_driver", default_chat_prompt_driver)
         image_generation_driver = kwargs.get(
@@ -1,8 +1,10 @@
 from aiohttp import web
 from server import PromptServer
 
-# Import your route handlers here
-from .utilities import get_models
+from .lazy_nodes import get_import_report
+from .metrics import metrics
+from .model_discovery import model_discovery
+from .response_cache import response_cache
 
 
 def setup_routes():
@@ -12,11 +14,81 @@ def setup_routes():
         engine = data.get("engine")
         base_ip = data.get("base_ip")
         port = data.get("port")
-        models = get_models(engine, base_ip, port)
+        try:
+            models = await model_discovery.get_models(engine, base_ip, port)
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
         return web.json_response(models)
 
+    @PromptServer.instance.routes.get("/Griptape/import_report")
+    async def import_report_endpoint(request):
+        return web.json_response(get_import_report())
+
+    @PromptServer.instance.routes.get("/Griptape/response_cache")
+    async def response_cache_endpoint(request):
+        return web.json_response(response_cache.stats())
+
+    @PromptServer.instance.routes.get("/Griptape/rate_limits")
+    async def rate_limits_endpoint(request):
+        # Imported here so griptape isn't loaded at startup
+        from .rate_limit import rate_limiter
+
+        return web.json_response(rate_limiter.stats())
+
+    @PromptServer.instance.routes.get("/Griptape/single_flight")
+    async def single_flight_endpoint(request):
+        from .single_flight import single_flight
+
+        return web.json_response(single_flight.stats())
+
+    @PromptServer.instance.routes.get("/Griptape/image_jobs")
+    async def image_jobs_endpoint(request):
+        # Pending and recently finished polled generation jobs (e.g. Leonardo)
+        from .image_jobs import image_jobs
+
+        return web.json_response(image_jobs.stats())
+
+    @PromptServer.instance.routes.get("/Griptape/image_fetch")
+    async def image_fetch_endpoint(request):
+        # Image URL cache of the Load: Image(s) From URL nodes
+        from .image_fetch import image_fetcher
+
+        return web.json_response(image_fetcher.stats())
+
+    @PromptServer.instance.routes.get("/Griptape/metrics")
+    async def metrics_endpoint(request):
+        # Prometheus text exposition format
+        return web.Response(
+            text=metrics.render_prometheus(),
+            content_type="text/plain",
+            headers={"X-Content-Type-Options": "nosniff"},
+        )
+
+    @PromptServer.instance.routes.get("/Griptape/metrics.json")
+    async def metrics_json_endpoint(request):
+        return web.json_response(metrics.to_dict())
+
+    @PromptServer.instance.routes.delete("/Griptape/metrics")
+    async def reset_metrics_endpoint(request):
+        metrics.reset()
+        return web.json_response(metrics.to_dict())
+
+    @PromptServer.instance.routes.delete("/Griptape/response_cache")
+    async def clear_response_cache_endpoint(request):
+        response_cache.clear()
+        return web.json_response(response_cache.stats())
+
+    @PromptServer.instance.routes.delete("/Griptape/image_fetch")
+    async def clear_image_fetch_endpoint(request):
+        from .image_fetch import image_fetcher
+
+        image_fetcher.clear()
+        return web.json_response(image_fetcher.stats())
+
 
 # Call this function to set up all routes
 def init_routes():
     setup_routes()
+    # Warm the model lists for the default local hosts without blocking startup.
+    model_discovery.prime(PromptServer.instance.loop)
     print("   \033[34m- Custom routes initialized.\033[0m")
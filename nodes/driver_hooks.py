@@ -0,0 +1,208 @@
+import copy
+import functools
+import importlib.metadata
+import threading
+
+from griptape.common.observable import Observable
+from griptape.drivers import (
+    BaseEmbeddingDriver,
+    BaseImageGenerationDriver,
+    BaseImageQueryDriver,
+    BasePromptDriver,
+    BaseVectorStoreDriver,
+)
+
+# Every prompt driver call, whichever node created the driver, goes through
+# BasePromptDriver.run. Middleware registered here wraps that call:
+#
+#     def middleware(driver, prompt_stack, call_next) -> Message
+#
+# Embedding, image generation, image query and vector store query calls go
+# through call middleware instead, where call_next takes no arguments:
+#
+#     def middleware(driver, method, args, call_next) -> result
+#
+# The first middleware added is the outermost one.
+_prompt_middleware = []
+_call_middleware = []
+_original_prompt_run = None
+_install_lock = threading.Lock()
+
+# The public entry points of the other driver types. Abstract methods are
+# hooked on every subclass that implements them.
+HOOKED_METHODS = (
+    (BaseEmbeddingDriver, "embed_string"),
+    (BaseImageGenerationDriver, "run_text_to_image"),
+    (BaseImageGenerationDriver, "run_image_variation"),
+    (BaseImageGenerationDriver, "run_image_inpainting"),
+    (BaseImageGenerationDriver, "run_image_outpainting"),
+    (BaseImageQueryDriver, "query"),
+    (BaseVectorStoreDriver, "query"),
+)
+
+
+def _run_prompt(driver, prompt_stack, index):
+    if index == len(_prompt_middleware):
+        return _original_prompt_run(driver, prompt_stack)
+    return _prompt_middleware[index](
+        driver,
+        prompt_stack,
+        lambda stack: _run_prompt(driver, stack, index + 1),
+    )
+
+
+def _run_call(driver, method, args, call, index):
+    if index == len(_call_middleware):
+        return call()
+    return _call_middleware[index](
+        driver,
+        method,
+        args,
+        lambda: _run_call(driver, method, args, call, index + 1),
+    )
+
+
+def _hook_method(cls, name):
+    original = getattr(cls, name)
+
+    @functools.wraps(original)
+    def method(self, *args, **kwargs):
+        return _run_call(
+            self, name, args, lambda: original(self, *args, **kwargs), 0
+        )
+
+    setattr(cls, name, method)
+
+
+def _implementations(cls, name):
+    if not getattr(getattr(cls, name), "__isabstractmethod__", False):
+        return [cls]
+    found = []
+    pending = list(cls.__subclasses__())
+    while pending:
+        subclass = pending.pop()
+        pending.extend(subclass.__subclasses__())
+        implementation = subclass.__dict__.get(name)
+        if implementation and not getattr(
+            implementation, "__isabstractmethod__", False
+        ):
+            found.append(subclass)
+    return found
+
+
+def add_prompt_middleware(middleware):
+    if middleware not in _prompt_middleware:
+        _prompt_middleware.append(middleware)
+
+
+def add_call_middleware(middleware):
+    if middleware not in _call_middleware:
+        _call_middleware.append(middleware)
+
+
+def add_ignored_exception_types(driver, *exception_types):
+    """Stops the driver's own retry loop from retrying these exceptions."""
+    if not hasattr(driver, "ignored_exception_types"):
+        # Not every driver type retries (e.g. vector store drivers).
+        return
+    missing = tuple(
+        t for t in exception_types if t not in driver.ignored_exception_types
+    )
+    if missing:
+        driver.ignored_exception_types = (*driver.ignored_exception_types, *missing)
+
+
+# griptape versions whose Observable.__get__ needs patch_observable (the
+# version pinned in requirements.txt). Check newer versions before adding them.
+OBSERVABLE_PATCH_VERSIONS = ("0.29.",)
+
+
+def _bind_observable(self, obj, objtype=None):
+    if obj is None:
+        return self
+    bound = copy.copy(self)
+    bound._instance = obj
+    return bound
+
+
+def patch_observable():
+    """
+    Makes griptape's @observable methods (Structure.run, BasePromptDriver.run,
+    ...) safe to call from several threads.
+
+    Observable.__get__ stores the instance it is looked up on in the shared
+    descriptor and returns the descriptor itself. When two threads look up
+    `agent.run` on different agents at the same time - the Batch Prompt node
+    runs forks of one agent concurrently - the first call can run on the
+    other thread's agent. The patch binds a copy of the descriptor instead.
+
+    Only applied to the griptape versions in OBSERVABLE_PATCH_VERSIONS.
+    """
+    try:
+        version = importlib.metadata.version("griptape")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    if not version.startswith(OBSERVABLE_PATCH_VERSIONS):
+        print(
+            f"   \033[33m- Not patching Observable.__get__ for griptape {version}: concurrent runs of one node may not be thread-safe\033[0m"
+        )
+        return False
+    Observable.__get__ = _bind_observable
+    return True
+
+
+def install_driver_hooks():
+    """Patches griptape once and registers the enabled middleware."""
+    global _original_prompt_run
+    with _install_lock:
+        if _original_prompt_run is not None:
+            return
+        patch_observable()
+        _original_prompt_run = BasePromptDriver.run
+
+        @functools.wraps(_original_prompt_run)
+        def run(self, prompt_stack):
+            return _run_prompt(self, prompt_stack, 0)
+
+        BasePromptDriver.run = run
+        for cls, name in HOOKED_METHODS:
+            for implementation in _implementations(cls, name):
+                _hook_method(implementation, name)
+
+        from griptape.tasks import ActionsSubtask
+
+        from .tool_actions import execute_actions
+
+        ActionsSubtask.execute_actions = execute_actions
+
+        from .cancellation import cancel_middleware
+        from .concurrency import concurrency_middleware, image_generation_middleware
+        from .metrics import metrics
+        from .metrics import call_middleware as metrics_call_middleware
+        from .metrics import prompt_middleware as metrics_prompt_middleware
+        from .rate_limit import rate_limiter
+        from .response_cache import response_cache
+        from .single_flight import single_flight
+        from .streaming import stream_middleware
+        from .tracing import install_tracing, tracer
+        from .tracing import call_middleware as tracing_call_middleware
+        from .tracing import prompt_middleware as tracing_prompt_middleware
+
+        add_prompt_middleware(cancel_middleware)
+        if tracer.enabled:
+            install_tracing()
+            add_prompt_middleware(tracing_prompt_middleware)
+            add_call_middleware(tracing_call_middleware)
+        if metrics.enabled:
+            add_prompt_middleware(metrics_prompt_middleware)
+            add_call_middleware(metrics_call_middleware)
+        if response_cache.enabled:
+            add_prompt_middleware(response_cache)
+        if single_flight.enabled:
+            add_prompt_middleware(single_flight.prompt_middleware)
+            add_call_middleware(single_flight.call_middleware)
+        add_prompt_middleware(rate_limiter.prompt_middleware)
+        add_prompt_middleware(concurrency_middleware)
+        add_prompt_middleware(stream_middleware)
+        add_call_middleware(rate_limiter.call_middleware)
+        add_call_middleware(image_generation_middleware)
@@ -2,9 +2,23 @@ import os
 
 from griptape.drivers import DummyPromptDriver
 
+from ..fingerprint import input_fingerprint
+from ..pool import pooled_create
+
 
 class gtUIBaseDriver:
     DESCRIPTION = "Griptape Driver"
+    # Reuse drivers (and their HTTP clients) when a node is run with the same inputs
+    POOL_INSTANCES = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if (
+            cls.POOL_INSTANCES
+            and "create" in cls.__dict__
+            and not hasattr(cls.create, "__pooled__")
+        ):
+            cls.create = pooled_create(cls.create)
 
     @classmethod
     def INPUT_TYPES(s):
@@ -13,6 +27,10 @@ class gtUIBaseDriver:
             "optional": {"env": ("ENV", {"default": None})},
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return input_fingerprint(kwargs)
+
     RETURN_TYPES = ("DRIVER",)
     RETURN_NAMES = ("DRIVER",)
 
@@ -23,6 +41,7 @@ class gtUIBaseDriver:
     def getenv(self, env):
         return os.getenv(env, None)
 
+    @pooled_create
     def create(self, **kwargs):
         driver = DummyPromptDriver()
         return (driver,)
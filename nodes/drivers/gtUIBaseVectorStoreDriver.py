@@ -13,6 +13,8 @@ from .gtUIBaseDriver import gtUIBaseDriver
 
 class gtUIBaseVectorStoreDriver(gtUIBaseDriver):
     DESCRIPTION = "Griptape Embedding Driver"
+    # Vector stores hold data, so two nodes with the same inputs must not share one.
+    POOL_INSTANCES = False
 
     @classmethod
     def INPUT_TYPES(s):
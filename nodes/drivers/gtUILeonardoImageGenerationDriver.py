@@ -1,7 +1,4 @@
-from griptape.drivers import (
-    LeonardoImageGenerationDriver,
-)
-
+from ..image_jobs import LeonardoImageGenerationDriver
 from .gtUIBaseImageDriver import gtUIBaseImageGenerationDriver
 
 DEFAULT_API_KEY_ENV_VAR = "LEONARDO_API_KEY"
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+
+from ..py.griptape_config import config_store
+
+HIDDEN_INPUTS = ("prompt", "unique_id", "extra_pnginfo")
+
+
+def fingerprint(*parts):
+    """
+    Returns (key, refs) for a set of node inputs.
+
+    JSON-able values are hashed by value. Anything else (drivers, tools,
+    rulesets, ...) is hashed by identity, and returned in refs so the caller
+    can keep it alive - otherwise its id() could be reused by a new object.
+    """
+    refs = []
+
+    def by_identity(value):
+        refs.append(value)
+        return f"<{type(value).__name__}@{id(value)}>"
+
+    payload = json.dumps(parts, sort_keys=True, default=by_identity)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest(), refs
+
+
+def api_key_id(driver) -> str:
+    # Rate limits and cached responses are per API key; only a hash of the key is kept.
+    api_key = getattr(driver, "api_key", None)
+    if not api_key:
+        return "default"
+    return hashlib.sha256(str(api_key).encode("utf-8")).hexdigest()[:12]
+
+
+def environment_fingerprint():
+    # Drivers read API keys from the environment, which the ENV node can change at any time.
+    return hashlib.sha256(repr(sorted(os.environ.items())).encode("utf-8")).hexdigest()
+
+
+def default_config_fingerprint():
+    # Nodes without a config or agent input fall back to the default agent config.
+    return fingerprint(config_store.get("agent_config"))[0]
+
+
+def input_fingerprint(inputs, default_config=False):
+    """
+    Value for a node's IS_CHANGED.
+
+    ComfyUI only passes the widget values; linked inputs are already covered
+    by the upstream nodes' own signatures. What is left is the state a node
+    reads from outside its inputs: the environment and, optionally, the
+    default agent config.
+    """
+    # Hidden inputs (the prompt graph, the node's id) aren't node settings.
+    inputs = {k: v for k, v in inputs.items() if k not in HIDDEN_INPUTS}
+    parts = [inputs, environment_fingerprint()]
+    if default_config:
+        parts.append(default_config_fingerprint())
+    return fingerprint(*parts)[0]
+
+
+def file_fingerprint(path):
+    # Same approach as ComfyUI's LoadImage - hash the file contents.
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
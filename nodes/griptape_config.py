@@ -1,14 +1,17 @@
 # This config code from rgthree-comfy - an incredibly helpful library!
 # https://github.com/rgthree/rgthree-comfy
-import os
 import json
 import re
 
-from .utils import get_dict_value, set_dict_value, dict_has_key
+from ..py.griptape_config import DEFAULT_CONFIG_FILE, config_store
+from .utils import dict_has_key, get_dict_value, set_dict_value
+
+# The user configuration lives in py.griptape_config.config_store, so there is a
+# single in-memory copy of griptape_config.json shared by every node.
 
 
 def get_config_value(key):
-    return get_dict_value(GRIPTAPE_CONFIG, key)
+    return get_dict_value(get_griptape_config(), key)
 
 
 def extend_config(default_config, user_config):
@@ -26,14 +29,14 @@ def extend_config(default_config, user_config):
 
 def set_user_config(data: dict):
     """Sets the user configuration."""
-    count = 0
-    for key, value in data.items():
-        if dict_has_key(DEFAULT_CONFIG, key):
-            set_dict_value(USER_CONFIG, key, value)
-            set_dict_value(GRIPTAPE_CONFIG, key, value)
-            count += 1
-    if count > 0:
-        write_user_config()
+
+    def apply(user_config):
+        for key, value in data.items():
+            if dict_has_key(DEFAULT_CONFIG, key):
+                set_dict_value(user_config, key, value)
+
+    if any(dict_has_key(DEFAULT_CONFIG, key) for key in data):
+        config_store.update(apply)
 
 
 def get_griptape_default_config():
@@ -45,32 +48,12 @@ def get_griptape_default_config():
 
 def get_griptape_user_config():
     """Gets the user configuration."""
-    if os.path.exists(USER_CONFIG_FILE):
-        with open(USER_CONFIG_FILE, "r", encoding="UTF-8") as file:
-            config = re.sub(r"(?:^|\s)//.*", "", file.read(), flags=re.MULTILINE)
-        return json.loads(config)
-    else:
-        return {}
+    return config_store.data()
 
 
-def write_user_config():
-    """Writes the user configuration."""
-    with open(USER_CONFIG_FILE, "w+", encoding="UTF-8") as file:
-        json.dump(USER_CONFIG, file, sort_keys=True, indent=2, separators=(",", ": "))
+def get_griptape_config():
+    """Gets the user configuration restricted to, and filled in from, the default keys."""
+    return extend_config(DEFAULT_CONFIG, get_griptape_user_config())
 
 
-THIS_DIR = os.path.dirname(os.path.abspath(__file__))
-DEFAULT_CONFIG_FILE = os.path.join(THIS_DIR, "..", "griptape_config.json.default")
-USER_CONFIG_FILE = os.path.join(THIS_DIR, "..", "griptape_config.json")
 DEFAULT_CONFIG = get_griptape_default_config()
-
-USER_CONFIG = get_griptape_user_config()
-
-# Migrate old config options into "features"
-needs_to_write_user_config = False
-
-if needs_to_write_user_config is True:
-    print("writing new user config.")
-    write_user_config()
-
-GRIPTAPE_CONFIG = extend_config(DEFAULT_CONFIG, USER_CONFIG)
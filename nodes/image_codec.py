@@ -0,0 +1,332 @@
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+from griptape.artifacts import ImageArtifact
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("png", "webp", "jpeg")
+FORMAT_ALIASES = {"jpg": "jpeg"}
+DEFAULT_JPEG_QUALITY = 90
+
+
+def normalize_format(format) -> str:
+    """The encoder's name for an image format ("jpg" is "jpeg")."""
+    format = format.strip().lower()
+    format = FORMAT_ALIASES.get(format, format)
+    if format not in FORMATS:
+        raise ValueError(
+            f"Unsupported image format {format!r}, use one of: {', '.join(FORMATS)}"
+        )
+    return format
+
+
+def _image_format_from_env():
+    value = os.getenv("GRIPTAPE_IMAGE_FORMAT", "png")
+    try:
+        return normalize_format(value)
+    except ValueError:
+        print(
+            f"   \033[33m- GRIPTAPE_IMAGE_FORMAT={value} is not supported, using png. Use one of: {', '.join(FORMATS)}\033[0m"
+        )
+        return "png"
+
+
+# Format used when images are sent to a provider: png, webp or jpeg (or jpg).
+IMAGE_FORMAT = _image_format_from_env()
+# JPEG / WebP quality (1-100). Unset means lossless WebP and quality 90 JPEG.
+IMAGE_QUALITY = int(os.getenv("GRIPTAPE_IMAGE_QUALITY", "0")) or None
+# zlib level for PNG (0-9). PIL's default of 6 is several times slower than 1
+# on large frames for a few percent smaller files.
+PNG_COMPRESS_LEVEL = int(os.getenv("GRIPTAPE_PNG_COMPRESS_LEVEL", "1"))
+# WebP encoder effort (0-6). 0 is over 10x faster than PIL's default of 4.
+WEBP_METHOD = int(os.getenv("GRIPTAPE_WEBP_METHOD", "0"))
+# Threads used to encode the frames of a batch. PIL releases the GIL while
+# encoding, so frames are encoded in parallel.
+IMAGE_CODEC_WORKERS = int(
+    os.getenv("GRIPTAPE_IMAGE_CODEC_WORKERS", str(min(8, os.cpu_count() or 4)))
+)
+
+# Set GRIPTAPE_IMAGE_DOWNSCALE=0 to send vision queries at full resolution
+# unless a node sets max_image_edge.
+DOWNSCALE_ENABLED = os.getenv("GRIPTAPE_IMAGE_DOWNSCALE", "1").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# The largest image each provider looks at, as (max long edge, max short edge,
+# max pixels). Larger images are downscaled by the provider anyway, so sending
+# them only costs encode time, upload bandwidth and latency. Override a single
+# provider's long edge with e.g. GRIPTAPE_IMAGE_MAX_EDGE_ANTHROPIC=1024.
+PROVIDER_IMAGE_LIMITS = {
+    # Fit in 2048x2048, then the short side is scaled to 768.
+    "openai": (2048, 768, None),
+    "azureopenai": (2048, 768, None),
+    # Long edge 1568 and about 1.15 megapixels.
+    "anthropic": (1568, None, 1_150_000),
+    # Bedrock's vision models are Claude models.
+    "amazonbedrock": (1568, None, 1_150_000),
+    "google": (3072, None, None),
+    # LLaVA 1.6 tiles up to 672x672 or 1344x336.
+    "ollama": (1344, None, None),
+}
+# OpenAI's low detail mode, offered to every provider.
+LOW_DETAIL_LIMITS = (512, None, None)
+IMAGE_DETAILS = ["auto", "low", "original"]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, IMAGE_CODEC_WORKERS),
+                thread_name_prefix="griptape-image",
+            )
+        return _executor
+
+
+def to_uint8_frames(image):
+    """
+    Converts a ComfyUI IMAGE tensor (or a numpy array) with values in 0-1 to a
+    (batch, height, width, channels) uint8 array.
+    """
+    if hasattr(image, "detach"):
+        image = image.detach().cpu()
+        # Scale to 0-255 in torch, so only the uint8 result is copied to numpy.
+        image = (255.0 * image).clamp(0, 255).byte().numpy()
+    elif isinstance(image, np.ndarray):
+        if image.dtype != np.uint8:
+            image = (255.0 * image).clip(0, 255).astype(np.uint8)
+    else:
+        raise TypeError("Input must be a PyTorch tensor or a numpy array")
+
+    if image.ndim == 2:  # Single channel image
+        image = image[None, :, :, None]
+    elif image.ndim == 3:  # Single image with channels
+        image = image[None]
+    elif image.ndim != 4:
+        raise ValueError(f"Unexpected tensor shape: {image.shape}")
+
+    # Permute dimensions if necessary (from B, C, H, W to B, H, W, C)
+    if image.shape[1] < image.shape[3]:
+        image = image.transpose(0, 2, 3, 1)
+    return image
+
+
+def image_limits(driver, detail="auto", max_edge=0):
+    """
+    The (max long edge, max short edge, max pixels) to send to a prompt driver,
+    or None to send images as they are. A max_edge above 0 overrides the rest.
+    """
+    from .concurrency import provider_name
+
+    if max_edge:
+        return (max_edge, None, None)
+    if detail == "original":
+        return None
+    if detail == "low":
+        return LOW_DETAIL_LIMITS
+    if not DOWNSCALE_ENABLED:
+        return None
+    provider = provider_name(driver)
+    override = os.getenv(f"GRIPTAPE_IMAGE_MAX_EDGE_{provider.upper()}")
+    if override:
+        return (int(override), None, None)
+    return PROVIDER_IMAGE_LIMITS.get(provider)
+
+
+def fit_size(width, height, limits):
+    """The largest (width, height) within limits, keeping the aspect ratio."""
+    if not limits:
+        return (width, height)
+    max_edge, max_short_edge, max_pixels = limits
+    scale = 1.0
+    if max_edge:
+        scale = min(scale, max_edge / max(width, height))
+    if max_short_edge:
+        scale = min(scale, max_short_edge / min(width, height))
+    if max_pixels:
+        scale = min(scale, math.sqrt(max_pixels / (width * height)))
+    if scale >= 1.0:
+        return (width, height)
+    return (max(1, int(width * scale)), max(1, int(height * scale)))
+
+
+def encode_frame(
+    frame,
+    format=IMAGE_FORMAT,
+    quality=IMAGE_QUALITY,
+    compress_level=PNG_COMPRESS_LEVEL,
+    limits=None,
+) -> ImageArtifact:
+    """Encodes one (height, width, channels) uint8 frame, downscaled to limits."""
+    format = normalize_format(format)
+    if frame.shape[-1] == 1:
+        frame = frame[..., 0]
+    img = Image.fromarray(np.ascontiguousarray(frame))
+    size = fit_size(img.width, img.height, limits)
+    if size != img.size:
+        # reducing_gap shrinks by whole factors with a box filter first, which
+        # is several times faster than a full bicubic pass on large frames.
+        img = img.resize(size, Image.Resampling.BICUBIC, reducing_gap=2.0)
+
+    buffer = BytesIO()
+    if format == "png":
+        img.save(buffer, format="PNG", compress_level=compress_level)
+    elif format == "webp":
+        if quality is None:
+            img.save(buffer, format="WEBP", lossless=True, method=WEBP_METHOD)
+        else:
+            img.save(buffer, format="WEBP", quality=quality, method=WEBP_METHOD)
+    else:
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.save(buffer, format="JPEG", quality=quality or DEFAULT_JPEG_QUALITY)
+    return ImageArtifact(
+        buffer.getvalue(), format=format, width=img.width, height=img.height
+    )
+
+
+def encode_images(
+    image,
+    format=IMAGE_FORMAT,
+    quality=IMAGE_QUALITY,
+    compress_level=PNG_COMPRESS_LEVEL,
+    limits=None,
+) -> list[ImageArtifact]:
+    """
+    Encodes every frame of an IMAGE batch straight to ImageArtifacts, in order,
+    encoding frames in parallel.
+    """
+    frames = to_uint8_frames(image)
+
+    def encode(frame):
+        return encode_frame(frame, format, quality, compress_level, limits)
+
+    if len(frames) == 1:
+        return [encode(frames[0])]
+    return list(_get_executor().map(encode, frames))
+
+
+class DownscaleReport:
+    """
+    Totals what downscaling saved over a node run and records it in the
+    metrics once (and in a debug log line), rather than per image.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.images = 0
+        self.original_pixels = 0
+        self.sent_pixels = 0
+        self.sent_bytes = 0
+        self.size = None
+        self._lock = threading.Lock()
+
+    def add(self, frame, artifact):
+        with self._lock:
+            self.images += 1
+            self.original_pixels += frame.shape[0] * frame.shape[1]
+            self.sent_pixels += artifact.width * artifact.height
+            self.sent_bytes += len(artifact.value)
+            self.size = (artifact.width, artifact.height)
+
+    def emit(self):
+        from .concurrency import provider_name
+        from .metrics import metrics
+
+        if self.sent_pixels >= self.original_pixels:
+            return
+        # Encoded size grows about linearly with the pixel count.
+        saved_bytes = int(
+            self.sent_bytes * (self.original_pixels / self.sent_pixels - 1)
+        )
+        provider = provider_name(self.driver)
+        if metrics.enabled:
+            labels = (("provider", provider),)
+            metrics.inc(
+                "griptape_image_pixels_total",
+                (*labels, ("stage", "input")),
+                self.original_pixels,
+            )
+            metrics.inc(
+                "griptape_image_pixels_total",
+                (*labels, ("stage", "sent")),
+                self.sent_pixels,
+            )
+            metrics.inc("griptape_image_bytes_saved_total", labels, saved_bytes)
+        logger.debug(
+            "Downscaled %d image(s) for %s to %dx%d: sent %.2f MB, about %.2f MB saved",
+            self.images,
+            provider,
+            *self.size,
+            self.sent_bytes / 1e6,
+            saved_bytes / 1e6,
+        )
+
+
+def encode_for_driver(
+    image, driver, detail="auto", max_edge=0
+) -> list[ImageArtifact]:
+    """
+    Encodes an IMAGE batch for a vision query, downscaled to what the prompt
+    driver's provider actually looks at, and reports what that saved.
+    """
+    frames = to_uint8_frames(image)
+    artifacts = encode_images(frames, limits=image_limits(driver, detail, max_edge))
+    report = DownscaleReport(driver)
+    for frame, artifact in zip(frames, artifacts):
+        report.add(frame, artifact)
+    report.emit()
+    return artifacts
+
+
+class FrameArtifacts:
+    """
+    Encodes each frame of an IMAGE batch the first time it's acquired, shares
+    it between its uses and drops it after the last one is released, so a
+    batch of thousands of frames is never held encoded all at once.
+    """
+
+    def __init__(self, image, limits=None, uses=1, report=None):
+        self.image = image
+        self.limits = limits
+        self.report = report
+        self.count = image.shape[0] if image.ndim == 4 else 1
+        self._uses = [uses] * self.count
+        self._artifacts = {}
+        self._locks = [threading.Lock() for _ in range(self.count)]
+
+    def __len__(self):
+        return self.count
+
+    def acquire(self, index) -> ImageArtifact:
+        with self._locks[index]:
+            artifact = self._artifacts.get(index)
+            if artifact is None:
+                frame = self.image
+                if frame.ndim == 4:
+                    frame = frame[index : index + 1]
+                frame = to_uint8_frames(frame)[0]
+                artifact = encode_frame(frame, limits=self.limits)
+                if self.report:
+                    self.report.add(frame, artifact)
+                self._artifacts[index] = artifact
+            return artifact
+
+    def release(self, index):
+        with self._locks[index]:
+            self._uses[index] -= 1
+            if self._uses[index] <= 0:
+                self._artifacts.pop(index, None)
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+
+import numpy as np
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+
+from .cancellation import check_cancelled
+from .metrics import metrics
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(THIS_DIR, "..", ".cache", "images")
+
+# Seconds to wait for a connection, and between bytes of the response.
+FETCH_CONNECT_TIMEOUT = float(os.getenv("GRIPTAPE_FETCH_CONNECT_TIMEOUT", "10"))
+FETCH_READ_TIMEOUT = float(os.getenv("GRIPTAPE_FETCH_READ_TIMEOUT", "60"))
+# Downloads larger than this are abandoned instead of being read into memory.
+FETCH_MAX_MB = float(os.getenv("GRIPTAPE_FETCH_MAX_MB", "50"))
+# Connections kept open per host.
+FETCH_POOL_SIZE = int(os.getenv("GRIPTAPE_FETCH_POOL_SIZE", "16"))
+# Set GRIPTAPE_FETCH_CACHE=0 to download every image on every run.
+FETCH_CACHE_ENABLED = os.getenv("GRIPTAPE_FETCH_CACHE", "1").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+FETCH_CACHE_MAX_MB = float(os.getenv("GRIPTAPE_FETCH_CACHE_MAX_MB", "1024"))
+
+CHUNK_SIZE = 64 * 1024
+# Freshness of responses with only a Last-Modified header: a tenth of their
+# age (RFC 9111 4.2.2), at most a day.
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX_SECONDS = 24 * 60 * 60
+RESIZE_MODES = ["none", "first image", "custom"]
+
+
+class FetchTooLarge(ValueError):
+    pass
+
+
+def _cache_control(headers):
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def _http_time(value):
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness(headers, now):
+    """
+    How long a response may be used without asking the server again, from its
+    Cache-Control, Expires and Last-Modified headers. None means don't store it.
+    """
+    directives = _cache_control(headers)
+    if "no-store" in directives:
+        return None
+    validated = "ETag" in headers or "Last-Modified" in headers
+    if "no-cache" in directives:
+        return 0.0 if validated else None
+    age = headers.get("Age", "")
+    age = float(age) if age.isdigit() else 0.0
+    if directives.get("max-age", "").isdigit():
+        lifetime = float(directives["max-age"])
+    elif headers.get("Expires"):
+        expires = _http_time(headers["Expires"])
+        date = _http_time(headers.get("Date")) or now
+        lifetime = expires - date if expires is not None else 0.0
+    elif headers.get("Last-Modified"):
+        modified = _http_time(headers["Last-Modified"])
+        date = _http_time(headers.get("Date")) or now
+        lifetime = 0.0
+        if modified is not None:
+            lifetime = min(
+                (date - modified) * HEURISTIC_FRACTION, HEURISTIC_MAX_SECONDS
+            )
+    else:
+        lifetime = 0.0
+    lifetime = max(0.0, lifetime - age)
+    if lifetime == 0.0 and not validated:
+        # Stale on arrival and can't be revalidated: storing it gains nothing.
+        return None
+    return lifetime
+
+
+class ImageFetcher:
+    """
+    Downloads images over one pooled session, with timeouts and a size limit,
+    through an on-disk HTTP cache. Cached images are used as they are while
+    fresh, then revalidated with If-None-Match / If-Modified-Since, so an
+    unchanged image costs a 304 instead of a download.
+    """
+
+    def __init__(
+        self,
+        cache_dir=CACHE_DIR,
+        max_bytes=int(FETCH_MAX_MB * 1024 * 1024),
+        cache_max_bytes=int(FETCH_CACHE_MAX_MB * 1024 * 1024),
+        enabled=FETCH_CACHE_ENABLED,
+        timeout=(FETCH_CONNECT_TIMEOUT, FETCH_READ_TIMEOUT),
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.cache_max_bytes = cache_max_bytes
+        self.enabled = enabled
+        self.timeout = timeout
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self.downloaded_bytes = 0
+        self._lock = threading.Lock()
+        self._session = None
+        # key -> (size, last used), loaded from disk on first use.
+        self._index = None
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=FETCH_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def fetch(self, url) -> bytes:
+        """Returns the body of url, from the cache when it's still valid."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        now = time.time()
+        meta = self._read_meta(key) if self.enabled else None
+        cached = self._read_body(key) if meta is not None else None
+        headers = {}
+        if cached is not None:
+            if now < meta["expires"]:
+                self._count("hit", key)
+                return cached
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        with self.session.get(
+            url, headers=headers, stream=True, timeout=self.timeout
+        ) as response:
+            if response.status_code == 304 and cached is not None:
+                # Reading the empty body returns the connection to the pool.
+                response.content
+                meta["expires"] = now + (freshness(response.headers, now) or 0.0)
+                self._write(key, meta)
+                self._count("revalidated", key)
+                return cached
+            if response.status_code == 304:
+                # Nothing was cached, so we never asked for a 304.
+                raise requests.HTTPError(
+                    f"{url} answered 304 Not Modified, but there is no cached "
+                    "copy of it to use",
+                    response=response,
+                )
+            response.raise_for_status()
+            body = self._read_limited(response, url)
+            lifetime = freshness(response.headers, now) if self.enabled else None
+            if lifetime is not None:
+                meta = {
+                    "url": url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "expires": now + lifetime,
+                }
+                self._write(key, meta, body)
+        self._count("miss", key, len(body))
+        return body
+
+    def _read_limited(self, response, url):
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            raise FetchTooLarge(
+                f"{url} is {int(length) / 1e6:.1f} MB, over the "
+                f"{self.max_bytes / 1e6:.0f} MB limit (GRIPTAPE_FETCH_MAX_MB)"
+            )
+        buffer = bytearray()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) > self.max_bytes:
+                raise FetchTooLarge(
+                    f"{url} is over the {self.max_bytes / 1e6:.0f} MB limit "
+                    "(GRIPTAPE_FETCH_MAX_MB)"
+                )
+            check_cancelled()
+        return bytes(buffer)
+
+    def _count(self, result, key, downloaded=0):
+        with self._lock:
+            if result == "hit":
+                self.hits += 1
+            elif result == "revalidated":
+                self.revalidated += 1
+            else:
+                self.misses += 1
+            self.downloaded_bytes += downloaded
+            if self._index is not None and key in self._index:
+                self._index[key] = (self._index[key][0], time.time())
+        if metrics.enabled:
+            metrics.inc("griptape_image_fetch_total", (("result", result),))
+            if downloaded:
+                metrics.inc("griptape_image_fetch_bytes_total", (), downloaded)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    def _read_meta(self, key):
+        try:
+            with open(self._path(key, ".json"), encoding="UTF-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _read_body(self, key):
+        try:
+            with open(self._path(key, ".bin"), "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _write(self, key, meta, body=None):
+        # Written to a temporary file and renamed, so a concurrent reader never
+        # sees half a file.
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            files = [(".json", json.dumps(meta).encode("utf-8"))]
+            if body is not None:
+                files.insert(0, (".bin", body))
+            for suffix, data in files:
+                path = self._path(key, suffix)
+                temp = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp, "wb") as file:
+                    file.write(data)
+                os.replace(temp, path)
+        except OSError as e:
+            print(f"   \033[33m- Couldn't cache {meta['url']}: {e}\033[0m")
+            return
+        if body is not None:
+            with self._lock:
+                index = self._load_index()
+                index[key] = (len(body), time.time())
+                self._evict(index)
+
+    def _load_index(self):
+        if self._index is None:
+            self._index = {}
+            try:
+                names = os.listdir(self.cache_dir)
+            except OSError:
+                names = []
+            for name in names:
+                if name.endswith(".bin"):
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                    self._index[name[:-4]] = (stat.st_size, stat.st_mtime)
+        return self._index
+
+    def _evict(self, index):
+        total = sum(size for size, _ in index.values())
+        if total <= self.cache_max_bytes:
+            return
+        for key, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if total <= self.cache_max_bytes:
+                break
+            for suffix in (".bin", ".json"):
+                try:
+                    os.remove(self._path(key, suffix))
+                except OSError:
+                    pass
+            del index[key]
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            index = self._load_index()
+            for key in list(index):
+                for suffix in (".bin", ".json"):
+                    try:
+                        os.remove(self._path(key, suffix))
+                    except OSError:
+                        pass
+            index.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "downloaded_bytes": self.downloaded_bytes,
+            }
+            if self._index is not None:
+                stats["entries"] = len(self._index)
+                stats["bytes"] = sum(size for size, _ in self._index.values())
+        return stats
+
+
+image_fetcher = ImageFetcher()
+
+
+def decode_rgb(data, size=None):
+    """
+    Decodes image bytes to a (height, width, 3) uint8 array, center-cropped and
+    resized to fill size (width, height) when given.
+    """
+    img = Image.open(BytesIO(data))
+    if size is not None:
+        # JPEGs are decoded at the smallest power-of-two scale that still
+        # covers size, which is much faster than decoding in full.
+        img.draft("RGB", size)
+    img = img.convert("RGB")
+    if size is not None and img.size != tuple(size):
+        # Crop the center to the target's aspect ratio as part of the resize.
+        width, height = img.size
+        scale = max(size[0] / width, size[1] / height)
+        crop_width, crop_height = size[0] / scale, size[1] / scale
+        left, top = (width - crop_width) / 2, (height - crop_height) / 2
+        img = img.resize(
+            tuple(size),
+            Image.Resampling.BICUBIC,
+            box=(left, top, left + crop_width, top + crop_height),
+            reducing_gap=2.0,
+        )
+    return np.array(img)
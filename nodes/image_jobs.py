@@ -0,0 +1,273 @@
+import collections
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from attrs import Factory, define, field
+from griptape.drivers import (
+    LeonardoImageGenerationDriver as BaseLeonardoImageGenerationDriver,
+)
+from requests.adapters import HTTPAdapter
+
+from .cancellation import RunCancelled, check_cancelled
+
+# A job is first polled after GRIPTAPE_IMAGE_JOB_POLL_INITIAL seconds, then
+# each interval is GRIPTAPE_IMAGE_JOB_POLL_BACKOFF times the last, up to
+# GRIPTAPE_IMAGE_JOB_POLL_MAX.
+POLL_INITIAL = float(os.getenv("GRIPTAPE_IMAGE_JOB_POLL_INITIAL", "0.5"))
+POLL_BACKOFF = float(os.getenv("GRIPTAPE_IMAGE_JOB_POLL_BACKOFF", "1.5"))
+POLL_MAX = float(os.getenv("GRIPTAPE_IMAGE_JOB_POLL_MAX", "3"))
+# Seconds before a job that is still pending is given up on.
+JOB_TIMEOUT = float(os.getenv("GRIPTAPE_IMAGE_JOB_TIMEOUT", "600"))
+# Seconds to wait for the provider on each request (submit, poll, download).
+REQUEST_TIMEOUT = float(os.getenv("GRIPTAPE_IMAGE_JOB_REQUEST_TIMEOUT", "30"))
+# Threads polling jobs, and connections kept open per host.
+JOB_WORKERS = int(os.getenv("GRIPTAPE_IMAGE_JOB_WORKERS", "8"))
+# Finished jobs kept for the /Griptape/image_jobs route.
+JOB_HISTORY = 100
+
+
+def is_transient_error(e) -> bool:
+    """
+    Whether a failed poll is worth repeating: a dropped connection, a timeout,
+    a server error or a rate limit. Other 4xx responses and failures the
+    provider reports won't go away.
+    """
+    if isinstance(e, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(e, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is not None and (status >= 500 or status == 429)
+
+
+class ImageJob:
+    """A generation submitted to a provider that has to be polled until done."""
+
+    def __init__(self, job_id, provider, poll):
+        self.id = job_id
+        self.provider = provider
+        self.poll = poll
+        self.state = "PENDING"
+        self.url = None
+        self.error = None
+        self.polls = 0
+        self.poll_errors = 0
+        self.submitted = time.time()
+        self.finished = None
+        self.interval = POLL_INITIAL
+        self.next_poll = time.monotonic() + POLL_INITIAL
+        self.deadline = time.monotonic() + JOB_TIMEOUT
+        self.done = threading.Event()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "provider": self.provider,
+            "state": self.state,
+            "polls": self.polls,
+            "poll_errors": self.poll_errors,
+            "seconds": round((self.finished or time.time()) - self.submitted, 3),
+            "error": str(self.error) if self.error else None,
+        }
+
+
+class ImageJobManager:
+    """
+    Polls every outstanding generation job from one scheduler thread.
+
+    Due jobs are polled at the same time on a small pool, each on its own
+    schedule: soon after submission, then backing off. A node waiting on a
+    job returns as soon as a poll sees it complete, rather than after the
+    fixed, growing sleeps of the provider driver's own loop.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._finished = collections.deque(maxlen=JOB_HISTORY)
+        self._condition = threading.Condition()
+        self._thread = None
+        self._executor = None
+        self._session = None
+
+    @property
+    def session(self):
+        # One pooled session for every job's requests, so polls and downloads
+        # reuse connections instead of opening one each.
+        with self._condition:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4, pool_maxsize=max(JOB_WORKERS, 10)
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def track(self, job_id, provider, poll) -> ImageJob:
+        """
+        Starts polling a submitted job. poll() returns the result URL once the
+        job is done, None while it's pending, and raises if it failed.
+        """
+        job = ImageJob(job_id, provider, poll)
+        with self._condition:
+            if self._thread is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=JOB_WORKERS, thread_name_prefix="griptape-image-job"
+                )
+                self._thread = threading.Thread(
+                    target=self._schedule, name="griptape-image-jobs", daemon=True
+                )
+                self._thread.start()
+            self._pending[job.id] = job
+            self._condition.notify()
+        return job
+
+    def wait(self, job) -> str:
+        """Waits for a job and returns its result URL."""
+        try:
+            while not job.done.wait(0.1):
+                check_cancelled()
+        except RunCancelled:
+            # The provider keeps rendering, but nobody is waiting any more.
+            self._finish(job, "CANCELLED")
+            raise
+        if job.error is not None:
+            raise job.error
+        return job.url
+
+    def stats(self):
+        with self._condition:
+            pending = [job.to_dict() for job in self._pending.values()]
+            finished = [job.to_dict() for job in reversed(self._finished)]
+        return {"pending": pending, "finished": finished}
+
+    def _finish(self, job, state, error=None):
+        with self._condition:
+            if self._pending.pop(job.id, None) is None:
+                return
+            job.state = state
+            job.error = error
+            job.finished = time.time()
+            self._finished.append(job)
+        job.done.set()
+
+    def _schedule(self):
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                due = [job for job in self._pending.values() if job.next_poll <= now]
+                if not due:
+                    # Jobs being polled have no next poll until they're back.
+                    next_poll = min(
+                        (
+                            job.next_poll
+                            for job in self._pending.values()
+                            if job.next_poll != float("inf")
+                        ),
+                        default=None,
+                    )
+                    timeout = None if next_poll is None else next_poll - now
+                    self._condition.wait(timeout)
+                    continue
+                for job in due:
+                    # Not due again until its poll comes back.
+                    job.next_poll = float("inf")
+            for job in due:
+                self._executor.submit(self._poll, job)
+
+    def _poll(self, job):
+        error = None
+        try:
+            job.polls += 1
+            url = job.poll()
+        except Exception as e:
+            if not is_transient_error(e):
+                self._finish(job, "FAILED", e)
+                return
+            # Tried again at the next interval, until the deadline.
+            job.poll_errors += 1
+            error = e
+            url = None
+        if url is not None:
+            job.url = url
+            self._finish(job, "COMPLETE")
+            return
+        now = time.monotonic()
+        if now >= job.deadline:
+            message = (
+                f"{job.provider} job {job.id} still pending after {JOB_TIMEOUT:.0f}s"
+            )
+            if error is not None:
+                message += f" (last poll failed: {error})"
+            self._finish(job, "TIMED_OUT", TimeoutError(message))
+            return
+        with self._condition:
+            job.interval = min(job.interval * POLL_BACKOFF, POLL_MAX)
+            job.next_poll = min(now + job.interval, job.deadline)
+            self._condition.notify()
+
+
+image_jobs = ImageJobManager()
+
+
+@define
+class LeonardoImageGenerationDriver(BaseLeonardoImageGenerationDriver):
+    """
+    griptape's LeonardoImageGenerationDriver, waiting for generations through
+    image_jobs over its pooled session instead of a blocking sleep loop of at
+    most max_attempts polls. Polls that fail on a dropped connection, a
+    timeout or a server error are tried again until the job's deadline, and
+    every request has a timeout. It keeps the class name, so provider_name()
+    and the per-provider limits and metrics still see "leonardo".
+    """
+
+    requests_session: requests.Session = field(
+        default=Factory(lambda: image_jobs.session), kw_only=True
+    )
+
+    def _make_api_request(
+        self, endpoint: str, request: dict, method: str = "POST"
+    ) -> dict:
+        response = self.requests_session.request(
+            url=f"{self.api_base}{endpoint}",
+            method=method,
+            json=request,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=REQUEST_TIMEOUT,
+        )
+        if not response.ok:
+            raise Exception(f"failed to make API request: {response.text}")
+        return response.json()
+
+    def _get_image_url(self, generation_id: str) -> str:
+        def poll():
+            response = self.requests_session.get(
+                url=f"{self.api_base}/generations/{generation_id}",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=REQUEST_TIMEOUT,
+            )
+            if not response.ok:
+                raise requests.HTTPError(
+                    f"failed to get generation: {response.text}", response=response
+                )
+            generation = response.json()["generations_by_pk"]
+            if generation["status"] == "PENDING":
+                return None
+            if generation["status"] != "COMPLETE":
+                raise Exception(f"image generation {generation['status'].lower()}")
+            return generation["generated_images"][0]["url"]
+
+        return image_jobs.wait(image_jobs.track(generation_id, "leonardo", poll))
+
+    def _download_image(self, url: str) -> bytes:
+        response = self.requests_session.get(
+            url=url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=REQUEST_TIMEOUT,
+        )
+        if not response.ok:
+            raise Exception(f"failed to download image: {response.status_code}")
+        return response.content
@@ -0,0 +1,278 @@
+import importlib
+import importlib.metadata
+import json
+import os
+import threading
+import time
+
+from .metrics import instrument_node
+from .utils import AnyType, ContainsAnyDict
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(THIS_DIR, "..", ".node_cache.json")
+
+# Set GRIPTAPE_LAZY_NODES=0 to import every node module at startup (the old behaviour).
+LAZY_NODES = os.getenv("GRIPTAPE_LAZY_NODES", "1").lower() not in ("0", "false", "no")
+
+# Class attributes ComfyUI reads when it builds /object_info. These are served
+# from the cache so the UI can be populated without importing the node module.
+INFO_ATTRIBUTES = (
+    "RETURN_TYPES",
+    "RETURN_NAMES",
+    "OUTPUT_TOOLTIPS",
+    "OUTPUT_IS_LIST",
+    "OUTPUT_NODE",
+    "INPUT_IS_LIST",
+    "FUNCTION",
+    "CATEGORY",
+    "DESCRIPTION",
+    "DEPRECATED",
+    "EXPERIMENTAL",
+)
+
+_lock = threading.RLock()
+_report = {
+    "lazy": LAZY_NODES,
+    "registered": 0,
+    "registration_seconds": 0.0,
+    "package_import_seconds": 0.0,
+}
+_import_times = {}
+
+
+def _encode(value):
+    """Encodes INPUT_TYPES style data as JSON, keeping tuples and AnyType intact."""
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(v) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        for key in value:
+            if not isinstance(key, str):
+                raise TypeError(f"Cannot cache key of type {type(key).__name__}")
+        encoded = {key: _encode(v) for key, v in value.items()}
+        if isinstance(value, ContainsAnyDict):
+            return {"__any_dict__": encoded}
+        return encoded
+    if isinstance(value, str) and type(value) is not str:
+        return {"__any_type__": str(value)}
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if "__tuple__" in value:
+            return tuple(_decode(v) for v in value["__tuple__"])
+        if "__any_type__" in value:
+            return AnyType(value["__any_type__"])
+        if "__any_dict__" in value:
+            return ContainsAnyDict(_decode(value["__any_dict__"]))
+        return {key: _decode(v) for key, v in value.items()}
+    return value
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+
+
+def _reads_environment(info):
+    """True if any cached string is the value of an environment variable."""
+    # Short values such as "1" or "true" are too common to tell apart from literals.
+    env_values = {value for value in os.environ.values() if len(value) >= 8}
+    return any(value in env_values for value in _strings(info))
+
+
+def _source_signature():
+    """Changes whenever a node source file or the installed griptape version changes."""
+    newest = 0.0
+    for root, _dirs, files in os.walk(THIS_DIR):
+        for filename in files:
+            if filename.endswith(".py"):
+                newest = max(newest, os.stat(os.path.join(root, filename)).st_mtime)
+    try:
+        version = importlib.metadata.version("griptape")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return f"{version}:{newest}"
+
+
+class NodeInfoCache:
+    """
+    On-disk cache of the static node information ComfyUI needs to draw the UI.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.signature = _source_signature()
+        self.entries = {}
+        self._timer = None
+        try:
+            with open(path, "r", encoding="UTF-8") as file:
+                data = json.load(file)
+            if data.get("signature") == self.signature:
+                self.entries = data.get("nodes", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, name):
+        return self.entries.get(name)
+
+    def record(self, name, node_class):
+        try:
+            info = {
+                attr: _encode(getattr(node_class, attr))
+                for attr in INFO_ATTRIBUTES
+                if hasattr(node_class, attr)
+            }
+            info["INPUT_TYPES"] = _encode(node_class.INPUT_TYPES())
+        except Exception as e:
+            print(f"   \033[33m- Not caching {name}: {e}\033[0m")
+            return
+        if _reads_environment(info):
+            # Secrets must not end up in the cache file, and the value could change anyway.
+            print(f"   \033[33m- Not caching {name}: inputs read the environment\033[0m")
+            return
+        with _lock:
+            if self.entries.get(name) == info:
+                return
+            self.entries[name] = info
+            # Many nodes resolve in a burst when the UI first loads, so batch the writes.
+            if self._timer is None:
+                self._timer = threading.Timer(2.0, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with _lock:
+            self._timer = None
+            data = {"signature": self.signature, "nodes": self.entries}
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, "w", encoding="UTF-8") as file:
+                    json.dump(data, file)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"   \033[33m- Could not write node cache: {e}\033[0m")
+
+
+_cache = None
+
+
+class LazyNodeType(type):
+    """
+    Metaclass for node placeholders. Attribute access that can't be answered
+    from the cache imports the real node class and forwards to it.
+    """
+
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        real = type.__getattribute__(cls, "_real")
+        if real is None:
+            info = type.__getattribute__(cls, "_info")
+            if info is not None and name in INFO_ATTRIBUTES:
+                if name in info:
+                    return _decode(info[name])
+                raise AttributeError(name)
+            real = cls.resolve()
+        return getattr(real, name)
+
+    def __setattr__(cls, name, value):
+        type.__setattr__(cls, name, value)
+        # ComfyUI tags every class with RELATIVE_PYTHON_MODULE after loading the package.
+        if not name.startswith("_"):
+            cls._overrides[name] = value
+            if cls._real is not None:
+                setattr(cls._real, name, value)
+
+    def __call__(cls, *args, **kwargs):
+        return cls.resolve()(*args, **kwargs)
+
+    def resolve(cls):
+        if cls._real is None:
+            with _lock:
+                if cls._real is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(f".{cls._module}", __package__)
+                    real = instrument_node(getattr(module, cls._class_name))
+                    _import_times[cls._module] = time.perf_counter() - start
+                    for name, value in cls._overrides.items():
+                        setattr(real, name, value)
+                    type.__setattr__(cls, "_real", real)
+                    if not cls._dynamic:
+                        _cache.record(cls._display_name, real)
+        return cls._real
+
+
+def _make_lazy_node(display_name, target, dynamic):
+    module, class_name = target.split(":")
+    info = None if dynamic else _cache.get(display_name)
+
+    def INPUT_TYPES(cls):
+        if cls._real is None and cls._info is not None:
+            return _decode(cls._info["INPUT_TYPES"])
+        return cls.resolve().INPUT_TYPES()
+
+    return LazyNodeType(
+        class_name,
+        (),
+        {
+            "_display_name": display_name,
+            "_module": module,
+            "_class_name": class_name,
+            "_dynamic": dynamic,
+            "_info": info,
+            "_real": None,
+            "_overrides": {},
+            "INPUT_TYPES": classmethod(INPUT_TYPES),
+        },
+    )
+
+
+def build_node_mappings(manifest, dynamic_nodes=()):
+    """
+    Builds NODE_CLASS_MAPPINGS from a manifest of display name -> "module:ClassName",
+    with modules given relative to this package.
+    """
+    global _cache
+    start = time.perf_counter()
+    if _cache is None:
+        _cache = NodeInfoCache(CACHE_FILE)
+    mappings = {
+        name: _make_lazy_node(name, target, name in dynamic_nodes)
+        for name, target in manifest.items()
+    }
+    if not LAZY_NODES:
+        for node in mappings.values():
+            node.resolve()
+    _report["registered"] = len(mappings)
+    _report["cached"] = sum(1 for node in mappings.values() if node._info is not None)
+    _report["registration_seconds"] = time.perf_counter() - start
+    return mappings
+
+
+def record_package_import(seconds):
+    """How long importing the whole package took, from the top of its __init__."""
+    _report["package_import_seconds"] = seconds
+
+
+def get_import_report():
+    """Returns how long registration took and how long each lazily imported module took."""
+    report = dict(_report)
+    report["imported"] = len(_import_times)
+    report["import_seconds"] = sum(_import_times.values())
+    report["modules"] = dict(
+        sorted(_import_times.items(), key=lambda item: item[1], reverse=True)
+    )
+    return report
@@ -1,9 +1,7 @@
-from io import BytesIO
-
 import numpy as np
-import requests
 import torch
-from PIL import Image
+
+from ..image_fetch import decode_rgb, image_fetcher
 
 
 ###############################################################################################
@@ -14,8 +12,8 @@ from PIL import Image
 #
 ###############################################################################################
 def pil2tensor(image):
-    """Convert a PIL Image to a PyTorch tensor."""
-    return torch.from_numpy(np.array(image).astype(np.float32) / 255.0).unsqueeze(0)
+    """Convert a (height, width, 3) uint8 array to a PyTorch tensor."""
+    return torch.from_numpy(np.asarray(image)).float().div_(255.0).unsqueeze(0)
 
 
 class gtUIFetchImage:
@@ -46,15 +44,9 @@ class gtUIFetchImage:
         #     return None, None, None
 
         try:
-            response = requests.get(image_url)
-            if response.status_code != 200:
-                print(
-                    f"Error: Failed to fetch image from URL with status code {response.status_code}"
-                )
-                return None, None, None
-
-            image = Image.open(BytesIO(response.content)).convert("RGB")
-            width, height = image.size
+            # Pooled, size-limited and cached - see image_fetch.ImageFetcher.
+            image = decode_rgb(image_fetcher.fetch(image_url.strip()))
+            height, width = image.shape[:2]
 
             image_tensor = pil2tensor(image)
 
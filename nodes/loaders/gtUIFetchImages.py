@@ -0,0 +1,112 @@
+from io import BytesIO
+
+import torch
+from PIL import Image
+
+from ..cancellation import run_interruptible
+from ..concurrency import map_ordered
+from ..image_fetch import RESIZE_MODES, decode_rgb, image_fetcher
+
+
+class gtUIFetchImages:
+    DESCRIPTION = "Fetch images from a list of URLs, at the same time, into one batch."
+    RETURN_TYPES = ("IMAGE", "INT", "INT", "STRING")
+    RETURN_NAMES = ("IMAGE", "WIDTH", "HEIGHT", "URLS")
+    OUTPUT_IS_LIST = (False, False, False, True)
+    FUNCTION = "FetchImages"
+    CATEGORY = "Griptape/Image"
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image_urls": (
+                    "STRING",
+                    {
+                        "multiline": True,
+                        "default": "",
+                        "tooltip": "One image URL per line.",
+                    },
+                ),
+            },
+            "optional": {
+                "resize": (
+                    RESIZE_MODES,
+                    {
+                        "default": RESIZE_MODES[1],
+                        "tooltip": "none: skip images whose size differs from the first.\nfirst image: crop and resize every image to the size of the first.\ncustom: crop and resize every image to width x height.",
+                    },
+                ),
+                "width": ("INT", {"default": 1024, "min": 8, "max": 8192, "step": 8}),
+                "height": ("INT", {"default": 1024, "min": 8, "max": 8192, "step": 8}),
+                "max_concurrency": (
+                    "INT",
+                    {
+                        "default": 8,
+                        "min": 1,
+                        "max": 64,
+                        "tooltip": "How many images to download and decode at the same time.",
+                    },
+                ),
+            },
+        }
+
+    def FetchImages(
+        self,
+        image_urls,
+        resize=RESIZE_MODES[1],
+        width=1024,
+        height=1024,
+        max_concurrency=8,
+    ):
+        urls = [url.strip() for url in image_urls.splitlines() if url.strip()]
+        if not urls:
+            raise ValueError("No image URLs provided.")
+
+        # Each distinct URL is downloaded once, however often it's listed.
+        unique_urls = list(dict.fromkeys(urls))
+        results = run_interruptible(
+            map_ordered, image_fetcher.fetch, unique_urls, max_concurrency
+        )
+        bodies = {}
+        for url, (body, error, _) in zip(unique_urls, results):
+            if error:
+                print(f"   \033[33m- Couldn't fetch {url}: {error}\033[0m")
+            else:
+                bodies[url] = body
+        urls = [url for url in urls if url in bodies]
+        if not urls:
+            raise RuntimeError("None of the image URLs could be fetched.")
+
+        size = None
+        if resize == "custom":
+            size = (width, height)
+        elif resize == "first image":
+            size = Image.open(BytesIO(bodies[urls[0]])).size
+
+        def decode(url):
+            return decode_rgb(bodies[url], size)
+
+        decoded = run_interruptible(map_ordered, decode, urls, max_concurrency)
+        frames = []
+        loaded = []
+        for url, (frame, error, _) in zip(urls, decoded):
+            if error:
+                print(f"   \033[33m- Couldn't decode {url}: {error}\033[0m")
+            elif frames and frame.shape != frames[0].shape:
+                print(
+                    f"   \033[33m- Skipping {url}: its size differs from the first image\033[0m"
+                )
+            else:
+                frames.append(frame)
+                loaded.append(url)
+        if not frames:
+            raise RuntimeError("None of the fetched images could be decoded.")
+
+        # Copied into one preallocated batch and scaled to 0-1 once.
+        frame_height, frame_width = frames[0].shape[:2]
+        batch = torch.empty((len(frames), frame_height, frame_width, 3))
+        for i, frame in enumerate(frames):
+            batch[i].copy_(torch.from_numpy(frame))
+        batch.div_(255.0)
+        return (batch, frame_width, frame_height, loaded)
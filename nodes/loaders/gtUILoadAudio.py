@@ -5,6 +5,8 @@ import torchaudio
 
 import folder_paths
 
+from ..fingerprint import file_fingerprint
+
 
 def is_audio_file(filepath):
     mime_type, _ = mimetypes.guess_type(filepath)
@@ -34,6 +36,10 @@ class gtUILoadAudio:
     RETURN_NAMES = ("AUDIO_PATH", "AUDIO")
     FUNCTION = "gt_load_audio"
 
+    @classmethod
+    def IS_CHANGED(cls, audio):
+        return file_fingerprint(folder_paths.get_annotated_filepath(audio))
+
     def gt_load_audio(self, audio):
         audio_path = folder_paths.get_annotated_filepath(audio)
         waveform, sample_rate = torchaudio.load(audio_path)
@@ -3,6 +3,8 @@ import os
 
 import folder_paths
 
+from ..fingerprint import file_fingerprint
+
 
 def is_audio_file(filepath):
     mime_type, _ = mimetypes.guess_type(filepath)
@@ -42,6 +44,10 @@ class gtUILoadText:
     RETURN_NAMES = ("PATH", "OUTPUT")
     FUNCTION = "gt_load_text"
 
+    @classmethod
+    def IS_CHANGED(cls, text):
+        return file_fingerprint(folder_paths.get_annotated_filepath(text))
+
     def gt_load_text(self, text):
         text_path = folder_paths.get_annotated_filepath(text)
         text_data = ""
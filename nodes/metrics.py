@@ -0,0 +1,285 @@
+import bisect
+import functools
+import inspect
+import os
+import threading
+import time
+
+# Set GRIPTAPE_METRICS=0 to turn off node and driver instrumentation.
+METRICS_ENABLED = os.getenv("GRIPTAPE_METRICS", "1").lower() in ("1", "true", "yes")
+
+# Histogram bucket upper bounds, in seconds.
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120
+)  # fmt: skip
+
+METRIC_HELP = {
+    "griptape_node_seconds": ("histogram", "Wall time of Griptape node runs."),
+    "griptape_node_errors_total": ("counter", "Griptape node runs that raised."),
+    "griptape_driver_call_seconds": (
+        "histogram",
+        "Wall time of driver calls, including cache lookups, rate limit waits and retries.",
+    ),
+    "griptape_driver_errors_total": ("counter", "Driver calls that raised."),
+    "griptape_driver_retries_total": ("counter", "Prompt driver attempts after the first."),
+    "griptape_tokens_total": ("counter", "Tokens reported by the provider."),
+    "griptape_memory_tokens_total": (
+        "counter",
+        "Conversation history tokens sent with prompts (sent) and left out by the token window (saved).",
+    ),
+    "griptape_cache_requests_total": ("counter", "Response cache lookups."),
+    "griptape_coalesced_calls_total": (
+        "counter",
+        "Calls that waited for an identical call in flight instead of being sent.",
+    ),
+    "griptape_image_pixels_total": (
+        "counter",
+        "Pixels of images given to vision queries (input) and sent after downscaling (sent).",
+    ),
+    "griptape_image_bytes_saved_total": (
+        "counter",
+        "Estimated encoded bytes not uploaded because vision query images were downscaled.",
+    ),
+    "griptape_image_fetch_total": (
+        "counter",
+        "Image URL fetches, by result: hit, revalidated (304) or miss (downloaded).",
+    ),
+    "griptape_image_fetch_bytes_total": ("counter", "Bytes of images downloaded from URLs."),
+}
+
+_local = threading.local()
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "buckets": buckets,
+        }
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = (*labels, *extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class Metrics:
+    """
+    Process-wide counters and latency histograms.
+
+    Labels are passed as a tuple of (name, value) pairs. Recording a value is a
+    dict lookup and a few additions under a lock, so instrumentation stays in
+    the low microseconds.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def _snapshot(self):
+        with self._lock:
+            histograms = {key: h.to_dict() for key, h in self._histograms.items()}
+            counters = dict(self._counters)
+        return histograms, counters
+
+    def to_dict(self):
+        histograms, counters = self._snapshot()
+        return {
+            "enabled": self.enabled,
+            "histograms": [
+                {"name": name, "labels": dict(labels), **values}
+                for (name, labels), values in sorted(histograms.items())
+            ],
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+        }
+
+    def render_prometheus(self):
+        histograms, counters = self._snapshot()
+        series = {}
+        for (name, labels), values in histograms.items():
+            series.setdefault(name, []).append((labels, values))
+        for (name, labels), value in counters.items():
+            series.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name in sorted(series):
+            kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, values in sorted(series[name], key=lambda item: item[0]):
+                if kind != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {values}")
+                    continue
+                for bound, count in values["buckets"].items():
+                    lines.append(
+                        f"{name}_bucket{_format_labels(labels, (('le', bound),))} {count}"
+                    )
+                lines.append(f"{name}_sum{_format_labels(labels)} {values['sum']}")
+                lines.append(f"{name}_count{_format_labels(labels)} {values['count']}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def instrument_node(node_class):
+    """Wraps the node's FUNCTION so every run is timed under the class name."""
+    function_name = getattr(node_class, "FUNCTION", None)
+    if not metrics.enabled or not function_name:
+        return node_class
+    function = inspect.getattr_static(node_class, function_name, None)
+    if not inspect.isfunction(function):
+        # classmethods / staticmethods are left alone
+        return node_class
+    labels = (("node", node_class.__name__),)
+
+    @functools.wraps(function)
+    def run(self, *args, **kwargs):
+        # A node calling its parent's run (super().run) is counted once.
+        if getattr(_local, "in_node", False):
+            return function(self, *args, **kwargs)
+        _local.in_node = True
+        start = time.perf_counter()
+        try:
+            return function(self, *args, **kwargs)
+        except BaseException:
+            metrics.inc("griptape_node_errors_total", labels)
+            raise
+        finally:
+            _local.in_node = False
+            seconds = time.perf_counter() - start
+            metrics.observe("griptape_node_seconds", labels, seconds)
+
+    setattr(node_class, function_name, run)
+    return node_class
+
+
+def note(key, value):
+    """
+    Records a fact about the driver call in progress on this thread, e.g.
+    note("cache", "hit"). Ignored outside an instrumented call.
+    """
+    call = getattr(_local, "call", None)
+    if call is not None:
+        call[key] = value
+
+
+def _note_attempt(event):
+    call = getattr(_local, "call", None)
+    if call is not None:
+        call["attempts"] = call.get("attempts", 0) + 1
+
+
+_attempt_listener = None
+
+
+def _get_attempt_listener():
+    global _attempt_listener
+    if _attempt_listener is None:
+        from griptape.events import EventListener, StartPromptEvent
+
+        _attempt_listener = EventListener(
+            _note_attempt, event_types=[StartPromptEvent]
+        )
+    return _attempt_listener
+
+
+def _driver_labels(driver, method):
+    from .concurrency import provider_name
+
+    return (
+        ("provider", provider_name(driver)),
+        ("model", str(getattr(driver, "model", None) or "")),
+        ("method", method),
+    )
+
+
+def _timed_call(driver, method, call):
+    labels = _driver_labels(driver, method)
+    previous = getattr(_local, "call", None)
+    info = _local.call = {}
+    start = time.perf_counter()
+    try:
+        return call()
+    except BaseException:
+        metrics.inc("griptape_driver_errors_total", labels)
+        raise
+    finally:
+        _local.call = previous
+        seconds = time.perf_counter() - start
+        metrics.observe("griptape_driver_call_seconds", labels, seconds)
+        if info.get("attempts", 0) > 1:
+            metrics.inc("griptape_driver_retries_total", labels, info["attempts"] - 1)
+        if "cache" in info:
+            metrics.inc(
+                "griptape_cache_requests_total", (*labels, ("result", info["cache"]))
+            )
+        if info.get("coalesced"):
+            metrics.inc("griptape_coalesced_calls_total", labels)
+
+
+def prompt_middleware(driver, prompt_stack, call_next):
+    """Prompt driver middleware - see driver_hooks."""
+    driver.add_event_listener(_get_attempt_listener())
+    message = _timed_call(driver, "prompt", lambda: call_next(prompt_stack))
+    usage = getattr(message, "usage", None)
+    if usage is not None:
+        labels = _driver_labels(driver, "prompt")
+        for kind, tokens in (
+            ("input", usage.input_tokens),
+            ("output", usage.output_tokens),
+        ):
+            metrics.inc("griptape_tokens_total", (*labels, ("type", kind)), tokens or 0)
+    return message
+
+
+def call_middleware(driver, method, args, call_next):
+    """Driver call middleware - see driver_hooks."""
+    return _timed_call(driver, method, call_next)
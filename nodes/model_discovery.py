@@ -0,0 +1,124 @@
+import asyncio
+import os
+import time
+from urllib.parse import urlparse, urlunparse
+
+import aiohttp
+
+# How long a successful model list is served before it is refreshed in the background.
+MODELS_TTL = float(os.getenv("GRIPTAPE_MODELS_TTL", "30"))
+# How long to wait before probing a host that failed to answer.
+FAILURE_TTL = 5.0
+CONNECT_TIMEOUT = 1.0
+TOTAL_TIMEOUT = 3.0
+
+ENGINES = {
+    "ollama": ("/api/tags", "models", "name"),
+    "lmstudio": ("/v1/models", "data", "id"),
+}
+
+DEFAULT_HOSTS = (
+    ("ollama", "http://127.0.0.1", "11434"),
+    ("lmstudio", "http://127.0.0.1", "1234"),
+)
+
+
+def construct_base_url(base_url: str, port: int) -> str:
+    # Parse the base_url
+    parsed_url = urlparse(base_url)
+
+    # If there's no scheme (http:// or https://), add http://
+    if not parsed_url.scheme:
+        parsed_url = parsed_url._replace(scheme="http")
+
+    # Replace the port
+    parsed_url = parsed_url._replace(netloc=f"{parsed_url.hostname}:{port}")
+
+    # Reconstruct the URL without any path
+    return urlunparse(parsed_url._replace(path=""))
+
+
+def get_models_url(engine, base_url, port) -> str:
+    if engine not in ENGINES:
+        raise ValueError(f"Unsupported engine: {engine}")
+    path, _key, _field = ENGINES[engine]
+    return f"{construct_base_url(base_url, port)}{path}"
+
+
+def parse_models(engine, data) -> list[str]:
+    _path, key, field = ENGINES[engine]
+    return [model[field] for model in data.get(key, [])]
+
+
+class ModelDiscovery:
+    """
+    Caches the models available on local Ollama / LM Studio hosts.
+
+    Lists are cached per (engine, host, port). Once an entry is older than the
+    TTL the stale list is returned straight away and a refresh runs in the
+    background, so callers only ever wait on the very first probe of a host,
+    and that probe is bounded by short timeouts.
+    """
+
+    def __init__(self, ttl=MODELS_TTL, failure_ttl=FAILURE_TTL):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._entries = {}
+        self._probes = {}
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(
+                    total=TOTAL_TIMEOUT, sock_connect=CONNECT_TIMEOUT
+                )
+            )
+        return self._session
+
+    async def _probe(self, key):
+        engine, base_url, port = key
+        try:
+            async with self._get_session().get(
+                get_models_url(engine, base_url, port)
+            ) as response:
+                response.raise_for_status()
+                models = parse_models(engine, await response.json(content_type=None))
+            expires = time.monotonic() + self.ttl
+        except Exception as e:
+            print(f"Failed to fetch models from {engine.capitalize()}: {e}")
+            # Keep serving the last good list rather than emptying the dropdown.
+            previous = self._entries.get(key)
+            models = previous[0] if previous else []
+            expires = time.monotonic() + self.failure_ttl
+        self._entries[key] = (models, expires)
+        return models
+
+    def refresh(self, engine, base_url, port):
+        """Starts a background probe unless one is already running for this host."""
+        key = (engine, str(base_url), str(port))
+        task = self._probes.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._probe(key))
+            self._probes[key] = task
+        return task
+
+    async def get_models(self, engine, base_url, port) -> list[str]:
+        if engine not in ENGINES:
+            raise ValueError(f"Unsupported engine: {engine}")
+        entry = self._entries.get((engine, str(base_url), str(port)))
+        if entry is None:
+            # Nothing to serve yet - wait for the (shared, time-bounded) probe.
+            return list(await asyncio.shield(self.refresh(engine, base_url, port)))
+        models, expires = entry
+        if time.monotonic() >= expires:
+            self.refresh(engine, base_url, port)
+        return list(models)
+
+    def prime(self, loop, hosts=DEFAULT_HOSTS):
+        """Schedules probes of the default hosts on the server loop."""
+        for engine, base_url, port in hosts:
+            loop.call_soon_threadsafe(self.refresh, engine, base_url, port)
+
+
+model_discovery = ModelDiscovery()
@@ -0,0 +1,106 @@
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+import attrs
+
+from .fingerprint import environment_fingerprint, fingerprint
+
+# Maximum number of configs / drivers kept warm. Set GRIPTAPE_POOL_SIZE=0 to disable pooling.
+POOL_SIZE = int(os.getenv("GRIPTAPE_POOL_SIZE", "32"))
+
+
+class InstancePool:
+    """
+    A thread-safe LRU pool of objects keyed by fingerprint.
+    """
+
+    def __init__(self, max_size=POOL_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, factory, refs=(), cacheable=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        # Build outside the lock - creating a driver can take a while.
+        value = factory()
+        if self.max_size > 0 and (cacheable is None or cacheable(value)):
+            with self._lock:
+                self._entries[key] = (value, refs)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+instance_pool = InstancePool()
+
+
+def pooled_create(create):
+    """
+    Wraps a config/driver node's create() so identical inputs hand back the
+    same, already warm, driver objects (and with them their HTTP clients).
+    """
+
+    @functools.wraps(create)
+    def wrapper(self, *args, **kwargs):
+        if instance_pool.max_size <= 0:
+            return create(self, *args, **kwargs)
+        key, refs = fingerprint(
+            type(self).__name__,
+            create.__qualname__,
+            args,
+            kwargs,
+            environment_fingerprint(),
+        )
+        return instance_pool.get_or_create(
+            key,
+            lambda: create(self, *args, **kwargs),
+            refs,
+            # Nodes report failures as (None, error) - don't keep those around.
+            cacheable=lambda result: bool(result) and result[0] is not None,
+        )
+
+    wrapper.__pooled__ = True
+    return wrapper
+
+
+def copy_attrs(instance):
+    """
+    A shallow copy of an attrs instance, such as a pooled driver.
+
+    copy.copy fails on attrs slots classes with fields left unset (the Dummy
+    drivers' model, a memory's structure before it is attached), so only the
+    attributes that are set are copied.
+    """
+    duplicate = object.__new__(type(instance))
+    for attribute in attrs.fields(type(instance)):
+        if hasattr(instance, attribute.name):
+            object.__setattr__(
+                duplicate, attribute.name, getattr(instance, attribute.name)
+            )
+    if hasattr(instance, "__dict__"):
+        duplicate.__dict__.update(instance.__dict__)
+    return duplicate
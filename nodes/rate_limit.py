@@ -0,0 +1,249 @@
+import importlib
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from .cancellation import check_cancelled
+from .concurrency import provider_name
+from .driver_hooks import add_ignored_exception_types
+from .fingerprint import api_key_id
+
+# Requests / tokens per minute allowed per (provider, API key). 0 means no
+# limit. Override a single provider with e.g. GRIPTAPE_RATE_LIMIT_RPM_OPENAI.
+RATE_LIMIT_RPM = float(os.getenv("GRIPTAPE_RATE_LIMIT_RPM", "0"))
+RATE_LIMIT_TPM = float(os.getenv("GRIPTAPE_RATE_LIMIT_TPM", "0"))
+# How many times a rate limited call is retried before the error is raised.
+RATE_LIMIT_RETRIES = int(os.getenv("GRIPTAPE_RATE_LIMIT_RETRIES", "6"))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Provider exceptions that mean "slow down". The drivers' own retry loops
+# are told to leave these alone so the shared backoff below handles them.
+RATE_LIMIT_EXCEPTIONS = (
+    ("openai", "RateLimitError"),
+    ("anthropic", "RateLimitError"),
+    ("cohere.errors", "TooManyRequestsError"),
+)
+RATE_LIMIT_CODES = ("ThrottlingException", "TooManyRequestsException")
+
+
+def _load_rate_limit_exceptions():
+    exceptions = []
+    for module_name, name in RATE_LIMIT_EXCEPTIONS:
+        try:
+            exceptions.append(getattr(importlib.import_module(module_name), name))
+        except (ImportError, AttributeError):
+            pass
+    return tuple(exceptions)
+
+
+def is_rate_limit_error(e) -> bool:
+    response = getattr(e, "response", None)
+    status = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+    if status == 429:
+        return True
+    if isinstance(response, dict):
+        # botocore ClientError
+        return response.get("Error", {}).get("Code") in RATE_LIMIT_CODES
+    return "RateLimit" in type(e).__name__
+
+
+def get_retry_after(e):
+    """Seconds to wait according to the error's Retry-After header, if any."""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_prompt_tokens(driver, prompt_stack) -> int:
+    text = driver.prompt_stack_to_string(prompt_stack)
+    try:
+        return driver.tokenizer.count_tokens(text)
+    except Exception:
+        return len(text) // 4
+
+
+def interruptible_sleep(seconds):
+    deadline = time.monotonic() + seconds
+    while True:
+        check_cancelled()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, 0.1))
+
+
+class TokenBucket:
+    """
+    A token bucket refilled at per_minute / 60 per second.
+
+    reserve() always succeeds and returns how long the caller must wait for
+    its reservation to be covered, so waiting callers are served in order.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+    def adjust(self, amount):
+        """Takes (or with a negative amount, gives back) tokens without waiting."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class ProviderLimiter:
+    def __init__(self, rpm, tpm):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.cooldown_until = 0.0
+        self.throttled_seconds = 0.0
+        self.throttled_calls = 0
+        self.rate_limit_errors = 0
+        self._lock = threading.Lock()
+
+    def wait(self, tokens=0):
+        delay = self.cooldown_until - time.monotonic()
+        if self.requests:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens and tokens:
+            delay = max(delay, self.tokens.reserve(tokens))
+        if delay > 0:
+            with self._lock:
+                self.throttled_seconds += delay
+                self.throttled_calls += 1
+            interruptible_sleep(delay)
+
+    def backoff(self, attempt, retry_after=None) -> float:
+        # Full jitter, so callers that were throttled together don't retry together.
+        delay = retry_after
+        if delay is None:
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+        with self._lock:
+            self.rate_limit_errors += 1
+            # Everyone using this key waits, not only the caller that got the 429.
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + delay)
+        return delay
+
+    def stats(self):
+        return {
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "throttled_calls": self.throttled_calls,
+            "rate_limit_errors": self.rate_limit_errors,
+        }
+
+
+class RateLimiter:
+    """
+    Process-wide rate limits and 429 backoff, keyed by (provider, API key).
+
+    Every prompt, embedding, image generation and image query call first
+    waits for its request / token budget, then runs. Rate limit errors are
+    retried here with jittered exponential backoff (or the server's
+    Retry-After), instead of by each driver on its own schedule.
+    """
+
+    def __init__(
+        self, rpm=RATE_LIMIT_RPM, tpm=RATE_LIMIT_TPM, retries=RATE_LIMIT_RETRIES
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.retries = retries
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._exceptions = None
+
+    def limiter_for(self, driver):
+        provider = provider_name(driver)
+        key = (provider, api_key_id(driver))
+        with self._lock:
+            if key not in self._limiters:
+                suffix = provider.upper()
+                self._limiters[key] = ProviderLimiter(
+                    float(os.getenv(f"GRIPTAPE_RATE_LIMIT_RPM_{suffix}", self.rpm)),
+                    float(os.getenv(f"GRIPTAPE_RATE_LIMIT_TPM_{suffix}", self.tpm)),
+                )
+            return self._limiters[key]
+
+    def call(self, driver, call_next, tokens=0):
+        if self._exceptions is None:
+            self._exceptions = _load_rate_limit_exceptions()
+        add_ignored_exception_types(driver, *self._exceptions)
+
+        limiter = self.limiter_for(driver)
+        attempt = 0
+        while True:
+            # Tokens are reserved once. A rejected request used none, so
+            # retries only wait for a request slot and the cooldown.
+            limiter.wait(tokens if attempt == 0 else 0)
+            try:
+                return call_next()
+            except Exception as e:
+                if attempt >= self.retries or not is_rate_limit_error(e):
+                    raise
+                delay = limiter.backoff(attempt, get_retry_after(e))
+                print(
+                    f"Rate limited by {provider_name(driver)}, retrying in {delay:.1f}s"
+                )
+                attempt += 1
+
+    def prompt_middleware(self, driver, prompt_stack, call_next):
+        """Prompt driver middleware - see driver_hooks."""
+        limiter = self.limiter_for(driver)
+        if limiter.tokens is None:
+            return self.call(driver, lambda: call_next(prompt_stack))
+
+        estimate = estimate_prompt_tokens(driver, prompt_stack)
+        message = self.call(driver, lambda: call_next(prompt_stack), estimate)
+        # Settle the estimate against what the provider reports.
+        usage = getattr(message, "usage", None)
+        if usage is not None:
+            actual = (usage.input_tokens or 0) + (usage.output_tokens or 0)
+            limiter.tokens.adjust(actual - estimate)
+        return message
+
+    def call_middleware(self, driver, method, args, call_next):
+        """Driver call middleware - see driver_hooks."""
+        return self.call(driver, call_next)
+
+    def stats(self):
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "limiters": {
+                f"{provider}:{key_id}": limiter.stats()
+                for (provider, key_id), limiter in limiters.items()
+            },
+        }
+
+
+rate_limiter = RateLimiter()
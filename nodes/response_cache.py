@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .metrics import note
+from .fingerprint import api_key_id
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(THIS_DIR, "..", ".cache", "responses.sqlite")
+
+# The response cache is opt-in: set GRIPTAPE_RESPONSE_CACHE=1 to enable it.
+RESPONSE_CACHE_ENABLED = os.getenv("GRIPTAPE_RESPONSE_CACHE", "0").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+RESPONSE_CACHE_TTL = float(os.getenv("GRIPTAPE_RESPONSE_CACHE_TTL", 7 * 24 * 60 * 60))
+RESPONSE_CACHE_MAX_MB = float(os.getenv("GRIPTAPE_RESPONSE_CACHE_MAX_MB", "256"))
+
+# Driver settings that change what the model returns.
+DRIVER_KEY_ATTRIBUTES = (
+    "model",
+    "temperature",
+    "seed",
+    "max_tokens",
+    "top_p",
+    "top_k",
+    "response_format",
+    "use_native_tools",
+)
+
+# Driver settings that pick which server answers: the same model name on
+# another endpoint (a local Ollama, an Azure deployment) is a different model.
+DRIVER_ENDPOINT_ATTRIBUTES = (
+    "base_url",
+    "host",
+    "endpoint",
+    "azure_endpoint",
+    "azure_deployment",
+    "api_version",
+)
+
+
+def driver_identity(driver):
+    """Which driver, endpoint and API key a request goes to."""
+    return {
+        "driver": type(driver).__name__,
+        "endpoint": {
+            attr: getattr(driver, attr)
+            for attr in DRIVER_ENDPOINT_ATTRIBUTES
+            if getattr(driver, attr, None) is not None
+        },
+        # Only a hash of the key, so keys never reach the cache file.
+        "api_key": api_key_id(driver),
+    }
+
+
+def _artifact_payload(artifact):
+    # Artifact ids and names are random per run and must not change the key.
+    value = artifact.value
+    if isinstance(value, bytes):
+        value = hashlib.sha256(value).hexdigest()
+    elif isinstance(value, list):
+        value = [_artifact_payload(v) if hasattr(v, "value") else v for v in value]
+    elif hasattr(value, "tag") and hasattr(value, "path"):
+        value = _action_payload(value)
+    return {"type": type(artifact).__name__, "value": value}
+
+
+def _action_payload(action):
+    return {
+        "tag": action.tag,
+        "name": action.name,
+        "path": action.path,
+        "input": action.input,
+    }
+
+
+def _message_payload(message):
+    contents = []
+    for content in message.content:
+        item = {
+            "type": type(content).__name__,
+            "artifact": _artifact_payload(content.artifact),
+        }
+        action = getattr(content, "action", None)
+        if action is not None:
+            item["action"] = _action_payload(action)
+        contents.append(item)
+    return {"role": message.role, "content": contents}
+
+
+def is_deterministic(driver):
+    """Only temperature 0 or fixed-seed calls are worth caching."""
+    return driver.temperature == 0 or getattr(driver, "seed", None) is not None
+
+
+def response_key(driver, prompt_stack):
+    payload = {
+        **driver_identity(driver),
+        "params": {
+            attr: getattr(driver, attr)
+            for attr in DRIVER_KEY_ATTRIBUTES
+            if hasattr(driver, attr)
+        },
+        # Built by hand: prompt_stack.to_dict() takes milliseconds per call.
+        "messages": [_message_payload(m) for m in prompt_stack.messages],
+        "tools": [tool.schema() for tool in getattr(prompt_stack, "tools", [])],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResponseCache:
+    """
+    On-disk (SQLite) cache of prompt driver responses, keyed by a hash of the
+    driver, its endpoint and API key, its settings, the rendered messages and
+    the tool schemas. Entries expire after the TTL and the least recently used
+    ones are evicted past the size limit.
+    """
+
+    def __init__(
+        self,
+        path=CACHE_FILE,
+        max_bytes=int(RESPONSE_CACHE_MAX_MB * 1024 * 1024),
+        ttl=RESPONSE_CACHE_TTL,
+        enabled=RESPONSE_CACHE_ENABLED,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT, size INTEGER, "
+                "created REAL, accessed REAL)"
+            )
+        return self._connection
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._evict(connection)
+
+    def _evict(self, connection):
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM responses WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+
+    def stats(self):
+        stats = {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+        if self._connection is not None:
+            with self._lock:
+                stats["entries"], stats["bytes"] = self._connection.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+        return stats
+
+    def __call__(self, driver, prompt_stack, call_next):
+        """Prompt driver middleware - see driver_hooks."""
+        from griptape.common import Message
+
+        if not is_deterministic(driver):
+            return call_next(prompt_stack)
+
+        key = response_key(driver, prompt_stack)
+        cached = self.get(key)
+        if cached is not None:
+            try:
+                message = Message.from_json(cached)
+                note("cache", "hit")
+                return message
+            except Exception as e:
+                print(f"Ignoring unreadable cached response: {e}")
+        note("cache", "miss")
+
+        message = call_next(prompt_stack)
+        self.put(key, message.to_json())
+        return message
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+
+from .cancellation import RunCancelled, check_cancelled
+from .metrics import note
+from .response_cache import driver_identity, response_key
+
+# Set GRIPTAPE_SINGLE_FLIGHT=0 to send every request, even identical ones in flight.
+SINGLE_FLIGHT_ENABLED = os.getenv("GRIPTAPE_SINGLE_FLIGHT", "1").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical requests that are in flight at the same time.
+
+    The first caller for a key runs the request; callers arriving before it
+    finishes wait and share its result (or its error). Nothing is kept once
+    the request is done.
+    """
+
+    def __init__(self, enabled=SINGLE_FLIGHT_ENABLED):
+        self.enabled = enabled
+        self.calls = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, copy_result=lambda result: result):
+        with self._lock:
+            self.calls += 1
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+
+            if leader:
+                try:
+                    flight.result = fn()
+                    return flight.result
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._flights[key]
+                    flight.done.set()
+
+            while not flight.done.wait(0.1):
+                check_cancelled()
+            if isinstance(flight.error, RunCancelled):
+                # The leader's run was cancelled, not ours - try again.
+                continue
+            with self._lock:
+                self.coalesced += 1
+            note("coalesced", True)
+            if flight.error is not None:
+                raise flight.error
+            return copy_result(flight.result)
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
+
+    def prompt_middleware(self, driver, prompt_stack, call_next):
+        """Prompt driver middleware - see driver_hooks."""
+        from griptape.common import Message
+
+        key = "prompt:" + response_key(driver, prompt_stack)
+        return self.do(
+            key,
+            lambda: call_next(prompt_stack),
+            # Each caller gets its own Message.
+            lambda message: Message.from_json(message.to_json()),
+        )
+
+    def call_middleware(self, driver, method, args, call_next):
+        """Driver call middleware - see driver_hooks."""
+        if method != "embed_string":
+            return call_next()
+        payload = {
+            **driver_identity(driver),
+            "model": getattr(driver, "model", None),
+            "args": args,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        key = "embed:" + hashlib.sha256(encoded).hexdigest()
+        return self.do(key, call_next, list)
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+import uuid
+
+from griptape.events import CompletionChunkEvent, EventListener
+
+# Tokens are sent to the browser at most this often (seconds).
+STREAM_INTERVAL = float(os.getenv("GRIPTAPE_STREAM_INTERVAL", "0.05"))
+STREAM_EVENT = "comfy.gtUI.stream"
+
+_local = threading.local()
+
+
+def get_prompt_server():
+    try:
+        from server import PromptServer
+    except ImportError:
+        return None
+    return getattr(PromptServer, "instance", None)
+
+
+class TokenStream:
+    """
+    Batches the chunks of one streaming prompt driver call and forwards them to
+    the node that is running, at most once per interval.
+
+    Messages are {"node", "stream", "state", "delta"}, where state is "start",
+    "chunk" or "end". A node that runs several prompts at once (batch and
+    parallel nodes) has several streams, told apart by the stream id.
+    """
+
+    def __init__(self, server, node_id, client_id, interval=STREAM_INTERVAL):
+        self.id = uuid.uuid4().hex
+        self.server = server
+        self.node_id = node_id
+        self.client_id = client_id
+        self.interval = interval
+        self._buffer = []
+        self._last_sent = 0.0
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def send(self, state, delta=""):
+        self.server.send_sync(
+            STREAM_EVENT,
+            {"node": self.node_id, "stream": self.id, "state": state, "delta": delta},
+            self.client_id,
+        )
+
+    def push(self, token):
+        with self._lock:
+            self._buffer.append(token)
+            wait = self._last_sent + self.interval - time.monotonic()
+            if wait > 0:
+                # Sent when the interval is up, even if no more tokens arrive.
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        # Sent under the lock, so chunks from the timer and from push() stay in order.
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._buffer:
+                delta = "".join(self._buffer)
+                self._buffer.clear()
+                self._last_sent = time.monotonic()
+                self.send("chunk", delta)
+
+    def __enter__(self):
+        self.send("start")
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+        self.send("end")
+
+
+def _forward_chunk(event):
+    # Drivers are shared between nodes and threads, so the chunks go to
+    # whichever stream is active on the thread that is running the driver.
+    stream = getattr(_local, "stream", None)
+    if stream is not None:
+        stream.push(event.token)
+
+
+chunk_listener = EventListener(_forward_chunk, event_types=[CompletionChunkEvent])
+
+
+def stream_middleware(driver, prompt_stack, call_next):
+    """Prompt driver middleware - see driver_hooks."""
+    server = get_prompt_server()
+    node_id = getattr(server, "last_node_id", None)
+    if not driver.stream or node_id is None:
+        return call_next(prompt_stack)
+
+    driver.add_event_listener(chunk_listener)
+    previous = getattr(_local, "stream", None)
+    with TokenStream(server, node_id, getattr(server, "client_id", None)) as stream:
+        _local.stream = stream
+        try:
+            return call_next(prompt_stack)
+        finally:
+            _local.stream = previous
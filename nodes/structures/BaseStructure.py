@@ -1,4 +1,34 @@
-from griptape.structures import Structure
+import copy
+
+from griptape.structures import Pipeline, Structure
+
+from ..agent.gtComfyAgent import copy_conversation_memory, copy_structure_config
+from ..fingerprint import input_fingerprint
+
+
+def copy_task(task):
+    """A copy of a task that can be added to another structure."""
+    task = copy.copy(task)
+    task.parent_ids = []
+    task.child_ids = []
+    task.output = None
+    return task
+
+
+def fork_pipeline(pipeline):
+    """
+    A new Pipeline with copies of the tasks of the given one.
+
+    ComfyUI caches node outputs, so structures coming in from upstream nodes
+    must be left untouched or a cached run would see the changes.
+    """
+    return Pipeline(
+        config=copy_structure_config(pipeline.config),
+        tasks=[copy_task(task) for task in pipeline.tasks],
+        rulesets=list(pipeline.rulesets),
+        rules=list(pipeline.rules),
+        conversation_memory=copy_conversation_memory(pipeline.conversation_memory),
+    )
 
 
 class gtUIBaseStructure:
@@ -14,6 +44,10 @@ class gtUIBaseStructure:
             "optional": {},
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return input_fingerprint(kwargs)
+
     RETURN_TYPES = ("STRUCTURE",)
     RETURN_NAMES = ("STRUCTURE",)
 
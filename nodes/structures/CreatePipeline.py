@@ -1,8 +1,6 @@
-from random import randint
-
 from griptape.structures import Pipeline
 
-from .BaseStructure import gtUIBaseStructure
+from .BaseStructure import copy_task, gtUIBaseStructure
 
 
 class AnyType(str):
@@ -34,10 +32,6 @@ class gtUICreatePipeline(gtUIBaseStructure):
     FUNCTION = "run"
     OUTPUT_NODE = False
 
-    @classmethod
-    def IS_CHANGED(s, int_field):
-        return randint(0, 1000)
-
     def run(
         self,
         **kwargs,
@@ -47,6 +41,6 @@ class gtUICreatePipeline(gtUIBaseStructure):
             if value is not None:
                 if i == 0:
                     # append " {{ args[0] }}" to the first task if it's not there.
-                    tasks.append(value)
+                    tasks.append(copy_task(value))
         structure = Pipeline(tasks=tasks)
         return (structure,)
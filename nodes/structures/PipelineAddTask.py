@@ -1,8 +1,6 @@
-from random import randint
-
 from griptape.tasks import PromptTask
 
-from .BaseStructure import gtUIBaseStructure
+from .BaseStructure import copy_task, fork_pipeline, gtUIBaseStructure
 
 
 class AnyType(str):
@@ -28,10 +26,6 @@ class gtUIPipelineAddTask(gtUIBaseStructure):
         )
         return inputs
 
-    @classmethod
-    def IS_CHANGED(s, int_field):
-        return randint(0, 1000)
-
     RETURN_TYPES = ("STRUCTURE",)
     RETURN_NAMES = ("STRUCTURE",)
 
@@ -39,7 +33,7 @@ class gtUIPipelineAddTask(gtUIBaseStructure):
     # OUTPUT_NODE = Tru
 
     def run(self, **kwargs):
-        structure = kwargs.get("structure")
+        structure = fork_pipeline(kwargs.get("structure"))
         append_parent_output = kwargs.get("append_parent_output", True)
         task = kwargs.get("task")
 
@@ -55,5 +49,5 @@ class gtUIPipelineAddTask(gtUIBaseStructure):
                     # print(type(task.input.value))
 
                     # task.prompt = task.prompt.value + "\n\n" + task.input.value
-            structure.add_task(task)
+            structure.add_task(copy_task(task))
         return (structure,)
@@ -1,8 +1,6 @@
-from random import randint
-
 from griptape.tasks import PromptTask
 
-from .BaseStructure import gtUIBaseStructure
+from .BaseStructure import copy_task, fork_pipeline, gtUIBaseStructure
 
 
 class AnyType(str):
@@ -29,10 +27,6 @@ class gtUIPipelineInsertTask(gtUIBaseStructure):
         )
         return inputs
 
-    @classmethod
-    def IS_CHANGED(s, int_field):
-        return randint(0, 1000)
-
     RETURN_TYPES = ("STRUCTURE",)
     RETURN_NAMES = ("STRUCTURE",)
 
@@ -43,7 +37,7 @@ class gtUIPipelineInsertTask(gtUIBaseStructure):
         self,
         **kwargs,
     ):
-        structure = kwargs.get("structure")
+        structure = fork_pipeline(kwargs.get("structure"))
         parent_task = kwargs.get("parent_task")
         task = kwargs.get("task")
         append_parent_output = kwargs.get("append_parent_output", True)
@@ -60,5 +54,7 @@ class gtUIPipelineInsertTask(gtUIBaseStructure):
                     # print(type(task.input.value))
 
                     # task.prompt = task.prompt.value + "\n\n" + task.input.value
-            structure.insert_task(parent_task, task)
+            structure.insert_task(
+                structure.find_task(parent_task.id), copy_task(task)
+            )
         return (structure,)
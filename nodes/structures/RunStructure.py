@@ -1,7 +1,9 @@
 from griptape.artifacts import AudioArtifact, ImageArtifact, TextArtifact
 
+from ..cancellation import run_interruptible
+from ..tracing import tracer
 from ..utilities import image_to_comfyui
-from .BaseStructure import gtUIBaseStructure
+from .BaseStructure import fork_pipeline, gtUIBaseStructure
 
 
 class AnyType(str):
@@ -59,7 +61,7 @@ class gtUIRunStructure(gtUIBaseStructure):
 
     def run(self, **kwargs):
         STRING = kwargs.get("STRING", "")
-        structure = kwargs.get("structure")
+        structure = fork_pipeline(kwargs.get("structure"))
         input_string = kwargs.get("input_string", "")
 
         prompt_text = self.get_prompt_text(STRING, input_string)
@@ -67,7 +69,8 @@ class gtUIRunStructure(gtUIBaseStructure):
         # If prompt_text isn't empty, we'll need to add it to the first task if we can.
         structure = self.append_prompt_text(structure, prompt_text)
         # Run the structure
-        result = structure.run(prompt_text)
+        with tracer.span("structure.run", structure_id=structure.id):
+            result = run_interruptible(structure.run, prompt_text)
 
         # Handle the results
         task_outputs = repr(
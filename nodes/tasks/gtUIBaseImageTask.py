@@ -1,6 +1,31 @@
+from ..image_codec import IMAGE_DETAILS, encode_for_driver
 from .gtUIBaseTask import gtUIBaseTask
 
 
+def image_query_inputs():
+    """Optional inputs of the nodes that send images to a vision model."""
+    return {
+        "image_detail": (
+            IMAGE_DETAILS,
+            {
+                "default": "auto",
+                "tooltip": "auto: downscale to the largest size the provider uses. "
+                "low: 512px long edge. original: send at full resolution.",
+            },
+        ),
+        "max_image_edge": (
+            "INT",
+            {
+                "default": 0,
+                "min": 0,
+                "max": 8192,
+                "step": 64,
+                "tooltip": "Downscale so the long edge is at most this. 0 uses image_detail.",
+            },
+        ),
+    }
+
+
 class gtUIBaseImageTask(gtUIBaseTask):
     @classmethod
     def INPUT_TYPES(cls):
@@ -16,6 +41,14 @@ class gtUIBaseImageTask(gtUIBaseTask):
 
     CATEGORY = "Griptape/Image"
 
+    def encode_query_images(self, image, prompt_driver, kwargs):
+        return encode_for_driver(
+            image,
+            prompt_driver,
+            detail=kwargs.get("image_detail", "auto"),
+            max_edge=kwargs.get("max_image_edge", 0),
+        )
+
     def run(self, STRING, image, input_string=None, agent=None):
         output = "Output"
         return (output, agent)
@@ -3,6 +3,7 @@ import re
 from griptape.tasks import PromptTask
 
 from ..agent.gtComfyAgent import gtComfyAgent as Agent
+from ..fingerprint import input_fingerprint
 
 
 class gtUIBaseTask:
@@ -51,12 +52,10 @@ class gtUIBaseTask:
 
     CATEGORY = "Griptape/Agent Tasks"
 
-    # @classmethod
-    # def IS_CHANGED(s, deferred_evaluation):
-    #     if deferred_evaluation:
-    #         return randint(0, 1000)
-    #     else:
-    #         return ""
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # A new agent is built from the default config when none is connected.
+        return input_fingerprint(kwargs, default_config=True)
 
     def get_prompt_text(self, STRING, input_string):
         # Get the prompt text
@@ -89,8 +88,7 @@ class gtUIBaseTask:
         agent = kwargs.get("agent")
         deferred_evaluation = kwargs.get("deferred_evaluation", False)
 
-        if not agent:
-            agent = Agent()
+        agent = agent.fork() if agent else Agent()
 
         prompt_text = self.get_prompt_text(STRING, input_string)
         task = PromptTask(prompt_text)
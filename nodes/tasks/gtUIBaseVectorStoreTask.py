@@ -1,6 +1,7 @@
 from griptape.drivers import LocalVectorStoreDriver
 
 from ..agent.gtComfyAgent import gtComfyAgent as Agent
+from ..fingerprint import input_fingerprint
 
 
 class gtUIBaseVectorStoreTask:
@@ -26,6 +27,10 @@ class gtUIBaseVectorStoreTask:
         )
         return inputs
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return input_fingerprint(kwargs, default_config=True)
+
     RETURN_TYPES = (
         "AGENT",
         # "DRIVER",
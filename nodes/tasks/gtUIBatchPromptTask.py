@@ -0,0 +1,98 @@
+from ..agent.gtComfyAgent import gtComfyAgent as Agent
+from ..cancellation import run_interruptible
+from ..concurrency import map_ordered
+from ..fingerprint import input_fingerprint
+
+
+def first(values, default=None):
+    # With INPUT_IS_LIST every input arrives as a list.
+    return values[0] if values else default
+
+
+class gtUIBatchPromptTask:
+    DESCRIPTION = "Run a list of prompts concurrently. Each prompt runs on its own copy of the agent."
+
+    INPUT_IS_LIST = True
+    OUTPUT_IS_LIST = (True, True)
+
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "STRING": (
+                    "STRING",
+                    {
+                        "multiline": True,
+                        "tooltip": "One prompt per line.\nIf a list of prompts is connected, this text is added before each of them.",
+                    },
+                ),
+                "max_concurrency": (
+                    "INT",
+                    {
+                        "default": 4,
+                        "min": 1,
+                        "max": 64,
+                        "tooltip": "How many prompts to run at the same time.",
+                    },
+                ),
+            },
+            "optional": {
+                "prompts": (
+                    "STRING",
+                    {
+                        "forceInput": True,
+                        "tooltip": "A list of prompts.",
+                    },
+                ),
+                "agent": ("AGENT",),
+                "config": ("CONFIG",),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "FLOAT")
+    RETURN_NAMES = ("OUTPUT", "LATENCY")
+    OUTPUT_TOOLTIPS = (
+        "The response to each prompt, in the same order as the prompts.",
+        "How long each prompt took, in seconds.",
+    )
+
+    FUNCTION = "run"
+
+    CATEGORY = "Griptape/Agent"
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return input_fingerprint(kwargs, default_config=True)
+
+    def get_prompts(self, STRING, prompts):
+        prompts = [prompt for prompt in prompts if prompt and prompt.strip()]
+        if not prompts:
+            return [line for line in STRING.split("\n") if line.strip()]
+        if STRING.strip():
+            return [STRING + "\n\n" + prompt for prompt in prompts]
+        return prompts
+
+    def run(self, **kwargs):
+        STRING = first(kwargs.get("STRING"), "")
+        max_concurrency = first(kwargs.get("max_concurrency"), 4)
+        agent = first(kwargs.get("agent"))
+        config = first(kwargs.get("config"))
+
+        prompts = self.get_prompts(STRING, kwargs.get("prompts", []))
+        if not prompts:
+            return (["No prompts provided"], [0.0])
+
+        if config:
+            agent = agent.update_config(config) if agent else Agent(config=config)
+        elif not agent:
+            agent = Agent()
+
+        def run_prompt(prompt):
+            return agent.fork().run(prompt).output_task.output.value
+
+        results = run_interruptible(map_ordered, run_prompt, prompts, max_concurrency)
+        outputs = [
+            f"Error: {error}" if error else output for output, error, _ in results
+        ]
+        latencies = [round(seconds, 3) for _, _, seconds in results]
+        return (outputs, latencies)
@@ -38,8 +38,7 @@ class gtUICsvExtractionTask(gtUIBaseTask):
         input_string = kwargs.get("input_string", None)
         agent = kwargs.get("agent", None)
 
-        if not agent:
-            agent = Agent()
+        agent = agent.fork() if agent else Agent()
         prompt_text = self.get_prompt_text(STRING, input_string)
         try:
             if columns:
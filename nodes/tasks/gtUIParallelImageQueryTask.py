@@ -1,48 +1,128 @@
-import base64
+import json
 import os
 
 from griptape.artifacts import BaseArtifact, TextArtifact
 from griptape.drivers import AmazonBedrockPromptDriver, AnthropicPromptDriver
-from griptape.loaders import ImageLoader
-from griptape.structures import Workflow
+from griptape.structures import Pipeline, Workflow
 from griptape.tasks import (
     CodeExecutionTask,
     PromptTask,
 )
+from jinja2 import Template
 
+from ..agent.gtComfyAgent import copy_structure_config
 from ..agent.gtComfyAgent import gtComfyAgent as Agent
-from ..utilities import (
-    convert_tensor_to_base_64,
-)
-from .gtUIBaseImageTask import gtUIBaseImageTask
+from ..cancellation import run_interruptible
+from ..concurrency import map_ordered
+from ..image_codec import DownscaleReport, FrameArtifacts, image_limits
+from .gtUIBaseImageTask import gtUIBaseImageTask, image_query_inputs
 
 default_prompt = "{{ input_string }}"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+BATCH_MODES = ["first frame", "every frame"]
+AGGREGATIONS = ["concatenate", "json", "template", "synthesize"]
+DEFAULT_AGGREGATION_TEMPLATE = (
+    "{% for result in results %}{{ result.prompt }}:\n{{ result.output }}\n\n{% endfor %}"
+)
+SYNTHESIZE_PROMPT = "Concatenate just the output values of the tasks, separated by two newlines: {{ parent_outputs }}"
+
 
 def do_start_task(task: CodeExecutionTask) -> BaseArtifact:
     return TextArtifact(str(task.input))
 
 
+def split_prompts(prompt_text):
+    """One prompt per non-blank line (the whole text if there are none)."""
+    return [line for line in prompt_text.split("\n") if line.strip()] or [prompt_text]
+
+
+def aggregate_outputs(prompts, outputs, aggregation, template=None):
+    """Combines the outputs of the prompts locally, without another LLM call."""
+    if aggregation == "json":
+        return json.dumps(
+            [
+                {"prompt": prompt, "output": output}
+                for prompt, output in zip(prompts, outputs)
+            ],
+            indent=2,
+        )
+    if aggregation == "template":
+        results = [
+            {"prompt": prompt, "output": output}
+            for prompt, output in zip(prompts, outputs)
+        ]
+        return (
+            Template(template or DEFAULT_AGGREGATION_TEMPLATE)
+            .render(results=results, prompts=prompts, outputs=outputs)
+            .strip()
+        )
+    return "\n\n".join(outputs)
+
+
 class gtUIParallelImageQueryTask(gtUIBaseImageTask):
     DESCRIPTION = (
         "Query an image for multiple detailed descriptions. This runs in parallel."
     )
 
+    @classmethod
+    def INPUT_TYPES(cls):
+        inputs = super().INPUT_TYPES()
+        inputs["optional"].update(
+            {
+                "batch_mode": (
+                    BATCH_MODES,
+                    {
+                        "default": BATCH_MODES[0],
+                        "tooltip": "first frame: query the first image of the batch.\nevery frame: query every image of the batch with every prompt.",
+                    },
+                ),
+                "aggregation": (
+                    AGGREGATIONS,
+                    {
+                        "default": AGGREGATIONS[0],
+                        "tooltip": "How the outputs of the prompts are combined.\nconcatenate: join them with blank lines.\njson: a JSON array of prompts and outputs.\ntemplate: render aggregation_template.\nsynthesize: ask the model to merge them, which costs another call.",
+                    },
+                ),
+                "aggregation_template": (
+                    "STRING",
+                    {
+                        "multiline": True,
+                        "default": DEFAULT_AGGREGATION_TEMPLATE,
+                        "tooltip": "Jinja template for the template aggregation. It gets results (a list of prompt and output), prompts and outputs.",
+                    },
+                ),
+                "max_concurrency": (
+                    "INT",
+                    {
+                        "default": 4,
+                        "min": 1,
+                        "max": 64,
+                        "tooltip": "How many queries to run at the same time in every frame mode.",
+                    },
+                ),
+                **image_query_inputs(),
+            }
+        )
+        return inputs
+
+    RETURN_TYPES = ("STRING", "AGENT", "STRING")
+    RETURN_NAMES = ("OUTPUT", "AGENT", "FRAME_OUTPUTS")
+    OUTPUT_IS_LIST = (False, False, True)
+
     def run(self, **kwargs):
         STRING = kwargs.get("STRING")
         image = kwargs.get("image")
         input_string = kwargs.get("input_string", None)
         agent = kwargs.get("agent", None)
+        batch_mode = kwargs.get("batch_mode", BATCH_MODES[0])
 
-        final_image = convert_tensor_to_base_64(image)
-        if final_image:
+        if image is not None:
             if not agent:
                 agent = Agent()
 
             prompt_driver = agent.config.prompt_driver
             rulesets = agent.rulesets
-            image_artifact = ImageLoader().load(base64.b64decode(final_image[0]))
 
             prompt_text = self.get_prompt_text(STRING, input_string)
 
@@ -54,22 +134,57 @@ class gtUIParallelImageQueryTask(gtUIBaseImageTask):
                 ):
                     prompt_text = "Describe this image"
 
-            structure = Workflow(rulesets=rulesets)
+            if batch_mode == "every frame":
+                frame_outputs = self.query_frames(
+                    image, split_prompts(prompt_text), agent, kwargs
+                )
+                if len(frame_outputs) == 1:
+                    output = frame_outputs[0]
+                else:
+                    output = "\n\n".join(
+                        f"Frame {i + 1}:\n{frame_output}"
+                        for i, frame_output in enumerate(frame_outputs)
+                    )
+                return (output, agent, frame_outputs)
+
+            if image.ndim == 4:
+                image = image[:1]
+            image_artifact = self.encode_query_images(image, prompt_driver, kwargs)[0]
+            prompts = split_prompts(prompt_text)
+            aggregation = kwargs.get("aggregation", AGGREGATIONS[0])
+
+            config = copy_structure_config(agent.config)
+            structure = Workflow(config=config, rulesets=rulesets)
             start_task = CodeExecutionTask("Start", run_fn=do_start_task, id="START")
-            end_task = PromptTask(
-                "Concatenate just the output values of the tasks, separated by two newlines: {{ parent_outputs }}",
-                id="END",
-                prompt_driver=agent.config.prompt_driver,
-                rulesets=rulesets,
-            )
+            if aggregation == "synthesize":
+                end_task = PromptTask(
+                    SYNTHESIZE_PROMPT,
+                    id="END",
+                    prompt_driver=config.prompt_driver,
+                    rulesets=rulesets,
+                )
+            else:
+
+                def do_end_task(task: CodeExecutionTask) -> BaseArtifact:
+                    # Parents are in the order the prompt tasks were inserted.
+                    outputs = [parent.output.value for parent in task.parents]
+                    return TextArtifact(
+                        aggregate_outputs(
+                            prompts,
+                            outputs,
+                            aggregation,
+                            kwargs.get("aggregation_template"),
+                        )
+                    )
+
+                end_task = CodeExecutionTask("End", run_fn=do_end_task, id="END")
             structure.add_task(start_task)
             structure.add_task(end_task)
 
-            prompts = prompt_text.split("\n")
             prompt_tasks = []
             for prompt in prompts:
                 task = PromptTask(
-                    (prompt, [image_artifact]), prompt_driver=prompt_driver
+                    (prompt, [image_artifact]), prompt_driver=config.prompt_driver
                 )
                 prompt_tasks.append(task)
 
@@ -79,4 +194,79 @@ class gtUIParallelImageQueryTask(gtUIBaseImageTask):
             output = result.output_task.output.value
         else:
             output = "No image provided"
-        return (output, agent)
+        return (output, agent, [output])
+
+    def query_frames(self, image, prompts, agent, kwargs):
+        """
+        Runs every prompt on every frame, at most max_concurrency at a time, and
+        returns one output per frame with its prompts' outputs aggregated. Each
+        frame is encoded once and shared by its prompts.
+        """
+        prompt_driver = agent.config.prompt_driver
+        max_concurrency = kwargs.get("max_concurrency", 4)
+        aggregation = kwargs.get("aggregation", AGGREGATIONS[0])
+        limits = image_limits(
+            prompt_driver,
+            kwargs.get("image_detail", "auto"),
+            kwargs.get("max_image_edge", 0),
+        )
+        report = DownscaleReport(prompt_driver)
+        frames = FrameArtifacts(image, limits, uses=len(prompts), report=report)
+
+        def run_query(pair):
+            index, prompt = pair
+            image_artifact = frames.acquire(index)
+            try:
+                # Passing the config skips building a default one, which
+                # creates a client per driver, for every query. Each query
+                # gets its own copy so its events reach its own Pipeline.
+                config = copy_structure_config(agent.config)
+                structure = Pipeline(config=config, rulesets=agent.rulesets)
+                structure.add_task(
+                    PromptTask(
+                        (prompt, [image_artifact]), prompt_driver=config.prompt_driver
+                    )
+                )
+                return structure.run().output_task.output.value
+            finally:
+                frames.release(index)
+
+        # Frame-major order, so a frame's prompts run close together and its
+        # encoded image is dropped soon after.
+        pairs = [(index, prompt) for index in range(len(frames)) for prompt in prompts]
+        results = run_interruptible(map_ordered, run_query, pairs, max_concurrency)
+        report.emit()
+
+        outputs = [
+            f"Error: {error}" if error else output for output, error, _ in results
+        ]
+        frame_outputs = [
+            outputs[index : index + len(prompts)]
+            for index in range(0, len(outputs), len(prompts))
+        ]
+        if aggregation != "synthesize":
+            return [
+                aggregate_outputs(
+                    prompts, outputs, aggregation, kwargs.get("aggregation_template")
+                )
+                for outputs in frame_outputs
+            ]
+
+        def synthesize(outputs):
+            config = copy_structure_config(agent.config)
+            structure = Pipeline(config=config, rulesets=agent.rulesets)
+            structure.add_task(
+                PromptTask(
+                    SYNTHESIZE_PROMPT,
+                    context={"parent_outputs": outputs},
+                    prompt_driver=config.prompt_driver,
+                )
+            )
+            return structure.run().output_task.output.value
+
+        results = run_interruptible(
+            map_ordered, synthesize, frame_outputs, max_concurrency
+        )
+        return [
+            f"Error: {error}" if error else output for output, error, _ in results
+        ]
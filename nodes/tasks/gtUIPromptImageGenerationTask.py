@@ -1,5 +1,9 @@
+import copy
 import os
+import random
 
+import torch
+from griptape.artifacts import ErrorArtifact
 from griptape.drivers import (
     DummyImageGenerationDriver,
     OpenAiImageGenerationDriver,
@@ -14,14 +18,37 @@ from griptape.tasks import (
 
 import folder_paths
 
+from ..agent.gtComfyAgent import copy_structure_config
 from ..agent.gtComfyAgent import gtComfyAgent as Agent
+from ..cancellation import run_interruptible
+from ..concurrency import map_ordered
 from ..utilities import (
-    image_path_to_output,
+    image_to_comfyui,
+    output_connected,
+    write_file_async,
 )
 from .gtUIBaseTask import gtUIBaseTask
 
 default_prompt = "{{ input_string }}"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+MAX_SEED = 2**31 - 1
+
+
+def seeded_drivers(driver, images, seed):
+    """
+    One driver per image. Drivers that take a seed (Leonardo, Amazon Bedrock)
+    get seed, seed + 1, ... so every image differs; a seed of 0 starts from
+    the driver's own seed, or a random one. Other drivers are shared.
+    """
+    if not hasattr(driver, "seed") or (images == 1 and not seed):
+        return [driver] * images
+    base = seed or driver.seed or random.randint(1, MAX_SEED)
+    drivers = []
+    for i in range(images):
+        seeded = copy.copy(driver)
+        seeded.seed = (base + i) % MAX_SEED
+        drivers.append(seeded)
+    return drivers
 
 
 class gtUIPromptImageGenerationTask(gtUIBaseTask):
@@ -30,19 +57,45 @@ class gtUIPromptImageGenerationTask(gtUIBaseTask):
     @classmethod
     def INPUT_TYPES(s):
         inputs = super().INPUT_TYPES()
-        inputs["optional"].update({"driver": ("DRIVER",)})
+        inputs["optional"].update(
+            {
+                "driver": ("DRIVER",),
+                "images": (
+                    "INT",
+                    {
+                        "default": 1,
+                        "min": 1,
+                        "max": 16,
+                        "tooltip": "How many images to generate. They are requested at the same time and returned as one batch.",
+                    },
+                ),
+                "seed": (
+                    "INT",
+                    {
+                        "default": 0,
+                        "min": 0,
+                        "max": MAX_SEED,
+                        "tooltip": "Seed of the first image, for drivers that take one (Leonardo, Amazon Bedrock). Each further image uses the next seed. 0 uses the driver's seed, or a random one.",
+                    },
+                ),
+            }
+        )
+        inputs["hidden"] = {"prompt": "PROMPT", "unique_id": "UNIQUE_ID"}
         return inputs
 
     RETURN_TYPES = (
         "IMAGE",
         "AGENT",
         "STRING",
+        "STRING",
     )
     RETURN_NAMES = (
         "IMAGE",
         "AGENT",
         "file_path",
+        "file_paths",
     )
+    OUTPUT_IS_LIST = (False, False, False, True)
     CATEGORY = "Griptape/Image"
 
     def run(self, **kwargs):
@@ -50,6 +103,8 @@ class gtUIPromptImageGenerationTask(gtUIBaseTask):
         driver = kwargs.get("driver", None)
         input_string = kwargs.get("input_string", None)
         agent = kwargs.get("agent", None)
+        images = kwargs.get("images", 1)
+        seed = kwargs.get("seed", 0)
 
         if not agent:
             agent = Agent()
@@ -73,30 +128,64 @@ class gtUIPromptImageGenerationTask(gtUIBaseTask):
                 )
             else:
                 driver = agent.config.image_generation_driver
-        # Create an engine configured to use the driver.
 
-        engine = PromptImageGenerationEngine(
-            image_generation_driver=driver,
+        def generate(image_driver):
+            # Create an engine configured to use the driver.
+            engine = PromptImageGenerationEngine(
+                image_generation_driver=image_driver,
+            )
+            prompt_task = PromptImageGenerationTask(
+                input=prompt_text,
+                image_generation_engine=engine,
+            )
+            pipeline = Pipeline(config=copy_structure_config(agent.config))
+            pipeline.add_task(prompt_task)
+            output = pipeline.run().output_task.output
+            if isinstance(output, ErrorArtifact):
+                raise RuntimeError(output.value)
+            return output
+
+        # The requests run at the same time, within the per-provider image
+        # generation limit (see concurrency.image_generation_middleware).
+        results = run_interruptible(
+            map_ordered, generate, seeded_drivers(driver, images, seed), images
         )
+        errors = [error for _, error, _ in results if error]
+        image_artifacts = [artifact for artifact, error, _ in results if not error]
+        if not image_artifacts:
+            raise errors[0]
+        if errors:
+            print(
+                f"   \033[33m- {len(errors)} of {images} images failed: {errors[0]}\033[0m"
+            )
 
         output_dir = folder_paths.get_temp_directory()
-        prompt_task = PromptImageGenerationTask(
-            input=prompt_text,
-            image_generation_engine=engine,
-            output_dir=output_dir,
-        )
-        try:
-            pipeline = Pipeline()
-            pipeline.add_task(prompt_task)
-            # agent.add_task(prompt_task)
-        except Exception as e:
-            print(e)
-
-        result = pipeline.run()
-        filename = result.output_task.output.name
-        image_path = os.path.join(output_dir, filename)
-
-        # Get the image in a format ComfyUI can read
-        output_image, output_mask = image_path_to_output(image_path)
-
-        return (output_image, agent, image_path)
+        output_images = []
+        image_paths = []
+        writes = []
+        for image_artifact in image_artifacts:
+            # Get the image in a format ComfyUI can read
+            output_image, output_mask = image_to_comfyui(image_artifact.value)
+            if output_images and output_image.shape[1:] != output_images[0].shape[1:]:
+                print(
+                    f"   \033[33m- Skipping {image_artifact.name}: its size differs from the first image\033[0m"
+                )
+                continue
+            image_path = os.path.join(output_dir, image_artifact.name)
+            # The image is decoded from memory; the file is only for the
+            # file path outputs, so it's written in the background.
+            writes.append(write_file_async(image_path, image_artifact.value))
+            output_images.append(output_image)
+            image_paths.append(image_path)
+
+        prompt, unique_id = kwargs.get("prompt"), kwargs.get("unique_id")
+        if output_connected(prompt, unique_id, 2) or output_connected(
+            prompt, unique_id, 3
+        ):
+            for written in writes:
+                written.result()
+        if len(output_images) > 1:
+            output_image = torch.cat(output_images, dim=0)
+        else:
+            output_image = output_images[0]
+        return (output_image, agent, image_paths[0], image_paths)
@@ -1,4 +1,3 @@
-import base64
 import os
 
 import folder_paths
@@ -8,16 +7,13 @@ from griptape.drivers import (
 from griptape.engines import (
     VariationImageGenerationEngine,
 )
-from griptape.loaders import ImageLoader
 from griptape.tasks import (
     VariationImageGenerationTask,
 )
 
 from ..agent.gtComfyAgent import gtComfyAgent as Agent
-from ..utilities import (
-    convert_tensor_to_base_64,
-    image_path_to_output,
-)
+from ..image_codec import encode_images
+from ..utilities import image_to_comfyui, output_connected, write_file_async
 from .gtUIBaseImageTask import gtUIBaseImageTask
 
 default_prompt = "{{ input_string }}"
@@ -32,6 +28,7 @@ class gtUIPromptImageVariationTask(gtUIBaseImageTask):
         inputs = super().INPUT_TYPES()
         inputs["optional"].update({"driver": ("DRIVER",)})
         del inputs["optional"]["agent"]
+        inputs["hidden"] = {"prompt": "PROMPT", "unique_id": "UNIQUE_ID"}
         return inputs
 
     RETURN_TYPES = (
@@ -50,8 +47,9 @@ class gtUIPromptImageVariationTask(gtUIBaseImageTask):
         input_string = kwargs.get("input_string", None)
 
         agent = Agent()
-        final_image = convert_tensor_to_base_64(image)
-        if not final_image:
+        # Image variation APIs (e.g. DALL-E 2) only accept PNG.
+        image_artifacts = encode_images(image, format="png")
+        if not image_artifacts:
             return ("No image provided", agent)
 
         prompt_text = self.get_prompt_text(STRING, input_string)
@@ -64,12 +62,10 @@ class gtUIPromptImageVariationTask(gtUIBaseImageTask):
         engine = VariationImageGenerationEngine(
             image_generation_driver=driver,
         )
-        image_artifact = ImageLoader().load(base64.b64decode(final_image[0]))
-        output_dir = folder_paths.get_temp_directory()
+        image_artifact = image_artifacts[0]
         variation_task = VariationImageGenerationTask(
             input=(prompt_text, image_artifact),
             image_generation_engine=engine,
-            output_dir=output_dir,
         )
 
         # if deferred_evaluation:
@@ -82,9 +78,17 @@ class gtUIPromptImageVariationTask(gtUIBaseImageTask):
             result = agent.run()
         except Exception as e:
             print(e)
-        filename = result.output_task.output.name
-        image_path = os.path.join(output_dir, filename)
+        output_artifact = result.output_task.output
+        image_path = os.path.join(
+            folder_paths.get_temp_directory(), output_artifact.name
+        )
+        # The image is decoded from memory; the file is only for the FILE_PATH
+        # output, so it's written in the background.
+        written = write_file_async(image_path, output_artifact.value)
+
         # Get the image in a format ComfyUI can read
-        output_image, output_mask = image_path_to_output(image_path)
+        output_image, output_mask = image_to_comfyui(output_artifact.value)
 
+        if output_connected(kwargs.get("prompt"), kwargs.get("unique_id"), 1):
+            written.result()
         return (output_image, image_path)
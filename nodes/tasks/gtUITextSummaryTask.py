@@ -15,8 +15,7 @@ class gtUITextSummaryTask(gtUIBaseTask):
         input_string = kwargs.get("input_string", None)
         agent = kwargs.get("agent", None)
 
-        if not agent:
-            agent = Agent()
+        agent = agent.fork() if agent else Agent()
         prompt_text = self.get_prompt_text(STRING, input_string)
         task = TextSummaryTask(prompt_text)
         # if deferred_evaluation:
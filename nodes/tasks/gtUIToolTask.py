@@ -28,8 +28,7 @@ class gtUIToolTask(gtUIBaseTask):
         input_string = kwargs.get("input_string", None)
         agent = kwargs.get("agent", None)
 
-        if not agent:
-            agent = Agent()
+        agent = agent.fork() if agent else Agent()
 
         if len(tool) == 0:
             return ("No tool provided.", agent)
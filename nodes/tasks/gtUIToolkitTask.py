@@ -35,8 +35,7 @@ class gtUIToolkitTask(gtUIBaseTask):
         if prompt_text.strip() == "":
             return ("No prompt provided", agent)
         # if the tool is provided, keep going
-        if not agent:
-            agent = Agent()
+        agent = agent.fork() if agent else Agent()
 
         model, simple_model = agent.model_check()
         if simple_model:
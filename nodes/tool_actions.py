@@ -0,0 +1,97 @@
+import contextvars
+import os
+import threading
+import weakref
+
+from .concurrency import ProviderLimits, map_ordered
+
+# Run the independent actions the model asks for in one step at the same time.
+PARALLEL_TOOL_ACTIONS = os.getenv("GRIPTAPE_PARALLEL_TOOL_ACTIONS", "1").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Maximum number of actions running at once within one step.
+TOOL_ACTION_WORKERS = int(os.getenv("GRIPTAPE_TOOL_ACTION_WORKERS", "8"))
+# Maximum number of actions running at once per tool, across all runs. Override
+# a single tool with e.g. GRIPTAPE_TOOL_CONCURRENCY_WEBSCRAPER=2.
+TOOL_CONCURRENCY = int(os.getenv("GRIPTAPE_TOOL_CONCURRENCY", "4"))
+# Tools that are never run concurrently with themselves. An agent converted to
+# a tool is a single Agent object, so its runs have to take turns.
+SERIAL_TOOLS = {
+    name.strip().lower()
+    for name in os.getenv("GRIPTAPE_SERIAL_TOOLS", "StructureRunClient").split(",")
+    if name.strip()
+}
+
+
+# The tools whose limit the current action holds. Context variables carry over
+# to the worker threads of nested runs (an agent used as a tool running its own
+# actions), so a nested action on the same tool doesn't wait for its caller.
+_held_tools = contextvars.ContextVar("griptape_held_tools", default=frozenset())
+
+
+def tool_name(tool) -> str:
+    return type(tool).__name__.lower()
+
+
+class ToolLimits(ProviderLimits):
+    """
+    One semaphore per tool object, sized by the tool's class. Two agents
+    converted to tools are separate objects and don't wait for each other.
+    """
+
+    def limit(self, name) -> int:
+        if name in SERIAL_TOOLS:
+            return 1
+        return super().limit(name)
+
+    def semaphore(self, tool):
+        key = id(tool)
+        with self._lock:
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.BoundedSemaphore(
+                    max(1, self.limit(tool_name(tool)))
+                )
+                # Dropped with the tool, so a new tool reusing its id starts afresh.
+                weakref.finalize(tool, self._semaphores.pop, key, None)
+            return self._semaphores[key]
+
+
+tool_limits = ToolLimits(TOOL_CONCURRENCY, "GRIPTAPE_TOOL_CONCURRENCY")
+
+
+def run_limited(subtask, action):
+    tool = action.tool
+    held = _held_tools.get()
+    if tool is None or id(tool) in held:
+        return subtask.execute_action(action)
+    semaphore = tool_limits.acquire(tool)
+    token = _held_tools.set(held | {id(tool)})
+    try:
+        return subtask.execute_action(action)
+    finally:
+        _held_tools.reset(token)
+        semaphore.release()
+
+
+def execute_actions(subtask, actions):
+    """
+    Replacement for ActionsSubtask.execute_actions.
+
+    griptape starts an unbounded thread pool for every step and collects the
+    results by tag, so two actions with the same tag lose one output. Here the
+    actions run on at most TOOL_ACTION_WORKERS threads, each tool object
+    within its own limit, and the results come back in the order the model
+    asked for them. The workers keep the run's cancel token.
+    """
+    if not PARALLEL_TOOL_ACTIONS or len(actions) < 2:
+        return [run_limited(subtask, action) for action in actions]
+
+    results = map_ordered(
+        lambda action: run_limited(subtask, action), actions, TOOL_ACTION_WORKERS
+    )
+    for _, error, _ in results:
+        if error is not None:
+            raise error
+    return [result for result, _, _ in results]
@@ -1,5 +1,7 @@
 from griptape.tools import BaseTool
 
+from ..fingerprint import input_fingerprint
+
 
 class gtUIBaseTool:
     """
@@ -17,6 +19,10 @@ class gtUIBaseTool:
             "hidden": {},
         }
 
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return input_fingerprint(kwargs)
+
     RETURN_TYPES = ("TOOL_LIST",)
     RETURN_NAMES = ("TOOL",)
     FUNCTION = "create"
@@ -0,0 +1,344 @@
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+import urllib.request
+
+# Tracing is opt-in: set GRIPTAPE_TRACING=1 to write spans to
+# <ComfyUI output>/griptape_traces/traces.jsonl (or GRIPTAPE_TRACE_DIR).
+TRACING_ENABLED = os.getenv("GRIPTAPE_TRACING", "0").lower() in ("1", "true", "yes")
+TRACE_DIR = os.getenv("GRIPTAPE_TRACE_DIR", "")
+TRACE_FILE_MAX_MB = float(os.getenv("GRIPTAPE_TRACE_FILE_MAX_MB", "10"))
+TRACE_FILE_BACKUPS = int(os.getenv("GRIPTAPE_TRACE_FILE_BACKUPS", "5"))
+# Also send spans to an OTLP/HTTP collector, e.g. http://localhost:4318
+TRACE_OTLP_ENDPOINT = os.getenv("GRIPTAPE_TRACE_OTLP_ENDPOINT", "")
+SERVICE_NAME = "comfyui-griptape"
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_current_span = contextvars.ContextVar("griptape_span", default=None)
+
+
+def default_trace_dir():
+    if TRACE_DIR:
+        return TRACE_DIR
+    try:
+        import folder_paths
+
+        return os.path.join(folder_paths.get_output_directory(), "griptape_traces")
+    except ImportError:
+        return os.path.join(THIS_DIR, "..", ".cache", "traces")
+
+
+class Span:
+    """A span in the OpenTelemetry data model. Times are in nanoseconds."""
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "name",
+        "start_time",
+        "end_time",
+        "attributes",
+        "status",
+        "status_message",
+    )
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent else None
+        self.name = name
+        self.start_time = time.time_ns()
+        self.end_time = None
+        self.attributes = dict(attributes or {})
+        self.status = "UNSET"
+        self.status_message = ""
+
+    def set(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_error(self, message):
+        self.status = "ERROR"
+        self.status_message = str(message)[:500]
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_time,
+            "end_time_unix_nano": self.end_time,
+            "duration_ms": round((self.end_time - self.start_time) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+        }
+
+
+class _NoSpan:
+    """Stands in for a span while tracing is off."""
+
+    def set(self, key, value):
+        pass
+
+    def set_error(self, message):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class JsonlExporter:
+    """Appends one span per line, rotating the file past TRACE_FILE_MAX_MB."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "traces.jsonl")
+        self._handler = logging.handlers.RotatingFileHandler(
+            self.path,
+            maxBytes=int(TRACE_FILE_MAX_MB * 1024 * 1024),
+            backupCount=TRACE_FILE_BACKUPS,
+            encoding="UTF-8",
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def export(self, span):
+        record = logging.makeLogRecord(
+            {"msg": json.dumps(span.to_dict(), default=str), "levelno": logging.INFO}
+        )
+        self._handler.handle(record)
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpExporter:
+    """Sends spans in batches to an OTLP/HTTP (JSON) collector from a background thread."""
+
+    STATUS_CODES = {"UNSET": 0, "OK": 1, "ERROR": 2}
+
+    def __init__(self, endpoint, interval=2.0, max_batch=512):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.interval = interval
+        self.max_batch = max_batch
+        self._queue = queue.Queue(maxsize=10000)
+        self._failed = False
+        threading.Thread(
+            target=self._worker, name="griptape-otlp", daemon=True
+        ).start()
+
+    def export(self, span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass
+
+    def _encode(self, span):
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_time),
+            "endTimeUnixNano": str(span.end_time),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in span.attributes.items()
+            ],
+            "status": {
+                "code": self.STATUS_CODES[span.status],
+                "message": span.status_message,
+            },
+        }
+        if span.parent_span_id:
+            encoded["parentSpanId"] = span.parent_span_id
+        return encoded
+
+    def _send(self, spans):
+        body = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": _otlp_value(SERVICE_NAME)}
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [self._encode(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            urllib.request.urlopen(request, timeout=10).close()
+            self._failed = False
+        except Exception as e:
+            # Report the first failure only, not one per batch.
+            if not self._failed:
+                print(f"   \033[33m- Could not export traces to {self.url}: {e}\033[0m")
+            self._failed = True
+
+    def _worker(self):
+        while True:
+            spans = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(spans) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    spans.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._send(spans)
+
+
+class Tracer:
+    """
+    Records nested spans. The current span is kept in a context variable, and
+    the worker pools in cancellation.py run work in a copy of the submitting
+    context, so spans started on a worker thread keep their parent.
+    """
+
+    def __init__(self, enabled=TRACING_ENABLED):
+        self.enabled = enabled
+        self._exporters = None
+        self._lock = threading.Lock()
+
+    @property
+    def exporters(self):
+        if self._exporters is None:
+            with self._lock:
+                if self._exporters is None:
+                    exporters = [JsonlExporter(default_trace_dir())]
+                    if TRACE_OTLP_ENDPOINT:
+                        exporters.append(OtlpExporter(TRACE_OTLP_ENDPOINT))
+                    self._exporters = exporters
+        return self._exporters
+
+    @contextlib.contextmanager
+    def span(self, name, **attributes):
+        if not self.enabled:
+            yield NO_SPAN
+            return
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_time = time.time_ns()
+            if span.status == "UNSET":
+                span.status = "OK"
+            for exporter in self.exporters:
+                try:
+                    exporter.export(span)
+                except Exception as e:
+                    print(f"   \033[33m- Could not export span: {e}\033[0m")
+
+
+tracer = Tracer()
+
+
+def _driver_attributes(driver):
+    from .concurrency import provider_name
+
+    return {
+        "provider": provider_name(driver),
+        "model": str(getattr(driver, "model", None) or ""),
+    }
+
+
+def _artifact_bytes(artifact):
+    value = getattr(artifact, "value", None)
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    return None
+
+
+def prompt_middleware(driver, prompt_stack, call_next):
+    """Prompt driver middleware - see driver_hooks."""
+    with tracer.span("prompt", **_driver_attributes(driver)) as span:
+        span.set("stream", bool(getattr(driver, "stream", False)))
+        span.set("messages", len(prompt_stack.messages))
+        message = call_next(prompt_stack)
+        usage = getattr(message, "usage", None)
+        if usage is not None:
+            span.set("input_tokens", usage.input_tokens)
+            span.set("output_tokens", usage.output_tokens)
+        span.set("output_bytes", len(message.to_text()))
+        return message
+
+
+def call_middleware(driver, method, args, call_next):
+    """Driver call middleware - see driver_hooks."""
+    with tracer.span(method, **_driver_attributes(driver)) as span:
+        result = call_next()
+        if isinstance(result, list):
+            span.set("results", len(result))
+        else:
+            span.set("output_bytes", _artifact_bytes(result))
+        return result
+
+
+def _trace_task_execute(execute):
+    @functools.wraps(execute)
+    def traced(self):
+        with tracer.span(f"task.{type(self).__name__}", task_id=self.id) as span:
+            output = execute(self)
+            if type(output).__name__ == "ErrorArtifact":
+                span.set_error(output.value)
+            span.set("output_bytes", _artifact_bytes(output))
+            return output
+
+    return traced
+
+
+def _trace_tool_execute(execute):
+    @functools.wraps(execute)
+    def traced(self, activity, subtask, action):
+        name = f"tool.{self.name}.{getattr(activity, 'name', action.path)}"
+        with tracer.span(name, tool=type(self).__name__) as span:
+            output = execute(self, activity, subtask, action)
+            if type(output).__name__ == "ErrorArtifact":
+                span.set_error(output.value)
+            span.set("output_bytes", _artifact_bytes(output))
+            return output
+
+    return traced
+
+
+def install_tracing():
+    """Adds task and tool spans. Driver spans come from the middleware above."""
+    from griptape.tasks import BaseTask
+    from griptape.tools import BaseTool
+
+    BaseTask.execute = _trace_task_execute(BaseTask.execute)
+    BaseTool.execute = _trace_tool_execute(BaseTool.execute)
@@ -1,7 +1,9 @@
 import base64
+import os
 import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
-from urllib.parse import urlparse, urlunparse
 
 import numpy as np
 import requests
@@ -10,6 +12,14 @@ import torchaudio
 from jinja2 import Template
 from PIL import Image, ImageOps, ImageSequence
 
+from .image_codec import encode_images
+from .model_discovery import (
+    CONNECT_TIMEOUT,
+    TOTAL_TIMEOUT,
+    get_models_url,
+    parse_models,
+)
+
 
 def to_pascal_case(string):
     # First, replace any non-word character with a space
@@ -22,41 +32,13 @@ def to_pascal_case(string):
     return "".join(word.capitalize() for word in words)
 
 
-def construct_base_url(base_url: str, port: int) -> str:
-    # Parse the base_url
-    parsed_url = urlparse(base_url)
-
-    # If there's no scheme (http:// or https://), add http://
-    if not parsed_url.scheme:
-        parsed_url = parsed_url._replace(scheme="http")
-
-    # Replace the port
-    parsed_url = parsed_url._replace(netloc=f"{parsed_url.hostname}:{port}")
-
-    # Reconstruct the URL without any path
-    return urlunparse(parsed_url._replace(path=""))
-
-
 def get_models(engine, base_url, port) -> list[str]:
-    reconstructed_base_url = construct_base_url(base_url, port)
-
-    if engine == "ollama":
-        api_url = f"{reconstructed_base_url}/api/tags"
-    elif engine == "lmstudio":
-        api_url = f"{reconstructed_base_url}/v1/models"
-    else:
-        raise ValueError(f"Unsupported engine: {engine}")
+    api_url = get_models_url(engine, base_url, port)
 
     try:
-        response = requests.get(api_url)
+        response = requests.get(api_url, timeout=(CONNECT_TIMEOUT, TOTAL_TIMEOUT))
         response.raise_for_status()
-
-        if engine == "ollama":
-            models = [model["name"] for model in response.json().get("models", [])]
-        else:  # lmstudio
-            models = [model["id"] for model in response.json().get("data", [])]
-
-        return models
+        return parse_models(engine, response.json())
     except Exception as e:
         print(f"Failed to fetch models from {engine.capitalize()}: {e}")
         return []
@@ -67,58 +49,119 @@ def get_prompt_text(string_prompt, input_string):
     return template.render(input_string=input_string)
 
 
-def image_path_to_output(image_path):
-    img = Image.open(image_path)
-    output_images = []
-    output_masks = []
-    for i in ImageSequence.Iterator(img):
-        i = ImageOps.exif_transpose(i)
-        if i.mode == "I":
-            i = i.point(lambda i: i * (1 / 255))
-        image = i.convert("RGB")
-        image = np.array(image).astype(np.float32) / 255.0
-        image = torch.from_numpy(image)[None,]
-        if "A" in i.getbands():
-            mask = np.array(i.getchannel("A")).astype(np.float32) / 255.0
-            mask = 1.0 - torch.from_numpy(mask)
-        else:
-            mask = torch.zeros((64, 64), dtype=torch.float32, device="cpu")
-        output_images.append(image)
-        output_masks.append(mask.unsqueeze(0))
-
-    if len(output_images) > 1:
-        output_image = torch.cat(output_images, dim=0)
-        output_mask = torch.cat(output_masks, dim=0)
-    else:
-        output_image = output_images[0]
-        output_mask = output_masks[0]
+# Integer modes PIL uses for 16 and 32 bit images.
+_INTEGER_MODES = ("I", "I;16", "I;16B", "I;16L", "I;16N")
+
+
+def _frame_to_rgb(frame):
+    """A frame as a (height, width, 3) or (height, width) array in 0-255."""
+    if frame.mode in _INTEGER_MODES:
+        # Same scaling as ComfyUI's LoadImage (i * 1/255, clipped to 8 bits),
+        # done on the whole array instead of through a per-pixel lambda.
+        return np.clip(np.array(frame, dtype=np.float32) / 255.0, 0.0, 255.0)
+    return np.array(frame.convert("RGB"))
+
+
+def pil_to_output(img):
+    """
+    An IMAGE and MASK from every frame of an opened PIL image.
+
+    The frame count is read up front, so the image and mask tensors are
+    allocated once and each frame is decoded straight into its slice, instead
+    of building a tensor per frame and concatenating them (twice the memory).
+    Frames with a different size than the first are skipped, as in LoadImage.
+    """
+    count = getattr(img, "n_frames", 1)
+    output_image = None
+    output_mask = None
+    has_alpha = False
+    index = 0
+    for frame in ImageSequence.Iterator(img):
+        frame = ImageOps.exif_transpose(frame)
+        if output_image is None:
+            width, height = frame.size
+            output_image = torch.empty((count, height, width, 3), dtype=torch.float32)
+            # Only images with alpha get a full size mask, like LoadImage.
+            output_mask = torch.zeros((count, 64, 64), dtype=torch.float32)
+        elif frame.size != (width, height):
+            continue
+
+        pixels = torch.from_numpy(_frame_to_rgb(frame))
+        if pixels.ndim == 2:
+            pixels = pixels[..., None]
+        output_image[index].copy_(pixels)
+
+        if "A" in frame.getbands():
+            if not has_alpha:
+                # Masks hold alpha until the end; 255 (opaque) gives mask 0.
+                output_mask = torch.full((count, height, width), 255.0)
+                has_alpha = True
+            alpha = np.array(frame.getchannel("A"))
+            output_mask[index].copy_(torch.from_numpy(alpha))
+        index += 1
+
+    output_image = output_image[:index].div_(255.0)
+    output_mask = output_mask[:index]
+    if has_alpha:
+        output_mask.div_(-255.0).add_(1.0)
     return (output_image, output_mask)
 
 
-def convert_tensor_batch_to_base_64(image_batch):
-    if isinstance(image_batch, torch.Tensor):
-        # Ensure it's on CPU
-        image_batch = image_batch.cpu()
+def image_path_to_output(image_path):
+    with Image.open(image_path) as img:
+        return pil_to_output(img)
+
 
-        # If it's a 3D tensor, add a batch dimension
-        if image_batch.dim() == 3:
-            image_batch = image_batch.unsqueeze(0)
+def image_to_comfyui(image_bytes):
+    """Decodes an ImageArtifact's value straight from memory to an IMAGE and MASK."""
+    with Image.open(BytesIO(image_bytes)) as img:
+        return pil_to_output(img)
 
-        # Permute dimensions if necessary (from B, C, H, W to B, H, W, C)
-        if image_batch.shape[1] < image_batch.shape[3]:
-            image_batch = image_batch.permute(0, 2, 3, 1)
 
-        # Scale to 0-255 and convert to uint8
-        image_batch = (255.0 * image_batch).clamp(0, 255).numpy().astype(np.uint8)
+_file_writer = None
+_file_writer_lock = threading.Lock()
 
-        base64_images = []
-        for img_array in image_batch:
-            img = Image.fromarray(img_array)
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
-            base64_images.append(base64_image)
 
+def write_file_async(path, data) -> Future:
+    """Writes bytes to path on a background thread."""
+    global _file_writer
+    with _file_writer_lock:
+        if _file_writer is None:
+            _file_writer = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="griptape-write"
+            )
+
+    def write():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    return _file_writer.submit(write)
+
+
+def output_connected(prompt, unique_id, index) -> bool:
+    """
+    Whether output number index of node unique_id is linked to another node in
+    the prompt graph. Returns True when the graph isn't available.
+    """
+    if not prompt or unique_id is None:
+        return True
+    for node in prompt.values():
+        for value in node.get("inputs", {}).values():
+            if (
+                isinstance(value, list)
+                and len(value) == 2
+                and str(value[0]) == str(unique_id)
+                and value[1] == index
+            ):
+                return True
+    return False
+
+
+def convert_tensor_batch_to_base_64(image_batch):
+    if isinstance(image_batch, torch.Tensor):
+        base64_images = convert_tensor_to_base_64(image_batch)
         print(f"Converted {len(base64_images)} images to base64")
         return base64_images
     else:
@@ -146,35 +189,10 @@ def load_audio_from_artifact(audio_artifact):
 
 
 def convert_tensor_to_base_64(image):
+    # Prefer image_codec.encode_images, which skips the base64 round trip.
     if not isinstance(image, torch.Tensor):
         raise TypeError("Input must be a PyTorch tensor")
-
-    # Ensure it's on CPU
-    image = image.cpu()
-
-    # Handle different tensor shapes
-    if image.dim() == 2:  # Single channel image
-        image = image.unsqueeze(0).unsqueeze(0)  # Add batch and channel dims
-    elif image.dim() == 3:  # Single image with channels
-        image = image.unsqueeze(0)  # Add batch dim
-    elif image.dim() == 4:  # Batch of images or complex structure
-        pass  # Already in the right format
-    else:
-        raise ValueError(f"Unexpected tensor shape: {image.shape}")
-
-    # Permute dimensions if necessary (from B, C, H, W to B, H, W, C)
-    if image.shape[1] < image.shape[3]:
-        image = image.permute(0, 2, 3, 1)
-
-    # Scale to 0-255 and convert to uint8
-    image = (255.0 * image).clamp(0, 255).to(torch.uint8).numpy()
-
-    base64_images = []
-    for img_array in image.reshape(-1, *image.shape[-3:]):
-        img = Image.fromarray(img_array)
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
-        base64_images.append(base64_image)
-
-    return base64_images
+    return [
+        base64.b64encode(artifact.value).decode("utf-8")
+        for artifact in encode_images(image, format="png")
+    ]
@@ -1,5 +1,10 @@
+import copy
+import hashlib
 import json
 import os
+import re
+import tempfile
+import threading
 
 # Constants for file paths
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -8,18 +13,21 @@ DEFAULT_CONFIG_FILE = os.path.join(PARENT_DIR, "griptape_config.json.default")
 USER_CONFIG_FILE = os.path.join(PARENT_DIR, "griptape_config.json")
 
 
-def load_json_file(file_path):
+def load_json_file(file_path, strip_comments=False):
     """
     Safely load a JSON file, returning an empty dictionary if the file does not exist or is invalid.
+    With strip_comments, // comments are removed first.
     """
     if not os.path.exists(file_path):
         print(f"File not found: {file_path}")
         return {}
 
     try:
-        with open(file_path, "r") as file:
-            data = json.load(file)
-            return data
+        with open(file_path, "r", encoding="UTF-8") as file:
+            text = file.read()
+        if strip_comments:
+            text = re.sub(r"(?:^|\s)//.*", "", text, flags=re.MULTILINE)
+        return json.loads(text)
     except FileNotFoundError:
         print(f"File not found: {file_path}")
     except json.JSONDecodeError as e:
@@ -67,12 +75,120 @@ def update_config_with_env(config):
                 print(f"Updated {key} from environment variable.")
 
 
+def atomic_write_json(data, file_path, **dump_kwargs):
+    """
+    Write JSON to a temp file next to file_path and rename it into place, so
+    readers never see a half-written file.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".griptape_config.")
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, **dump_kwargs)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class ConfigStore:
+    """
+    Process-wide, in-memory copy of a JSON config file.
+
+    The file is only re-read when its mtime, inode or size changes, and objects
+    built from a config value (e.g. a BaseStructureConfig) are cached against a
+    hash of that value.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._data = {}
+        self._materialized = {}
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+    def data(self):
+        """
+        Return the parsed config. Treat it as read-only - use update() to change it.
+        """
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    # griptape_config.json may have // comments in it.
+                    self._data = (
+                        load_json_file(self.file_path, strip_comments=True)
+                        if stamp
+                        else {}
+                    )
+                    self._stamp = stamp
+        return self._data
+
+    def get(self, key, default=None):
+        """
+        Retrieve a copy of the value at a dot-separated key path.
+        """
+        config = self.data()
+        for part in key.split("."):
+            if isinstance(config, dict) and part in config:
+                config = config[part]
+            else:
+                return default
+        return copy.deepcopy(config)
+
+    def write(self, data):
+        with self._lock:
+            atomic_write_json(data, self.file_path, indent=4)
+            self._data = copy.deepcopy(data)
+            self._stamp = self._file_stamp()
+
+    def update(self, update_fn):
+        """
+        Apply update_fn to a copy of the config and write the result.
+        """
+        with self._lock:
+            data = copy.deepcopy(self.data())
+            update_fn(data)
+            self.write(data)
+            return data
+
+    def materialize(self, key, factory):
+        """
+        Return factory(value) for the value at key, reusing the previous result
+        while the value is unchanged.
+        """
+        value = self.get(key)
+        if not value:
+            return None
+        digest = hashlib.sha256(
+            json.dumps(value, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            cached = self._materialized.get(key)
+            if cached is None or cached[0] != digest:
+                cached = (digest, factory(value))
+                self._materialized[key] = cached
+        return cached[1]
+
+
+config_store = ConfigStore(USER_CONFIG_FILE)
+
+
 def save_config(config, file_path):
     """
     Save a configuration dictionary to a JSON file.
     """
-    with open(file_path, "w") as file:
-        json.dump(config, file, indent=4)
+    if os.path.abspath(file_path) == os.path.abspath(USER_CONFIG_FILE):
+        config_store.write(config)
+    else:
+        atomic_write_json(config, file_path, indent=4)
 
 
 def load_and_prepare_config(default_file, user_file):
@@ -81,7 +197,7 @@ def load_and_prepare_config(default_file, user_file):
     """
     print("   \033[34m- Loading configuration\033[0m")
     default_config = load_json_file(default_file)
-    user_config = load_json_file(user_file)
+    user_config = load_json_file(user_file, strip_comments=True)
     final_config = merge_configs(default_config, user_config)
     update_config_with_env(final_config)
     save_config(final_config, user_file)
@@ -102,24 +218,8 @@ def get_config(key, default=None):
     """
     Retrieve a configuration value using a dot-separated key path from the user config file.
     """
-    config = load_json_file(USER_CONFIG_FILE)
-    parts = key.split(".")
-    for part in parts:
-        if part in config:
-            config = config[part]
-        else:
-            return default
-    return config
+    return config_store.get(key, default)
 
 
 def update_config_with_dict(config_dict={}):
-    with open(USER_CONFIG_FILE, "r") as file:
-        existing_data = json.load(file)
-
-    agent_config = {"agent_config": config_dict}
-    existing_data.update(agent_config)
-
-    with open(USER_CONFIG_FILE, "w") as file:
-        json.dump(
-            existing_data, file, indent=4
-        )  # Use indent=4 for pretty formatting, optional
+    config_store.update(lambda data: data.update({"agent_config": config_dict}))
@@ -0,0 +1,316 @@
+"""
+Offline end-to-end benchmark of the Griptape nodes.
+
+    python scripts/benchmark.py [--comfyui PATH] [--latency-ms 200]
+        [--runs 5] [--concurrency 1 4 8] [--output results.json]
+        [--compare previous.json]
+
+The real node classes are run against a local stub of the OpenAI API that
+answers chat, embedding, image and speech requests after a fixed latency,
+so no API key or network access is needed. For every node this reports:
+
+  - overhead: node wall time minus the time the stub spent answering,
+  - peak Python memory (tracemalloc) over the sequential runs,
+  - throughput with N runs in flight at once,
+
+and writes everything as JSON so results can be compared across versions.
+Run it with the Python environment ComfyUI uses; by default ComfyUI is
+expected three directories up (ComfyUI/custom_nodes/<this repo>/scripts).
+The vector store nodes count tokens with tiktoken, whose encodings must
+already be cached (see TIKTOKEN_CACHE_DIR) when running without network.
+"""
+
+import argparse
+import importlib
+import importlib.metadata
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(THIS_DIR)
+DEFAULT_COMFYUI_DIR = os.path.abspath(os.path.join(REPO_DIR, "..", ".."))
+PACKAGE = "griptape_nodes_benchmark"
+
+# The stub OpenAI server is shared with the tests.
+sys.path.insert(0, os.path.join(REPO_DIR, "tests"))
+from stub_openai import StubOpenAiServer  # noqa: E402
+
+
+def load_package(comfyui_dir):
+    """Makes the repo importable as a package without running its __init__,
+    which registers routes on a running ComfyUI server."""
+    if comfyui_dir and os.path.isdir(comfyui_dir) and comfyui_dir not in sys.path:
+        sys.path.insert(0, comfyui_dir)
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [REPO_DIR]
+    package.__file__ = os.path.join(REPO_DIR, "__init__.py")
+    sys.modules[PACKAGE] = package
+
+
+def node_class(target):
+    module, class_name = target.split(":")
+    return getattr(importlib.import_module(f"{PACKAGE}.nodes.{module}"), class_name)
+
+
+class Scenario:
+    def __init__(self, name, setup):
+        self.name = name
+        # setup() returns run(i), the function that runs the node once.
+        self.setup = setup
+
+
+def build_scenarios():
+    def openai_config():
+        config_node = node_class("config.gtUIOpenAiStructureConfig:gtUIOpenAiStructureConfig")
+        return config_node().create(prompt_model="gpt-4o-mini", temperature=0.7)[0]
+
+    def agent():
+        create_agent = node_class("agent.CreateAgent:CreateAgent")
+        return create_agent().run(config=openai_config())[1]
+
+    def create_agent():
+        node = node_class("agent.CreateAgent:CreateAgent")
+        config = openai_config()
+        return lambda i: node().run(config=config, STRING=f"Say hello #{i}")
+
+    def prompt_task():
+        node = node_class("tasks.gtUIPromptTask:gtUIPromptTask")
+        base = agent()
+        return lambda i: node().run(STRING=f"Summarize item {i}", agent=base)
+
+    def image_query_task():
+        import torch
+
+        node = node_class("tasks.gtUIImageQueryTask:gtUIImageQueryTask")
+        base = agent()
+        image = torch.rand(1, 256, 256, 3)
+        return lambda i: node().run(STRING=f"Describe image {i}", image=image, agent=base)
+
+    def vector_store_upsert_task():
+        node = node_class("tasks.gtUIVectorStoreUpsertTextTask:gtUIVectorStoreUpsertTextTask")
+        base = agent()
+        text = " ".join(f"Sentence number {n} about griptape nodes." for n in range(40))
+        return lambda i: node().run(agent=base, input=f"{text} Run {i}.", namespace="bench")
+
+    def vector_store_query_task():
+        upsert = node_class("tasks.gtUIVectorStoreUpsertTextTask:gtUIVectorStoreUpsertTextTask")
+        node = node_class("tasks.gtUIVectorStoreQueryTask:gtUIVectorStoreQueryTask")
+        base = agent()
+        upsert().run(agent=base, input="Griptape nodes for ComfyUI. " * 50, namespace="bench")
+        return lambda i: node().run(agent=base, STRING=f"query {i}", count=3, namespace="bench")
+
+    def text_to_speech_task():
+        node = node_class("tasks.gtUITextToSpeechTask:gtUITextToSpeechTask")
+        base = agent()
+        return lambda i: node().run(STRING=f"Read sentence {i} aloud.", agent=base)
+
+    return [
+        Scenario("CreateAgent", create_agent),
+        Scenario("gtUIPromptTask", prompt_task),
+        Scenario("gtUIImageQueryTask", image_query_task),
+        Scenario("gtUIVectorStoreUpsertTextTask", vector_store_upsert_task),
+        Scenario("gtUIVectorStoreQueryTask", vector_store_query_task),
+        Scenario("gtUITextToSpeechTask", text_to_speech_task),
+    ]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def check_output(result):
+    # Nodes report most failures as text rather than raising.
+    first = result[0] if isinstance(result, tuple) and result else result
+    if isinstance(first, str) and first.startswith(("Error", "OpenAI Error")):
+        raise RuntimeError(first)
+
+
+def run_scenario(scenario, server, runs, concurrency_levels):
+    run = scenario.setup()
+    check_output(run(-1))  # warm up: imports, clients, connection pools
+
+    overheads, walls, provider = [], [], []
+    for i in range(runs):
+        start = time.perf_counter()
+        check_output(run(i))
+        end = time.perf_counter()
+        provider_seconds = server.provider_seconds(start, end)
+        walls.append(end - start)
+        provider.append(provider_seconds)
+        overheads.append(max(0.0, end - start - provider_seconds))
+
+    # Separate pass: tracemalloc slows everything down too much to time with it on.
+    tracemalloc.start()
+    for i in range(runs):
+        check_output(run(i))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    throughput = {}
+    for workers in concurrency_levels:
+        total = runs * workers
+        requests_before = server.request_count()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(run, range(total)):
+                check_output(result)
+        seconds = time.perf_counter() - start
+        throughput[str(workers)] = {
+            "runs": total,
+            "seconds": round(seconds, 4),
+            "runs_per_second": round(total / seconds, 3),
+            "provider_requests": server.request_count() - requests_before,
+        }
+
+    return {
+        "status": "ok",
+        "runs": runs,
+        "wall_ms": {
+            "mean": round(statistics.mean(walls) * 1000, 3),
+            "p50": round(percentile(walls, 0.5) * 1000, 3),
+            "p95": round(percentile(walls, 0.95) * 1000, 3),
+        },
+        "provider_ms_mean": round(statistics.mean(provider) * 1000, 3),
+        "overhead_ms": {
+            "mean": round(statistics.mean(overheads) * 1000, 3),
+            "p50": round(percentile(overheads, 0.5) * 1000, 3),
+            "p95": round(percentile(overheads, 0.95) * 1000, 3),
+        },
+        "peak_memory_mb": round(peak / (1024 * 1024), 3),
+        "throughput": throughput,
+    }
+
+
+def check_is_changed(server):
+    """
+    Queuing the same prompt twice must not reach the provider: IS_CHANGED has
+    to return the same value for the same inputs without calling any driver.
+    """
+    node = node_class("tasks.gtUIPromptTask:gtUIPromptTask")
+    before = server.request_count()
+    inputs = {"STRING": "Same prompt", "input_string": ""}
+    first, second = node.IS_CHANGED(**inputs), node.IS_CHANGED(**inputs)
+    return {"stable": first == second, "provider_requests": server.request_count() - before}
+
+
+def compare(previous, current):
+    print(f"\nCompared with {previous.get('timestamp')} ({previous.get('version')}):")
+    for name, result in current["scenarios"].items():
+        old = previous.get("scenarios", {}).get(name, {})
+        if result.get("status") != "ok" or old.get("status") != "ok":
+            continue
+        overhead = result["overhead_ms"]["mean"] - old["overhead_ms"]["mean"]
+        memory = result["peak_memory_mb"] - old["peak_memory_mb"]
+        print(f"  {name:<32} overhead {overhead:+9.2f} ms   peak memory {memory:+8.2f} MB")
+        for workers, values in result["throughput"].items():
+            if workers in old.get("throughput", {}):
+                change = values["runs_per_second"] - old["throughput"][workers]["runs_per_second"]
+                print(f"  {'':<32} x{workers:<3} throughput {change:+8.2f} runs/s")
+
+
+def git_version():
+    head = os.path.join(REPO_DIR, ".git", "HEAD")
+    try:
+        with open(head, encoding="UTF-8") as file:
+            ref = file.read().strip()
+        if ref.startswith("ref: "):
+            with open(os.path.join(REPO_DIR, ".git", ref[5:]), encoding="UTF-8") as file:
+                return file.read().strip()[:12]
+        return ref[:12]
+    except OSError:
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark of the Griptape nodes.")
+    parser.add_argument("--comfyui", default=DEFAULT_COMFYUI_DIR, help="ComfyUI directory")
+    parser.add_argument("--latency-ms", type=float, default=200, help="stub provider latency")
+    parser.add_argument("--runs", type=int, default=5, help="sequential runs per node")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--nodes", nargs="+", help="only run these scenarios")
+    parser.add_argument("--output", help="JSON file to write (default: stdout only)")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="hide griptape's INFO logs (their cost is then not measured)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.quiet:
+        logging.disable(logging.INFO)
+
+    server = StubOpenAiServer(args.latency_ms / 1000)
+    os.environ["OPENAI_BASE_URL"] = server.url
+    os.environ["OPENAI_API_KEY"] = "stub"
+    # Every run sends a different prompt, but make sure nothing is served from
+    # the on-disk response cache.
+    os.environ["GRIPTAPE_RESPONSE_CACHE"] = "0"
+    load_package(args.comfyui)
+
+    results = {
+        "version": git_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "griptape": importlib.metadata.version("griptape"),
+        "settings": {
+            "quiet": args.quiet,
+            "latency_ms": args.latency_ms,
+            "runs": args.runs,
+            "concurrency": args.concurrency,
+        },
+        "scenarios": {},
+    }
+
+    for scenario in build_scenarios():
+        if args.nodes and scenario.name not in args.nodes:
+            continue
+        print(f"{scenario.name} ...", flush=True)
+        try:
+            result = run_scenario(scenario, server, args.runs, args.concurrency)
+        except ImportError as e:
+            result = {"status": "skipped", "reason": str(e)}
+        except Exception as e:
+            result = {"status": "failed", "reason": f"{type(e).__name__}: {e}"}
+        results["scenarios"][scenario.name] = result
+        if result["status"] == "ok":
+            print(
+                f"  overhead {result['overhead_ms']['mean']:.2f} ms, "
+                f"peak {result['peak_memory_mb']:.2f} MB, "
+                + ", ".join(
+                    f"x{workers}: {values['runs_per_second']:.2f} runs/s"
+                    for workers, values in result["throughput"].items()
+                )
+            )
+        else:
+            print(f"  {result['status']}: {result['reason']}")
+
+    try:
+        results["is_changed"] = check_is_changed(server)
+    except Exception as e:
+        results["is_changed"] = {"error": f"{type(e).__name__}: {e}"}
+    server.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nWrote {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+    if args.compare:
+        with open(args.compare, encoding="UTF-8") as file:
+            compare(json.load(file), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Benchmark of fetching a board of images from URLs against a local server.
+
+    python scripts/benchmark_fetch.py [--images 60] [--size 1024]
+        [--latency 0.1] [--concurrency 8] [--output results.json]
+
+The server serves distinct JPEGs with an ETag and Cache-Control: max-age, after
+--latency seconds. Compares the old Load: Image From URL path - a bare
+requests.get per URL, one after another, decoded in full - against
+image_fetch.ImageFetcher run concurrently the way Load: Images From URLs runs
+it: cold, with the cache fresh, and with every entry stale so each image is
+revalidated with a 304.
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from benchmark import PACKAGE, load_package
+
+
+def make_jpegs(count, size):
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32) / size
+    rng = np.random.default_rng(0)
+    images = []
+    for i in range(count):
+        frame = np.stack([(x * (i + 1)) % 1.0, y, (x + y) / 2], axis=-1)
+        frame = frame + rng.normal(0, 0.02, frame.shape).astype(np.float32)
+        buffer = BytesIO()
+        Image.fromarray((frame.clip(0, 1) * 255).astype(np.uint8)).save(
+            buffer, format="JPEG", quality=90
+        )
+        images.append(buffer.getvalue())
+    return images
+
+
+class ImageServer:
+    def __init__(self, images, latency, max_age=3600):
+        self.images = images
+        self.latency = latency
+        self.max_age = max_age
+        self.counts = {"200": 0, "304": 0}
+        self.sent_bytes = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                time.sleep(server.latency)
+                body = server.images[int(self.path.strip("/").split(".")[0])]
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with server._lock:
+                        server.counts["304"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Cache-Control", f"max-age={server.max_age}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                with server._lock:
+                    server.counts["200"] += 1
+                    server.sent_bytes += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", f"max-age={server.max_age}")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts), self.sent_bytes, self.connections
+
+
+def old_path(urls):
+    import requests
+
+    frames = []
+    for url in urls:
+        response = requests.get(url)
+        frames.append(np.array(Image.open(BytesIO(response.content)).convert("RGB")))
+    return frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", type=int, default=60)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", help="JSON file to write")
+    args = parser.parse_args(argv)
+
+    load_package(None)
+    image_fetch = importlib.import_module(f"{PACKAGE}.nodes.image_fetch")
+    concurrency = importlib.import_module(f"{PACKAGE}.nodes.concurrency")
+
+    server = ImageServer(make_jpegs(args.images, args.size), args.latency)
+    urls = [f"{server.url}/{i}.jpg" for i in range(args.images)]
+    cache_dir = tempfile.mkdtemp(prefix="griptape-fetch-")
+    fetcher = image_fetch.ImageFetcher(cache_dir=cache_dir)
+
+    def new_path(urls):
+        def fetch(url):
+            return image_fetch.decode_rgb(fetcher.fetch(url))
+
+        return concurrency.map_ordered(fetch, urls, args.concurrency)
+
+    def make_stale():
+        for key in fetcher._load_index():
+            meta = fetcher._read_meta(key)
+            meta["expires"] = 0
+            fetcher._write(key, meta)
+
+    cases = [
+        ("old: requests.get, serial", lambda: old_path(urls)),
+        ("fetcher, cold", lambda: new_path(urls)),
+        ("fetcher, cached", lambda: new_path(urls)),
+        ("fetcher, revalidated", lambda: (make_stale(), new_path(urls))),
+    ]
+    print(
+        f"{args.images} JPEGs of {args.size}x{args.size}, {args.latency * 1000:.0f} ms"
+        f" latency, {args.concurrency} at a time"
+    )
+    results = {}
+    try:
+        for name, fn in cases:
+            counts, sent, connections = server.snapshot()
+            start = time.perf_counter()
+            fn()
+            seconds = time.perf_counter() - start
+            after, sent_after, connections_after = server.snapshot()
+            results[name] = result = {
+                "seconds": round(seconds, 3),
+                "200": after["200"] - counts["200"],
+                "304": after["304"] - counts["304"],
+                "mb_sent": round((sent_after - sent) / 1e6, 2),
+                "connections": connections_after - connections,
+            }
+            print(
+                f"  {name:<28} {seconds:7.3f} s  {result['200']:3} x 200"
+                f"  {result['304']:3} x 304  {result['mb_sent']:6.2f} MB"
+                f"  {result['connections']:3} connections"
+            )
+        print(f"  {fetcher.stats()}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as file:
+            json.dump({"args": vars(args), "results": results}, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Micro-benchmark of image encoding before an image is sent to a provider.
+
+    python scripts/benchmark_image_codec.py [--frames 8] [--size 1024]
+        [--repeat 3] [--output results.json]
+
+Compares the old path - every frame encoded serially to PNG at PIL's
+default level, base64 encoded, then decoded again and reopened by
+ImageLoader - against image_codec.encode_images in each format, and with the
+frames downscaled to what OpenAI and Anthropic look at.
+"""
+
+import argparse
+import base64
+import importlib
+import json
+import os
+import sys
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from benchmark import PACKAGE, load_package
+
+
+def make_frames(count, size):
+    # Gradients plus mild noise compress like photos; pure noise would not.
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32) / size
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(count):
+        frame = np.stack(
+            [x * (i + 1) % 1.0, y, (x + y) / 2], axis=-1
+        ) + rng.normal(0, 0.02, (size, size, 3)).astype(np.float32)
+        frames.append(frame.clip(0, 1))
+    return np.stack(frames)
+
+
+def old_path(frames):
+    from griptape.loaders import ImageLoader
+
+    uint8 = (255.0 * frames).clip(0, 255).astype(np.uint8)
+    artifacts = []
+    for array in uint8:
+        buffer = BytesIO()
+        Image.fromarray(array).save(buffer, format="PNG")
+        encoded = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        artifacts.append(ImageLoader().load(base64.b64decode(encoded)))
+    return artifacts
+
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Image encoding micro-benchmark.")
+    parser.add_argument("--frames", type=int, default=8)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file to write")
+    args = parser.parse_args(argv)
+
+    load_package(None)
+    codec = importlib.import_module(f"{PACKAGE}.nodes.image_codec")
+    frames = make_frames(args.frames, args.size)
+
+    cases = {
+        "old: serial png level 6 + base64 round trip": lambda: old_path(frames),
+        f"png level {codec.PNG_COMPRESS_LEVEL}": lambda: codec.encode_images(
+            frames, format="png"
+        ),
+        "webp lossless": lambda: codec.encode_images(frames, format="webp"),
+        "webp quality 90": lambda: codec.encode_images(
+            frames, format="webp", quality=90
+        ),
+        "jpeg quality 90": lambda: codec.encode_images(
+            frames, format="jpeg", quality=90
+        ),
+    }
+    for provider in ("openai", "anthropic"):
+        limits = codec.PROVIDER_IMAGE_LIMITS[provider]
+        width, height = codec.fit_size(args.size, args.size, limits)
+        cases[f"png, downscaled for {provider} to {width}x{height}"] = (
+            lambda limits=limits: codec.encode_images(frames, limits=limits)
+        )
+
+    print(
+        f"{args.frames} x {args.size}x{args.size} frames, "
+        f"{codec.IMAGE_CODEC_WORKERS} encoder threads, {os.cpu_count()} CPUs"
+    )
+    results = {}
+    baseline = None
+    for name, fn in cases.items():
+        seconds, artifacts = best_of(args.repeat, fn)
+        baseline = baseline or seconds
+        size = sum(len(artifact.value) for artifact in artifacts)
+        results[name] = {
+            "seconds": round(seconds, 4),
+            "speedup": round(baseline / seconds, 2),
+            "bytes": size,
+        }
+        print(
+            f"  {name:<46} {seconds * 1000:9.1f} ms  x{baseline / seconds:5.2f}"
+            f"  {size / 1e6:8.2f} MB"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as file:
+            json.dump(
+                {
+                    "frames": args.frames,
+                    "size": args.size,
+                    "workers": codec.IMAGE_CODEC_WORKERS,
+                    "cpus": os.cpu_count(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Benchmark of Leonardo.AI generation polling against a local fake Leonardo API.
+
+    python scripts/benchmark_leonardo.py [--render 3 5 8 11] [--jobs 8]
+        [--output results.json]
+
+The fake server accepts generations, keeps each one PENDING for its render
+time (cycling through --render), then serves a small PNG. The same jobs are
+run at once through griptape's LeonardoImageGenerationDriver, which polls in
+a sleep loop, and through image_jobs.LeonardoImageGenerationDriver. For
+each it reports how long after the render finished every job returned, and
+how many requests reached the server.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+
+from benchmark import PACKAGE, load_package
+from fake_leonardo import FakeLeonardoServer
+
+
+def run_jobs(server, make_driver, jobs):
+    def run(_):
+        start = time.monotonic()
+        make_driver().try_text_to_image(prompts=["a lighthouse"])
+        return start, time.monotonic()
+
+    requests_before, connections_before = server.counts()
+    first = len(server.generations)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        timings = list(executor.map(run, range(jobs)))
+    requests_after, connections_after = server.counts()
+
+    # How long each job returned after its render finished.
+    ready = sorted(list(server.generations.values())[first:])
+    finished = sorted(end for _, end in timings)
+    late = [end - ready_at for end, ready_at in zip(finished, ready)]
+    return {
+        "wall_seconds": round(max(finished) - min(start for start, _ in timings), 2),
+        "mean_late_seconds": round(sum(late) / len(late), 2),
+        "max_late_seconds": round(max(late), 2),
+        "requests": requests_after - requests_before,
+        "connections": connections_after - connections_before,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--render", type=float, nargs="+", default=[3, 5, 8, 11])
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--output", help="JSON file to write")
+    args = parser.parse_args(argv)
+
+    load_package(None)
+    image_jobs = importlib.import_module(f"{PACKAGE}.nodes.image_jobs")
+    from griptape.drivers import LeonardoImageGenerationDriver
+
+    server = FakeLeonardoServer(args.render)
+    drivers = {
+        "griptape sleep loop": lambda: LeonardoImageGenerationDriver(
+            model="fake", api_key="fake", api_base=server.api_base, max_attempts=20
+        ),
+        "image_jobs": lambda: image_jobs.LeonardoImageGenerationDriver(
+            model="fake", api_key="fake", api_base=server.api_base
+        ),
+    }
+    print(f"{args.jobs} jobs at once, render times {args.render} s")
+    results = {}
+    for name, make_driver in drivers.items():
+        results[name] = result = run_jobs(server, make_driver, args.jobs)
+        print(
+            f"  {name:<20} wall {result['wall_seconds']:6.2f} s"
+            f"  late mean {result['mean_late_seconds']:5.2f} s"
+            f" max {result['max_late_seconds']:5.2f} s"
+            f"  {result['requests']:4} requests"
+            f"  {result['connections']:3} connections"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as file:
+            json.dump(
+                {"jobs": args.jobs, "render": args.render, "results": results},
+                file,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
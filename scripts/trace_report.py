@@ -0,0 +1,143 @@
+"""
+Summarizes the spans written with GRIPTAPE_TRACING=1.
+
+    python scripts/trace_report.py [traces.jsonl ...] [--last 5] [--trace ID]
+
+With no paths, reads traces.jsonl and its rotated backups from the trace
+directory (GRIPTAPE_TRACE_DIR, or ComfyUI's output/griptape_traces). For every
+run it prints the critical path - starting at the root span, the child that
+finished last at each level - followed by the total time per span name.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import defaultdict
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+COMFYUI_OUTPUT = os.path.join(THIS_DIR, "..", "..", "..", "output")
+
+
+def default_paths():
+    directory = os.getenv("GRIPTAPE_TRACE_DIR") or os.path.join(
+        COMFYUI_OUTPUT, "griptape_traces"
+    )
+    # traces.jsonl.5 is the oldest, traces.jsonl the newest.
+    paths = glob.glob(os.path.join(directory, "traces.jsonl.*"))
+    paths.sort(key=lambda path: int(path.rsplit(".", 1)[1]), reverse=True)
+    return paths + glob.glob(os.path.join(directory, "traces.jsonl"))
+
+
+def load_spans(paths):
+    traces = defaultdict(list)
+    for path in paths:
+        with open(path, encoding="UTF-8") as file:
+            for line in file:
+                try:
+                    span = json.loads(line)
+                except ValueError:
+                    continue
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+def label(span):
+    attributes = span.get("attributes", {})
+    details = [
+        f"{key}={attributes[key]}"
+        for key in ("provider", "model", "input_tokens", "output_tokens")
+        if attributes.get(key) not in (None, "")
+    ]
+    if span["status"]["code"] == "ERROR":
+        details.append("ERROR")
+    return span["name"] + (f" ({', '.join(details)})" if details else "")
+
+
+def critical_path(root, children):
+    path = [root]
+    while children.get(path[-1]["span_id"]):
+        path.append(
+            max(
+                children[path[-1]["span_id"]],
+                key=lambda span: span["end_time_unix_nano"],
+            )
+        )
+    return path
+
+
+def self_time_ms(span, children):
+    # Time not covered by any child, treating overlapping children as one.
+    covered = 0
+    cursor = span["start_time_unix_nano"]
+    for child in sorted(
+        children.get(span["span_id"], []), key=lambda s: s["start_time_unix_nano"]
+    ):
+        start = max(cursor, child["start_time_unix_nano"])
+        end = min(child["end_time_unix_nano"], span["end_time_unix_nano"])
+        if end > start:
+            covered += end - start
+            cursor = end
+    return max(0.0, span["duration_ms"] - covered / 1e6)
+
+
+def report_trace(spans, out):
+    ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    roots = []
+    for span in spans:
+        if span.get("parent_span_id") in ids:
+            children[span["parent_span_id"]].append(span)
+        else:
+            roots.append(span)
+
+    for root in sorted(roots, key=lambda span: span["start_time_unix_nano"]):
+        out.write(
+            f"\nTrace {root['trace_id']}: {label(root)} {root['duration_ms']:.1f} ms, "
+            f"{len(spans)} spans\n"
+        )
+        out.write("  Critical path:\n")
+        for depth, span in enumerate(critical_path(root, children)):
+            out.write(
+                f"  {'  ' * depth}{label(span)}  {span['duration_ms']:.1f} ms "
+                f"(self {self_time_ms(span, children):.1f} ms)\n"
+            )
+
+    totals = defaultdict(lambda: [0, 0.0])
+    for span in spans:
+        totals[span["name"]][0] += 1
+        totals[span["name"]][1] += self_time_ms(span, children)
+    out.write("  Self time by span:\n")
+    for name, (count, ms) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        out.write(f"    {name:<50} {count:>5} x {ms:>10.1f} ms\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="trace files (default: trace dir)")
+    parser.add_argument("--last", type=int, default=5, help="number of runs to show")
+    parser.add_argument("--trace", help="show only this trace id")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or default_paths()
+    if not paths:
+        print("No trace files found. Set GRIPTAPE_TRACING=1 and run a workflow.")
+        return 1
+    traces = load_spans(paths)
+    if args.trace:
+        selected = [traces.get(args.trace, [])]
+    else:
+        ordered = sorted(
+            traces.values(),
+            key=lambda spans: min(span["start_time_unix_nano"] for span in spans),
+        )
+        selected = ordered[-args.last :]
+    for spans in selected:
+        if spans:
+            report_trace(spans, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Run with `pytest tests` from the repo root. (`python -m pytest` puts the repo
+root on sys.path, where its py/ directory shadows the py package pytest uses.)
+
+The repo is imported as a package without running its __init__, which
+registers nodes and routes on a running ComfyUI server. Tests that need
+ComfyUI or torch skip themselves when those aren't importable.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+import pytest
+from attrs import Factory, define, field
+from griptape.artifacts import TextArtifact
+from griptape.common import Message, PromptStack, TextMessageContent
+from griptape.config import StructureConfig
+from griptape.drivers import BasePromptDriver
+from griptape.tokenizers import BaseTokenizer, SimpleTokenizer
+from stub_openai import StubOpenAiServer
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+PACKAGE = "griptape_nodes_tests"
+
+
+def load_package():
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [REPO_DIR]
+        package.__file__ = os.path.join(REPO_DIR, "__init__.py")
+        sys.modules[PACKAGE] = package
+    return sys.modules[PACKAGE]
+
+
+def import_module(name):
+    """import_module("nodes.model_discovery") imports the repo's module."""
+    load_package()
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+@define
+class StubPromptDriver(BasePromptDriver):
+    """Answers every prompt with the same text and records the prompts."""
+
+    model: str = field(default="stub", kw_only=True)
+    tokenizer: BaseTokenizer = field(
+        default=Factory(
+            lambda: SimpleTokenizer(
+                characters_per_token=4, max_input_tokens=8000, max_output_tokens=1000
+            )
+        ),
+        kw_only=True,
+    )
+    response: str = field(default="Stub response.", kw_only=True)
+    prompts: list = field(factory=list, kw_only=True)
+
+    def try_run(self, prompt_stack: PromptStack) -> Message:
+        self.prompts.append(prompt_stack.messages[-1].to_text())
+        return Message(
+            content=[TextMessageContent(TextArtifact(self.response))],
+            role=Message.ASSISTANT_ROLE,
+            usage=Message.Usage(input_tokens=10, output_tokens=3),
+        )
+
+    def try_stream(self, prompt_stack: PromptStack):
+        raise NotImplementedError
+
+
+def stub_config(**kwargs):
+    return StructureConfig(prompt_driver=StubPromptDriver(**kwargs))
+
+
+@pytest.fixture
+def openai_server():
+    """A local OpenAI-compatible server (see stub_openai) with no latency."""
+    server = StubOpenAiServer(0)
+    yield server
+    server.close()
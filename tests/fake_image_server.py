@@ -0,0 +1,91 @@
+"""
+A local image host for the image_fetch tests.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeImageServer:
+    """
+    Serves the bodies in `images` (path -> (body, headers)). A request whose
+    If-None-Match matches the ETag header is answered with a 304. Paths in
+    `chunked` are streamed without a Content-Length, and paths in
+    `not_modified` always get a 304, like a misbehaving cache in front of the
+    real server.
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.chunked = set()
+        self.not_modified = set()
+        # (path, status) of every request, in order.
+        self.requests = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body, headers = server.images[self.path]
+                etag = headers.get("ETag")
+                if self.path in server.not_modified or (
+                    etag and self.headers.get("If-None-Match") == etag
+                ):
+                    self.reply(304, headers, b"")
+                elif self.path in server.chunked:
+                    self.reply_chunked(headers, body)
+                else:
+                    self.reply(200, headers, body)
+
+            def reply(self, status, headers, body):
+                with server._lock:
+                    server.requests.append((self.path, status))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def reply_chunked(self, headers, body):
+                with server._lock:
+                    server.requests.append((self.path, 200))
+                self.send_response(200)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for start in range(0, len(body), 1024):
+                        chunk = body[start : start + 1024]
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    self.wfile.write(b"0\r\n\r\n")
+                except OSError:
+                    # The client gave up part way, which is what the size limit does.
+                    self.close_connection = True
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def add(self, path, body, **headers):
+        """add("/a.png", body, Cache_Control="max-age=60") - underscores become dashes."""
+        self.images[path] = (
+            body,
+            {name.replace("_", "-"): value for name, value in headers.items()},
+        )
+        return self.url + path
+
+    def statuses(self, path):
+        with self._lock:
+            return [status for seen, status in self.requests if seen == path]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
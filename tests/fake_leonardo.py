@@ -0,0 +1,109 @@
+"""
+A fake Leonardo.AI API for the tests and scripts/benchmark_leonardo.py.
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from stub_openai import _png
+
+
+class FakeLeonardoServer:
+    """
+    Answers the Leonardo REST endpoints the image generation driver uses.
+    Each generation stays PENDING for its render time (cycling through
+    render_seconds), then reports `status` and serves a small PNG.
+
+    Statuses added to `poll_failures` are answered, one per poll, instead.
+    """
+
+    def __init__(self, render_seconds):
+        self.render_seconds = list(render_seconds)
+        self.status = "COMPLETE"
+        self.poll_failures = []
+        self.generations = {}
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                with server._lock:
+                    server.requests += 1
+                    generation_id = uuid.uuid4().hex
+                    render = server.render_seconds[
+                        len(server.generations) % len(server.render_seconds)
+                    ]
+                    server.generations[generation_id] = time.monotonic() + render
+                self.send_json({"sdGenerationJob": {"generationId": generation_id}})
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if self.path.startswith("/images/"):
+                    data = _png()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+                generation_id = self.path.rsplit("/", 1)[-1]
+                ready_at = server.generations.get(generation_id)
+                with server._lock:
+                    failures = server.poll_failures
+                    failure = failures.pop(0) if failures else None
+                if failure:
+                    self.send_json({"error": "stub failure"}, failure)
+                elif ready_at is None:
+                    self.send_json({"error": "not found"}, 404)
+                elif time.monotonic() < ready_at:
+                    self.send_json({"generations_by_pk": {"status": "PENDING"}})
+                else:
+                    url = f"{server.root}/images/{generation_id}.png"
+                    self.send_json(
+                        {
+                            "generations_by_pk": {
+                                "status": server.status,
+                                "generated_images": [{"url": url}],
+                            }
+                        }
+                    )
+
+            def send_json(self, data, status=200):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.root = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self.api_base = f"{self.root}/api/rest/v1"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def counts(self):
+        with self._lock:
+            return self.requests, self.connections
+
+    def close(self):
+        self._server.shutdown()
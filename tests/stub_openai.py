@@ -0,0 +1,185 @@
+"""
+A minimal OpenAI-compatible HTTP server for the tests and scripts/benchmark.py.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import struct
+import threading
+import time
+import wave
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBEDDING_DIMENSIONS = 64
+
+
+def _png(width=8, height=8):
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    rows = b"".join(b"\x00" + b"\x80\x40\x20" * width for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _wav(seconds=0.25, rate=16000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        file.writeframes(b"\x00\x00" * int(seconds * rate))
+    return buffer.getvalue()
+
+
+def _embedding(text):
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [(digest[i % len(digest)] - 128) / 128 for i in range(EMBEDDING_DIMENSIONS)]
+
+
+class StubOpenAiServer:
+    """
+    A minimal OpenAI-compatible HTTP server. Every request waits `latency`
+    seconds before answering; the time spent per request is recorded so it
+    can be subtracted from the node timings.
+
+    Statuses added to `failures` are answered, one per request, with an error
+    instead (e.g. 429, with a short Retry-After).
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.requests = []
+        self.failures = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed
+            # ACKs add ~40 ms per request that would be counted as overhead.
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                start = time.perf_counter()
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                time.sleep(server.latency)
+                path = self.path.split("?")[0].rstrip("/")
+                with server._lock:
+                    failure = server.failures.pop(0) if server.failures else None
+                if failure:
+                    self.send_json(
+                        {"error": {"message": "Stub failure", "code": str(failure)}},
+                        failure,
+                        {"retry-after-ms": "10"},
+                    )
+                elif path.endswith("/chat/completions"):
+                    if body.get("stream"):
+                        self.send_stream(body)
+                    else:
+                        self.send_json(server.chat_completion(body))
+                elif path.endswith("/embeddings"):
+                    self.send_json(server.embeddings(body))
+                elif path.endswith("/images/generations"):
+                    self.send_json(server.images(body))
+                elif path.endswith("/audio/speech"):
+                    self.send_bytes(_wav(), "audio/wav")
+                else:
+                    self.send_json({"error": {"message": f"Unknown path {path}"}}, 404)
+                with server._lock:
+                    server.requests.append((path, start, time.perf_counter()))
+
+            def send_bytes(self, data, content_type, status=200, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def send_json(self, data, status=200, headers=None):
+                self.send_bytes(
+                    json.dumps(data).encode("utf-8"), "application/json", status, headers
+                )
+
+            def send_stream(self, body):
+                events = [
+                    {"choices": [{"index": 0, "delta": {"role": "assistant", "content": word}}]}
+                    for word in ("Stub ", "streamed ", "response.")
+                ]
+                events.append(
+                    {
+                        "choices": [],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13},
+                    }
+                )
+                data = b"".join(
+                    b"data: "
+                    + json.dumps({"id": "stub", "object": "chat.completion.chunk", "created": 0, "model": body.get("model", "stub"), **event}).encode("utf-8")
+                    + b"\n\n"
+                    for event in events
+                )
+                self.send_bytes(data + b"data: [DONE]\n\n", "text/event-stream")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def chat_completion(self, body):
+        return {
+            "id": "stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "Stub response."},
+                }
+            ],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13},
+        }
+
+    def embeddings(self, body):
+        inputs = body.get("input", "")
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        return {
+            "object": "list",
+            "model": body.get("model", "stub"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": _embedding(str(text))}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": 1, "total_tokens": 1},
+        }
+
+    def images(self, body):
+        image = base64.b64encode(_png()).decode("ascii")
+        return {"created": 0, "data": [{"b64_json": image}] * int(body.get("n", 1))}
+
+    def provider_seconds(self, start, end):
+        """Time the stub spent on requests that completed between start and end."""
+        with self._lock:
+            return sum(e - s for _, s, e in self.requests if start <= e <= end)
+
+    def request_count(self):
+        with self._lock:
+            return len(self.requests)
+
+    def close(self):
+        self._server.shutdown()
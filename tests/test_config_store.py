@@ -0,0 +1,23 @@
+from conftest import import_module
+
+griptape_config = import_module("py.griptape_config")
+
+
+def test_user_config_with_comments_loads(tmp_path):
+    path = tmp_path / "griptape_config.json"
+    path.write_text(
+        '{\n  // API keys\n  "env": {"OPENAI_BASE_URL": "http://localhost"}, // local\n'
+        '  "agent_config": {}\n}\n',
+        encoding="UTF-8",
+    )
+    store = griptape_config.ConfigStore(str(path))
+    assert store.get("env.OPENAI_BASE_URL") == "http://localhost"
+    assert store.get("agent_config") == {}
+
+
+def test_update_is_seen_without_rereading(tmp_path):
+    path = tmp_path / "griptape_config.json"
+    store = griptape_config.ConfigStore(str(path))
+    store.update(lambda data: data.update({"agent_config": {"model": "x"}}))
+    assert griptape_config.ConfigStore(str(path)).get("agent_config.model") == "x"
+    assert store.get("agent_config.model") == "x"
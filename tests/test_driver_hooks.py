@@ -0,0 +1,31 @@
+from conftest import import_module
+from griptape.common import observable
+
+driver_hooks = import_module("nodes.driver_hooks")
+
+
+class Named:
+    def __init__(self, name):
+        self.name = name
+
+    @observable
+    def run(self):
+        return self.name
+
+
+def test_bound_observables_keep_their_instance():
+    driver_hooks.install_driver_hooks()
+    first, second = Named("first"), Named("second")
+
+    # What two threads do when they look up run() at the same time.
+    run_first = first.run
+    run_second = second.run
+
+    assert run_first() == "first"
+    assert run_second() == "second"
+
+
+def test_patch_is_skipped_for_other_griptape_versions(monkeypatch, capsys):
+    monkeypatch.setattr(driver_hooks.importlib.metadata, "version", lambda _: "9.0")
+    assert driver_hooks.patch_observable() is False
+    assert "Not patching" in capsys.readouterr().out
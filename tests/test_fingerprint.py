@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from conftest import import_module, stub_config
+
+pytest.importorskip("dotenv")
+fingerprint = import_module("nodes.fingerprint")
+CreateAgent = import_module("nodes.agent.CreateAgent").CreateAgent
+gtUIPromptTask = import_module("nodes.tasks.gtUIPromptTask").gtUIPromptTask
+
+prompts = []
+
+
+class StubConfig:
+    """A config node whose prompt driver answers locally and records prompts."""
+
+    FUNCTION = "create"
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return fingerprint.input_fingerprint(kwargs)
+
+    def create(self):
+        return (stub_config(prompts=prompts),)
+
+
+class Executor:
+    """
+    Just enough of ComfyUI's executor: a node is re-run only when its class,
+    widget values, IS_CHANGED or upstream signatures change. Otherwise its
+    cached outputs are reused.
+    """
+
+    def __init__(self):
+        self.cache = {}
+        self.executed = []
+
+    def run(self, graph):
+        # graph is in ComfyUI's prompt format, already in execution order;
+        # [node_id, output_index] is a link.
+        signatures, outputs = {}, {}
+        self.executed = []
+        for node_id, (node_class, inputs) in graph.items():
+            links = {k: v for k, v in inputs.items() if isinstance(v, list)}
+            widgets = {k: v for k, v in inputs.items() if k not in links}
+            signature = json.dumps(
+                [
+                    node_class.__name__,
+                    widgets,
+                    node_class.IS_CHANGED(**widgets),
+                    {k: [signatures[n], i] for k, (n, i) in links.items()},
+                ],
+                sort_keys=True,
+            )
+            cached = self.cache.get(node_id)
+            if cached and cached[0] == signature:
+                outputs[node_id] = cached[1]
+            else:
+                kwargs = {**widgets}
+                kwargs.update({k: outputs[n][i] for k, (n, i) in links.items()})
+                node = node_class()
+                outputs[node_id] = getattr(node, node_class.FUNCTION)(**kwargs)
+                self.cache[node_id] = (signature, outputs[node_id])
+                self.executed.append(node_id)
+            signatures[node_id] = signature
+        return outputs
+
+
+def graph(last_prompt="And again."):
+    return {
+        "1": (StubConfig, {}),
+        "2": (CreateAgent, {"config": ["1", 0], "STRING": ""}),
+        "3": (gtUIPromptTask, {"agent": ["2", 1], "STRING": "Hello."}),
+        "4": (gtUIPromptTask, {"agent": ["3", 1], "STRING": last_prompt}),
+    }
+
+
+def test_unchanged_graph_makes_no_llm_calls():
+    prompts.clear()
+    executor = Executor()
+
+    first = executor.run(graph())
+    assert executor.executed == ["1", "2", "3", "4"]
+    assert prompts == ["Hello.", "And again."]
+
+    second = executor.run(graph())
+    assert executor.executed == []
+    assert prompts == ["Hello.", "And again."]
+    assert second["4"][0] == first["4"][0]
+
+
+def test_changed_widget_reruns_only_that_node():
+    prompts.clear()
+    executor = Executor()
+    executor.run(graph())
+
+    outputs = executor.run(graph("Something else."))
+    assert executor.executed == ["4"]
+    assert prompts == ["Hello.", "And again.", "Something else."]
+    # The cached upstream agent was forked, not changed by either run.
+    assert len(outputs["3"][1].conversation_memory.runs) == 1
+
+
+def test_fingerprint_is_stable_and_tracks_the_environment(monkeypatch):
+    inputs = {"STRING": "Hello.", "prompt": {"1": {}}, "unique_id": "4"}
+    first = gtUIPromptTask.IS_CHANGED(**inputs)
+    # Hidden inputs aren't node settings.
+    assert gtUIPromptTask.IS_CHANGED(**{**inputs, "unique_id": "5"}) == first
+
+    monkeypatch.setenv("OPENAI_API_KEY", "another key")
+    assert gtUIPromptTask.IS_CHANGED(**inputs) != first
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from conftest import import_module
+
+image_codec = import_module("nodes.image_codec")
+
+
+def frame(width=64, height=32):
+    return np.full((height, width, 3), 128, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("name", ["jpg", "JPEG", " jpeg "])
+def test_jpg_is_encoded_as_jpeg(name):
+    artifact = image_codec.encode_frame(frame(), format=name)
+    assert artifact.format == "jpeg"
+    assert artifact.value[:2] == b"\xff\xd8"
+
+
+def test_unsupported_format_is_rejected():
+    with pytest.raises(ValueError, match="use one of: png, webp, jpeg"):
+        image_codec.encode_frame(frame(), format="bmp")
+
+
+def test_unsupported_format_in_environment_falls_back_to_png(monkeypatch, capsys):
+    monkeypatch.setenv("GRIPTAPE_IMAGE_FORMAT", "gif")
+    assert image_codec._image_format_from_env() == "png"
+    assert "GRIPTAPE_IMAGE_FORMAT=gif is not supported" in capsys.readouterr().out
+
+    monkeypatch.setenv("GRIPTAPE_IMAGE_FORMAT", "JPG")
+    assert image_codec._image_format_from_env() == "jpeg"
+
+
+def test_frames_are_downscaled_to_limits():
+    artifact = image_codec.encode_frame(frame(2000, 1000), limits=(1000, None, None))
+    assert (artifact.width, artifact.height) == (1000, 500)
+
+
+class OpenAiDriver:
+    pass
+
+
+def test_downscale_report_records_metrics_without_printing(capsys):
+    metrics = import_module("nodes.metrics").metrics
+    metrics.reset()
+    report = image_codec.DownscaleReport(OpenAiDriver())
+    original = frame(2000, 1000)
+    report.add(original, image_codec.encode_frame(original, limits=(1000, None, None)))
+    report.emit()
+
+    counters = {
+        (c["name"], c["labels"].get("stage")): c["value"]
+        for c in metrics.to_dict()["counters"]
+    }
+    assert counters[("griptape_image_pixels_total", "input")] == 2000 * 1000
+    assert counters[("griptape_image_pixels_total", "sent")] == 1000 * 500
+    assert capsys.readouterr().out == ""
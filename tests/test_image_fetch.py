@@ -0,0 +1,105 @@
+import os
+
+import pytest
+import requests
+from conftest import import_module
+from fake_image_server import FakeImageServer
+
+image_fetch = import_module("nodes.image_fetch")
+
+
+@pytest.fixture
+def server():
+    server = FakeImageServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    return image_fetch.ImageFetcher(
+        cache_dir=str(tmp_path / "images"), max_bytes=4000, cache_max_bytes=2500
+    )
+
+
+def test_fresh_response_is_served_from_the_cache(server, fetcher):
+    url = server.add("/a.png", b"a" * 100, Cache_Control="max-age=60")
+
+    assert fetcher.fetch(url) == b"a" * 100
+    assert fetcher.fetch(url) == b"a" * 100
+    assert server.statuses("/a.png") == [200]
+    assert fetcher.stats()["hits"] == 1
+
+
+def test_stale_response_is_revalidated_with_its_etag(server, fetcher):
+    url = server.add("/a.png", b"a" * 100, Cache_Control="max-age=0", ETag='"v1"')
+
+    assert fetcher.fetch(url) == b"a" * 100
+    assert fetcher.fetch(url) == b"a" * 100
+    assert server.statuses("/a.png") == [200, 304]
+    assert fetcher.stats()["revalidated"] == 1
+
+    # A changed image is downloaded again.
+    server.add("/a.png", b"b" * 100, Cache_Control="max-age=0", ETag='"v2"')
+    assert fetcher.fetch(url) == b"b" * 100
+    assert server.statuses("/a.png") == [200, 304, 200]
+
+
+def test_no_store_response_is_not_cached(server, fetcher):
+    url = server.add("/a.png", b"a" * 100, Cache_Control="no-store", ETag='"v1"')
+
+    fetcher.fetch(url)
+    fetcher.fetch(url)
+    assert server.statuses("/a.png") == [200, 200]
+    assert not os.path.exists(fetcher.cache_dir)
+
+
+def test_download_over_the_content_length_limit_is_refused(server, fetcher):
+    url = server.add("/big.png", b"a" * 5000, Cache_Control="max-age=60")
+
+    with pytest.raises(image_fetch.FetchTooLarge, match="over the"):
+        fetcher.fetch(url)
+    assert not os.path.exists(fetcher.cache_dir)
+
+
+def test_streamed_download_over_the_limit_is_abandoned(server, fetcher):
+    url = server.add("/big.png", b"a" * 50000, Cache_Control="max-age=60")
+    server.chunked.add("/big.png")
+
+    with pytest.raises(image_fetch.FetchTooLarge, match="over the"):
+        fetcher.fetch(url)
+    assert not os.path.exists(fetcher.cache_dir)
+
+    # Under the limit the same streamed response is read in full.
+    url = server.add("/small.png", b"a" * 3000, Cache_Control="max-age=60")
+    server.chunked.add("/small.png")
+    assert fetcher.fetch(url) == b"a" * 3000
+
+
+def test_least_recently_used_images_are_evicted(server, fetcher):
+    urls = [
+        server.add(f"/{i}.png", bytes([i]) * 1000, Cache_Control="max-age=60")
+        for i in range(3)
+    ]
+    fetcher.fetch(urls[0])
+    fetcher.fetch(urls[1])
+    # Using the first image again makes the second the least recently used.
+    fetcher.fetch(urls[0])
+    fetcher.fetch(urls[2])
+
+    stats = fetcher.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= fetcher.cache_max_bytes
+    fetcher.fetch(urls[0])
+    fetcher.fetch(urls[1])
+    assert server.statuses("/0.png") == [200]
+    assert server.statuses("/1.png") == [200, 200]
+
+
+def test_not_modified_without_a_cached_copy_is_an_error(server, fetcher):
+    url = server.add("/a.png", b"a" * 100, Cache_Control="max-age=60")
+    server.not_modified.add("/a.png")
+
+    with pytest.raises(requests.HTTPError, match="no cached copy"):
+        fetcher.fetch(url)
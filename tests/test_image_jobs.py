@@ -0,0 +1,63 @@
+import pytest
+from conftest import import_module
+from fake_leonardo import FakeLeonardoServer
+
+image_jobs = import_module("nodes.image_jobs")
+
+
+@pytest.fixture
+def leonardo(monkeypatch):
+    # Poll every few milliseconds so the tests don't wait on the schedule.
+    monkeypatch.setattr(image_jobs, "POLL_INITIAL", 0.01)
+    monkeypatch.setattr(image_jobs, "POLL_MAX", 0.02)
+    server = FakeLeonardoServer([0.05])
+    yield server
+    server.close()
+
+
+def generate(server):
+    driver = image_jobs.LeonardoImageGenerationDriver(
+        model="fake", api_key="fake", api_base=server.api_base
+    )
+    return driver.try_text_to_image(prompts=["a lighthouse"])
+
+
+def last_job():
+    return image_jobs.image_jobs.stats()["finished"][0]
+
+
+def test_generation_is_polled_until_complete(leonardo):
+    artifact = generate(leonardo)
+    assert artifact.value.startswith(b"\x89PNG")
+    assert last_job()["state"] == "COMPLETE"
+
+
+def test_transient_poll_errors_are_retried(leonardo):
+    leonardo.poll_failures = [503, 429, 502]
+    artifact = generate(leonardo)
+    assert artifact.value.startswith(b"\x89PNG")
+    assert last_job()["state"] == "COMPLETE"
+    assert last_job()["poll_errors"] == 3
+
+
+def test_client_errors_fail_at_once(leonardo):
+    leonardo.poll_failures = [401]
+    with pytest.raises(Exception, match="failed to get generation"):
+        generate(leonardo)
+    assert last_job()["state"] == "FAILED"
+    assert last_job()["polls"] == 1
+
+
+def test_failed_generations_fail_at_once(leonardo):
+    leonardo.status = "FAILED"
+    with pytest.raises(Exception, match="image generation failed"):
+        generate(leonardo)
+    assert last_job()["state"] == "FAILED"
+
+
+def test_transient_errors_give_up_at_the_deadline(leonardo, monkeypatch):
+    monkeypatch.setattr(image_jobs, "JOB_TIMEOUT", 0.2)
+    leonardo.poll_failures = [503] * 1000
+    with pytest.raises(TimeoutError, match="last poll failed"):
+        generate(leonardo)
+    assert last_job()["state"] == "TIMED_OUT"
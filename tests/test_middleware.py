@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+from conftest import import_module
+from griptape.common import Message, PromptStack
+from griptape.tokenizers import SimpleTokenizer
+from stub_openai import StubOpenAiServer
+
+openai = pytest.importorskip("openai")
+from griptape.drivers import OpenAiChatPromptDriver  # noqa: E402
+
+driver_hooks = import_module("nodes.driver_hooks")
+rate_limit = import_module("nodes.rate_limit")
+response_cache = import_module("nodes.response_cache")
+single_flight = import_module("nodes.single_flight")
+
+
+class Middleware:
+    def __init__(self, tmp_path):
+        self.cache = response_cache.ResponseCache(
+            path=str(tmp_path / "responses.sqlite"), enabled=True
+        )
+        self.flights = single_flight.SingleFlight(enabled=True)
+        self.limiter = rate_limit.RateLimiter(rpm=0, tpm=0, retries=3)
+        # The order install_driver_hooks adds them in.
+        self.prompt_middleware = [
+            self.cache,
+            self.flights.prompt_middleware,
+            self.limiter.prompt_middleware,
+        ]
+
+
+@pytest.fixture
+def middleware(monkeypatch, tmp_path):
+    driver_hooks.install_driver_hooks()
+    middleware = Middleware(tmp_path)
+    monkeypatch.setattr(
+        driver_hooks, "_prompt_middleware", middleware.prompt_middleware
+    )
+    return middleware
+
+
+def openai_driver(server, temperature=0):
+    return OpenAiChatPromptDriver(
+        model="gpt-4o",
+        base_url=server.url,
+        api_key="stub",
+        temperature=temperature,
+        tokenizer=SimpleTokenizer(
+            characters_per_token=4, max_input_tokens=8000, max_output_tokens=1000
+        ),
+        # The client's own retries would hide 429s from the rate limiter.
+        client=openai.OpenAI(base_url=server.url, api_key="stub", max_retries=0),
+    )
+
+
+def prompt_stack(text="Hello"):
+    stack = PromptStack()
+    stack.add_message(text, Message.USER_ROLE)
+    return stack
+
+
+def test_deterministic_prompts_are_served_from_cache(middleware, openai_server):
+    driver = openai_driver(openai_server)
+    first = driver.run(prompt_stack())
+    second = driver.run(prompt_stack())
+
+    assert first.to_text() == second.to_text() == "Stub response."
+    assert openai_server.request_count() == 1
+    assert middleware.cache.hits == 1
+
+
+def test_cached_responses_are_not_shared_between_servers(middleware, openai_server):
+    other_server = StubOpenAiServer(0)
+    try:
+        openai_driver(openai_server).run(prompt_stack())
+        openai_driver(other_server).run(prompt_stack())
+        assert openai_server.request_count() == 1
+        assert other_server.request_count() == 1
+    finally:
+        other_server.close()
+
+
+def test_identical_prompts_in_flight_are_sent_once(middleware, openai_server):
+    openai_server.latency = 0.3
+    # Not deterministic, so the cache stays out of the way.
+    driver = openai_driver(openai_server, temperature=0.7)
+    results = []
+
+    def run():
+        results.append(driver.run(prompt_stack()).to_text())
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["Stub response."] * 4
+    assert openai_server.request_count() == 1
+    assert middleware.flights.coalesced == 3
+
+
+def test_rate_limited_prompts_are_retried(middleware, openai_server):
+    openai_server.failures = [429, 429]
+    message = openai_driver(openai_server).run(prompt_stack())
+
+    assert message.to_text() == "Stub response."
+    assert openai_server.request_count() == 3
+    stats = middleware.limiter.stats()["limiters"]
+    assert [limiter["rate_limit_errors"] for limiter in stats.values()] == [2]
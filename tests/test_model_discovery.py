@@ -0,0 +1,126 @@
+import asyncio
+import socket
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from conftest import import_module
+
+model_discovery = import_module("nodes.model_discovery")
+
+
+class StubOllama:
+    """An Ollama /api/tags endpoint whose answers and delay can be changed."""
+
+    def __init__(self, models):
+        self.models = models
+        self.delay = 0.0
+        self.requests = 0
+        app = web.Application()
+        app.router.add_get("/api/tags", self.tags)
+        self.server = TestServer(app, host="127.0.0.1")
+
+    async def tags(self, request):
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        return web.json_response({"models": [{"name": name} for name in self.models]})
+
+    async def __aenter__(self):
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.server.close()
+
+    @property
+    def port(self):
+        return self.server.port
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_models_are_served_from_cache_within_ttl():
+    async def scenario():
+        discovery = model_discovery.ModelDiscovery(ttl=60)
+        async with StubOllama(["llama3"]) as stub:
+            first = await discovery.get_models("ollama", "http://127.0.0.1", stub.port)
+            stub.models = ["llama3", "qwen2"]
+            second = await discovery.get_models("ollama", "http://127.0.0.1", stub.port)
+            await discovery._get_session().close()
+            return first, second, stub.requests
+
+    first, second, requests = run(scenario())
+    assert first == ["llama3"]
+    assert second == ["llama3"]
+    assert requests == 1
+
+
+def test_stale_list_is_returned_while_it_refreshes():
+    async def scenario():
+        discovery = model_discovery.ModelDiscovery(ttl=0)
+        async with StubOllama(["llama3"]) as stub:
+            await discovery.get_models("ollama", "http://127.0.0.1", stub.port)
+            stub.models = ["qwen2"]
+            stub.delay = 0.2
+            # Expired: the old list comes back at once, the probe runs behind.
+            stale = await asyncio.wait_for(
+                discovery.get_models("ollama", "http://127.0.0.1", stub.port), 0.1
+            )
+            await discovery.refresh("ollama", "http://127.0.0.1", stub.port)
+            discovery.ttl = 60
+            fresh = await discovery.get_models("ollama", "http://127.0.0.1", stub.port)
+            await discovery._get_session().close()
+            return stale, fresh
+
+    stale, fresh = run(scenario())
+    assert stale == ["llama3"]
+    assert fresh == ["qwen2"]
+
+
+def test_concurrent_first_requests_share_one_probe():
+    async def scenario():
+        discovery = model_discovery.ModelDiscovery(ttl=60)
+        async with StubOllama(["llama3"]) as stub:
+            stub.delay = 0.1
+            results = await asyncio.gather(
+                *[
+                    discovery.get_models("ollama", "http://127.0.0.1", stub.port)
+                    for _ in range(5)
+                ]
+            )
+            await discovery._get_session().close()
+            return results, stub.requests
+
+    results, requests = run(scenario())
+    assert results == [["llama3"]] * 5
+    assert requests == 1
+
+
+def test_unreachable_host_falls_back():
+    async def scenario():
+        discovery = model_discovery.ModelDiscovery(ttl=0, failure_ttl=0)
+        port = free_port()
+        # Never answered: an empty list rather than an error.
+        empty = await discovery.get_models("ollama", "http://127.0.0.1", port)
+
+        async with StubOllama(["llama3"]) as stub:
+            good = await discovery.get_models("ollama", "http://127.0.0.1", stub.port)
+            port = stub.port
+        # The host went away: the last good list is kept.
+        await discovery.refresh("ollama", "http://127.0.0.1", port)
+        kept = await discovery.get_models("ollama", "http://127.0.0.1", port)
+        await discovery.refresh("ollama", "http://127.0.0.1", port)
+        await discovery._get_session().close()
+        return empty, good, kept
+
+    empty, good, kept = run(scenario())
+    assert empty == []
+    assert good == ["llama3"]
+    assert kept == ["llama3"]
@@ -0,0 +1,38 @@
+import importlib
+import json
+
+import pytest
+from conftest import import_module
+
+pytest.importorskip("dotenv")
+lazy_nodes = import_module("nodes.lazy_nodes")
+
+SECRET_KEY = "sk-test-0123456789abcdef"
+SECRET_ENDPOINT = "https://secret-endpoint.example.com/"
+
+
+def test_cache_file_has_no_environment_values(tmp_path, monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", SECRET_KEY)
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", SECRET_ENDPOINT)
+    # The Azure config reads its widget defaults from the environment at import time.
+    importlib.reload(import_module("nodes.config.gtUIAzureOpenAiStructureConfig"))
+    cache = lazy_nodes.NodeInfoCache(str(tmp_path / "node_cache.json"))
+    monkeypatch.setattr(lazy_nodes, "_cache", cache)
+
+    mappings = lazy_nodes.build_node_mappings(
+        {
+            "Azure": "config.gtUIAzureOpenAiStructureConfig:gtUIAzureOpenAiStructureConfig",
+            "Merge": "combine.MergeTexts:MergeTexts",
+        }
+    )
+    for node in mappings.values():
+        node.resolve()
+    assert mappings["Azure"].INPUT_TYPES()["optional"]["api_key_env_var"][1] == {
+        "default": SECRET_KEY
+    }
+    cache.flush()
+
+    text = (tmp_path / "node_cache.json").read_text(encoding="UTF-8")
+    assert SECRET_KEY not in text
+    assert SECRET_ENDPOINT not in text
+    assert list(json.loads(text)["nodes"]) == ["Merge"]
@@ -0,0 +1,15 @@
+import pytest
+from conftest import import_module
+
+pytest.importorskip("dotenv")
+pytest.importorskip("torch")
+parallel_image_query = import_module("nodes.tasks.gtUIParallelImageQueryTask")
+
+
+def test_blank_lines_are_not_prompts():
+    prompts = parallel_image_query.split_prompts("Colors?\n\n  \nShapes?\n")
+    assert prompts == ["Colors?", "Shapes?"]
+
+
+def test_empty_text_is_a_single_prompt():
+    assert parallel_image_query.split_prompts("") == [""]
@@ -0,0 +1,45 @@
+import pytest
+from conftest import import_module
+
+rate_limit = import_module("nodes.rate_limit")
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FakeDriver:
+    api_key = "key"
+    ignored_exception_types = ()
+
+
+def test_retries_do_not_reserve_tokens_again(monkeypatch):
+    monkeypatch.setattr(rate_limit, "interruptible_sleep", lambda seconds: None)
+    limiter = rate_limit.RateLimiter(rpm=0, tpm=6000, retries=3)
+    driver = FakeDriver()
+    attempts = []
+
+    def call_next():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError()
+        return "response"
+
+    assert limiter.call(driver, call_next, tokens=1000) == "response"
+    assert len(attempts) == 3
+    # One reservation of 1000 tokens, not one per attempt.
+    assert 4999 <= limiter.limiter_for(driver).tokens.tokens <= 5001
+
+
+def test_retries_give_up_after_the_limit(monkeypatch):
+    monkeypatch.setattr(rate_limit, "interruptible_sleep", lambda seconds: None)
+    limiter = rate_limit.RateLimiter(rpm=0, tpm=0, retries=2)
+    attempts = []
+
+    def call_next():
+        attempts.append(1)
+        raise RateLimitError()
+
+    with pytest.raises(RateLimitError):
+        limiter.call(FakeDriver(), call_next)
+    assert len(attempts) == 3
@@ -0,0 +1,43 @@
+from typing import Optional
+
+from attrs import define, field
+from conftest import StubPromptDriver, import_module
+from griptape.common import Message, PromptStack
+
+response_cache = import_module("nodes.response_cache")
+
+
+@define
+class StubServerPromptDriver(StubPromptDriver):
+    base_url: Optional[str] = field(default=None, kw_only=True)
+    api_key: Optional[str] = field(default=None, kw_only=True)
+
+
+def prompt_stack(text="Hello"):
+    stack = PromptStack()
+    stack.add_message(text, Message.USER_ROLE)
+    return stack
+
+
+def key(text="Hello", **driver_kwargs):
+    driver = StubServerPromptDriver(temperature=0, **driver_kwargs)
+    return response_cache.response_key(driver, prompt_stack(text))
+
+
+def test_key_is_stable_across_runs():
+    assert key() == key()
+
+
+def test_key_depends_on_prompt_and_settings():
+    assert key("Hello") != key("Goodbye")
+    assert key(model="a") != key(model="b")
+
+
+def test_key_depends_on_endpoint_and_api_key():
+    assert key(base_url="http://a/v1") != key(base_url="http://b/v1")
+    assert key(api_key="first") != key(api_key="second")
+
+
+def test_api_key_is_not_stored_in_the_key_payload():
+    driver = StubServerPromptDriver(api_key="secret")
+    assert "secret" not in str(response_cache.driver_identity(driver))
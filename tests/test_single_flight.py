@@ -0,0 +1,84 @@
+import threading
+import time
+
+from conftest import import_module
+
+single_flight = import_module("nodes.single_flight")
+cancellation = import_module("nodes.cancellation")
+
+
+def run_in_thread(fn):
+    result = {}
+
+    def target():
+        try:
+            result["value"] = fn()
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread, result
+
+
+def wait_for_flight(flights, key):
+    deadline = time.monotonic() + 5
+    while key not in flights._flights:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_identical_calls_in_flight_share_one_request():
+    flights = single_flight.SingleFlight(enabled=True)
+    release = threading.Event()
+    requests = []
+
+    def request():
+        requests.append(1)
+        release.wait(5)
+        return "response"
+
+    leader, leader_result = run_in_thread(lambda: flights.do("key", request))
+    wait_for_flight(flights, "key")
+    follower, follower_result = run_in_thread(lambda: flights.do("key", request))
+    time.sleep(0.1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert leader_result["value"] == follower_result["value"] == "response"
+    assert len(requests) == 1
+    assert flights.stats()["calls"] == 2
+    assert flights.stats()["coalesced"] == 1
+
+
+def test_waiter_retries_when_the_leader_is_cancelled():
+    flights = single_flight.SingleFlight(enabled=True)
+    release = threading.Event()
+    requests = []
+
+    def cancelled_request():
+        requests.append("cancelled")
+        release.wait(5)
+        raise cancellation.RunCancelled()
+
+    def request():
+        requests.append("ran")
+        return "response"
+
+    leader, leader_result = run_in_thread(
+        lambda: flights.do("key", cancelled_request)
+    )
+    wait_for_flight(flights, "key")
+    follower, follower_result = run_in_thread(lambda: flights.do("key", request))
+    time.sleep(0.1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert isinstance(leader_result["error"], cancellation.RunCancelled)
+    assert follower_result["value"] == "response"
+    assert requests == ["cancelled", "ran"]
+    # The retry is still one call, and it was not served by another request.
+    assert flights.stats()["calls"] == 2
+    assert flights.stats()["coalesced"] == 0
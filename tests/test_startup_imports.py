@@ -0,0 +1,36 @@
+import subprocess
+import sys
+import textwrap
+
+from conftest import PACKAGE, REPO_DIR
+
+# Run in a fresh interpreter: this one has already imported griptape.
+IMPORT_ROUTES = textwrap.dedent(
+    f"""
+    import sys, types
+
+    # custom_routes registers its routes on ComfyUI's PromptServer.
+    server = types.ModuleType("server")
+    server.PromptServer = type("PromptServer", (), {{"instance": None}})
+    sys.modules["server"] = server
+
+    package = types.ModuleType({PACKAGE!r})
+    package.__path__ = [{REPO_DIR!r}]
+    sys.modules[{PACKAGE!r}] = package
+
+    import {PACKAGE}.nodes.custom_routes
+    import {PACKAGE}.nodes.lazy_nodes
+
+    print("\\n".join(m for m in sys.modules if m.split(".")[0] == "griptape"))
+    """
+)
+
+
+def test_loading_the_routes_does_not_import_griptape():
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_ROUTES],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split() == []
@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import defaultdict
+
+from conftest import import_module
+from griptape.events import CompletionChunkEvent
+
+streaming = import_module("nodes.streaming")
+concurrency = import_module("nodes.concurrency")
+
+
+class FakePromptServer:
+    last_node_id = "7"
+    client_id = "client"
+
+    def __init__(self):
+        self.messages = []
+        self._lock = threading.Lock()
+
+    def send_sync(self, event, data, client_id):
+        with self._lock:
+            self.messages.append(data)
+
+
+class FakeDriver:
+    stream = True
+
+    def add_event_listener(self, listener):
+        pass
+
+
+def test_concurrent_calls_on_one_node_get_separate_streams(monkeypatch):
+    server = FakePromptServer()
+    monkeypatch.setattr(streaming, "get_prompt_server", lambda: server)
+    both_started = threading.Barrier(2)
+
+    def prompt(words):
+        def call_next(prompt_stack):
+            both_started.wait(5)
+            for word in words:
+                streaming._forward_chunk(CompletionChunkEvent(token=word))
+            return "".join(words)
+
+        return streaming.stream_middleware(FakeDriver(), None, call_next)
+
+    results = concurrency.map_ordered(prompt, [["a", "b"], ["x", "y"]], 2)
+    assert [result for result, _, _ in results] == ["ab", "xy"]
+
+    text = defaultdict(str)
+    states = defaultdict(list)
+    for message in server.messages:
+        assert message["node"] == "7"
+        text[message["stream"]] += message["delta"]
+        states[message["stream"]].append(message["state"])
+    assert sorted(text.values()) == ["ab", "xy"]
+    for stream_states in states.values():
+        assert stream_states[0] == "start"
+        assert stream_states[-1] == "end"
+
+
+def test_buffered_tokens_are_sent_when_the_interval_is_up():
+    server = FakePromptServer()
+    with streaming.TokenStream(server, "7", "client", interval=0.2) as stream:
+        stream.push("a")
+        stream.push("b")
+        stream.push("c")
+        # No more tokens arrive, but the tail is still sent before the end.
+        time.sleep(0.5)
+        deltas = [message["delta"] for message in server.messages[1:]]
+        assert deltas == ["a", "bc"]
+    assert server.messages[-1]["state"] == "end"
+    assert len(server.messages) == 4
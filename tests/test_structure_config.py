@@ -0,0 +1,39 @@
+import pytest
+from conftest import import_module, stub_config
+from griptape.events import EventListener, StartPromptEvent
+
+pytest.importorskip("dotenv")
+gtComfyAgent = import_module("nodes.agent.gtComfyAgent")
+
+
+def listen(structure):
+    events = []
+    structure.add_event_listener(EventListener(events.append, event_types=[StartPromptEvent]))
+    return events
+
+
+def test_agents_sharing_a_config_keep_their_own_events():
+    config = stub_config()
+    first = gtComfyAgent.gtComfyAgent(config=config)
+    second = gtComfyAgent.gtComfyAgent(config=config)
+    first_events, second_events = listen(first), listen(second)
+
+    first.run("Hello")
+
+    assert len(first_events) == 1
+    assert second_events == []
+    assert first.config.prompt_driver is not second.config.prompt_driver
+    # The copies share everything else, e.g. the stub's record of prompts.
+    assert config.prompt_driver.prompts == ["Hello"]
+
+
+def test_fork_gets_its_own_config():
+    agent = gtComfyAgent.gtComfyAgent(config=stub_config())
+    fork = agent.fork()
+    fork_events, agent_events = listen(fork), listen(agent)
+
+    fork.run("Hello")
+
+    assert len(fork_events) == 1
+    assert agent_events == []
+    assert agent.config.structure is agent
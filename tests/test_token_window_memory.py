@@ -0,0 +1,56 @@
+import pytest
+from conftest import import_module, stub_config
+
+pytest.importorskip("dotenv")
+gtComfyAgent = import_module("nodes.agent.gtComfyAgent")
+token_window_memory = import_module("nodes.agent.token_window_memory")
+metrics = import_module("nodes.metrics").metrics
+
+
+def memory_tokens():
+    return {
+        counter["labels"]["type"]: counter["value"]
+        for counter in metrics.to_dict()["counters"]
+        if counter["name"] == "griptape_memory_tokens_total"
+    }
+
+
+def agent(max_tokens=20):
+    memory = token_window_memory.TokenWindowConversationMemory(
+        max_tokens=max_tokens, summarize=False
+    )
+    return gtComfyAgent.gtComfyAgent(
+        config=stub_config(response="A fairly long answer to the question."),
+        conversation_memory=memory,
+    )
+
+
+def test_window_keeps_history_under_budget_and_counts_saved_tokens():
+    metrics.reset()
+    first = agent()
+    for question in ("First question?", "Second question?", "Third question?"):
+        first.run(question)
+
+    memory = first.conversation_memory
+    assert len(memory.runs) == 3
+    assert memory.summary_index > 0
+    assert memory.tokens_saved > 0
+    assert memory_tokens()["saved"] > 0
+
+
+def test_fork_has_its_own_runs_and_prompt_driver():
+    original = agent(max_tokens=1000)
+    original.run("Hello")
+    original_driver = original.conversation_memory.prompt_driver
+
+    fork = original.fork()
+    fork.run("Again")
+
+    assert len(original.conversation_memory.runs) == 1
+    assert len(fork.conversation_memory.runs) == 2
+    assert fork.conversation_memory.prompt_driver is fork.config.prompt_driver
+    assert fork.conversation_memory.prompt_driver is not original_driver
+    assert (
+        fork.conversation_memory._run_tokens
+        is not original.conversation_memory._run_tokens
+    )
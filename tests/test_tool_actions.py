@@ -0,0 +1,58 @@
+import threading
+
+from conftest import import_module
+
+tool_actions = import_module("nodes.tool_actions")
+
+
+class AgentTool:
+    pass
+
+
+class Action:
+    def __init__(self, tool, run):
+        self.tool = tool
+        self.run = run
+
+
+class Subtask:
+    def execute_action(self, action):
+        return action.run()
+
+
+def run_actions(actions):
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.update(
+            value=tool_actions.execute_actions(Subtask(), actions)
+        )
+    )
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "the actions deadlocked"
+    return result["value"]
+
+
+def test_serial_tools_are_limited_per_tool_object(monkeypatch):
+    monkeypatch.setattr(tool_actions, "SERIAL_TOOLS", {"agenttool"})
+    both_running = threading.Barrier(2, timeout=2)
+
+    def run():
+        # Only returns if both actions run at the same time.
+        both_running.wait()
+        return "done"
+
+    actions = [Action(AgentTool(), run), Action(AgentTool(), run)]
+    assert run_actions(actions) == ["done", "done"]
+
+
+def test_nested_actions_on_the_same_tool_do_not_deadlock(monkeypatch):
+    monkeypatch.setattr(tool_actions, "SERIAL_TOOLS", {"agenttool"})
+    tool = AgentTool()
+
+    def nested():
+        inner = [Action(tool, lambda: "inner"), Action(tool, lambda: "inner")]
+        return tool_actions.execute_actions(Subtask(), inner)
+
+    actions = [Action(tool, nested), Action(AgentTool(), lambda: "other")]
+    assert run_actions(actions) == [["inner", "inner"], "other"]